@@ -5,6 +5,7 @@ Deploy this to Cloudflare Workers or any serverless platform.
 
 from flask import Flask, jsonify, request
 from flask_cors import CORS
+from itertools import islice
 import os
 from dotenv import load_dotenv
 
@@ -12,6 +13,7 @@ from dotenv import load_dotenv
 import sys
 sys.path.append('./news-aggregator/src')
 from alpaca_client import AlpacaNewsClient
+from article_merge import merge_by_time, oriented
 from finnhub_client import FinnHubNewsClient
 
 load_dotenv()
@@ -43,19 +45,19 @@ def get_news():
         symbols_param = request.args.get('symbols', '')
         symbols = symbols_param.split(',') if symbols_param else None
         
-        # Fetch from both sources
-        alpaca_news = alpaca.get_news(symbols=symbols, hours_back=1, limit=limit//2) if symbols else []
+        # Fetch from both sources; the Alpaca read is one page and leaves the polling cursor alone
+        alpaca_news = alpaca.get_latest_news(symbols=symbols, hours_back=1, limit=limit//2) if symbols else []
         finnhub_news = finnhub.get_news(category='general', use_incremental=True)[:limit//2]
         
-        # Combine and sort by datetime
-        all_news = alpaca_news + finnhub_news
-        all_news.sort(key=lambda x: x.get('datetime', 0), reverse=True)
+        # K-way merge of the two time-ordered streams, stopping at limit
+        all_news = list(islice(merge_by_time([oriented(alpaca_news, newest_first=True),
+                                              oriented(finnhub_news, newest_first=True)]), limit))
         
-        # Return in format expected by frontend
+        # Return in format expected by frontend (articles are lazy views; convert for JSON)
         return jsonify({
             'success': True,
-            'data': all_news[:limit],
-            'count': len(all_news[:limit])
+            'data': [article.to_dict() for article in all_news],
+            'count': len(all_news)
         })
         
     except Exception as e:
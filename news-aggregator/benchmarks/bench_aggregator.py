@@ -0,0 +1,133 @@
+"""
+Load test for NewsAggregator against the local stand-in upstreams.
+
+Starts ``standin_server`` in synth mode on a background thread, points an
+aggregator's Alpaca, FinHub, Pulse (and optionally Gemini/Yahoo) clients
+at it and runs back-to-back cycles, reporting cycle latency and article
+throughput. Raise ``--rate`` to run at a multiple of production volume.
+
+Usage:
+    python benchmarks/bench_aggregator.py --rate 20 --cycles 10
+    python benchmarks/bench_aggregator.py --rate 50 --latency-ms 80 --error-ratio 0.02 --iv
+"""
+from typing import Dict, List
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add src and this directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from alpaca_client import AlpacaNewsClient
+from delivery import NewsDelivery
+from enhanced_iv_scorer import EnhancedIVScorer
+from finnhub_client import FinnHubNewsClient
+from news_aggregator import NewsAggregator
+from rate_limit import TokenBucket
+from resilience import upstream_stats
+from scoring_pool import ScoringPool
+from standin_server import StandinServer
+
+SYMBOLS = ['AAPL', 'TSLA', 'NVDA', 'GOOGL', 'MSFT', 'AMZN']
+
+
+def point_at(aggregator: NewsAggregator, server: StandinServer, iv_scoring: bool = False):
+    """Replace an aggregator's upstream clients with ones using the stand-in."""
+    urls = server.base_urls()
+    aggregator.alpaca = AlpacaNewsClient('bench', 'bench', base_url=urls['ALPACA_BASE_URL'])
+    # The stand-in has no quota; keep the limiter from being what is measured
+    aggregator.finnhub = FinnHubNewsClient('bench', base_url=urls['FINNHUB_BASE_URL'],
+                                           rate_limiter=TokenBucket(rate=10_000, capacity=1_000))
+    aggregator.delivery = NewsDelivery(urls['PULSE_ENDPOINT'])
+    aggregator.iv_scorer = EnhancedIVScorer(
+        'bench', vix_url=urls['YAHOO_CHART_URL'], gemini_base_url=urls['GEMINI_BASE_URL']
+    ) if iv_scoring else None
+    aggregator.scoring_pool = ScoringPool(requests_per_minute=60_000)
+
+
+def run(rate: float, cycles: int, interval: float = 0.0, latency_ms: float = 0.0,
+        error_ratio: float = 0.0, iv_scoring: bool = False, seed: int = 0) -> Dict:
+    """
+    Run aggregation cycles against a fresh stand-in server.
+    
+    Args:
+        rate: Synthetic articles per second per feed
+        cycles: Cycles to run
+        interval: Seconds between cycle starts (0 runs them back to back)
+        latency_ms: Stand-in response latency
+        error_ratio: Fraction of stand-in requests failed with 503
+        iv_scoring: Score unique articles through the Gemini stand-in
+        seed: Stand-in seed
+    
+    Returns:
+        Result row with latency, throughput and stand-in figures
+    """
+    server = StandinServer(rate=rate, latency_ms=latency_ms, error_ratio=error_ratio, seed=seed).start()
+    try:
+        aggregator = NewsAggregator(finnhub_key='bench')
+        point_at(aggregator, server, iv_scoring)
+        
+        async def cycle_loop():
+            latencies = []
+            for _ in range(cycles):
+                started = time.perf_counter()
+                await aggregator.fetch_and_process(symbols=SYMBOLS)
+                latencies.append(time.perf_counter() - started)
+                await asyncio.sleep(max(0.0, interval - latencies[-1]))
+            return latencies
+        
+        started = time.perf_counter()
+        latencies = asyncio.run(cycle_loop())
+        elapsed = time.perf_counter() - started
+        aggregator.deduper.close()
+    finally:
+        server.stop()
+    
+    stats = aggregator.stats
+    return {
+        'rate': rate,
+        'cycles': cycles,
+        'fetched': stats['total_articles_fetched'],
+        'unique': stats['total_unique_articles'],
+        'delivered': stats['total_delivered'],
+        'articles_per_sec': stats['total_articles_fetched'] / elapsed if elapsed else 0.0,
+        'cycle_p50_ms': statistics.median(latencies) * 1000,
+        'cycle_max_ms': max(latencies) * 1000,
+        'standin': server.get_stats(),
+        'upstreams': upstream_stats(),
+    }
+
+
+def main(argv: List[str] = None) -> Dict:
+    parser = argparse.ArgumentParser(description='Load-test NewsAggregator against stand-in upstreams')
+    parser.add_argument('--rate', type=float, default=10.0, help='Synthetic articles per second per feed')
+    parser.add_argument('--cycles', type=int, default=10)
+    parser.add_argument('--interval', type=float, default=0.0, help='Seconds between cycle starts')
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    parser.add_argument('--error-ratio', type=float, default=0.0)
+    parser.add_argument('--iv', action='store_true', help='Score articles through the Gemini stand-in')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help='Also write the result to this JSON file')
+    args = parser.parse_args(argv)
+    
+    logging.basicConfig(level=logging.WARNING)
+    result = run(args.rate, args.cycles, args.interval, args.latency_ms, args.error_ratio, args.iv, args.seed)
+    
+    print(f"cycles {result['cycles']}  fetched {result['fetched']:,}  unique {result['unique']:,}  "
+          f"delivered {result['delivered']:,}  {result['articles_per_sec']:,.0f} articles/s  "
+          f"cycle p50 {result['cycle_p50_ms']:.0f} ms  max {result['cycle_max_ms']:.0f} ms")
+    print(f"stand-in: {result['standin']}")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(result, f, indent=2)
+    return result
+
+
+if __name__ == "__main__":
+    main()
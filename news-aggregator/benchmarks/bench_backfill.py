@@ -0,0 +1,100 @@
+"""
+Worker scaling benchmark for BackfillDedupe.
+
+Generates one synthetic backfill batch, dedupes it with each worker count and
+reports wall time, throughput and the speed-up over a single in-process
+worker. Every run must keep the same articles; a mismatch is reported.
+
+Usage:
+    python benchmarks/bench_backfill.py
+    python benchmarks/bench_backfill.py --articles 30000 --workers 1,2,4,8,16
+    python benchmarks/bench_backfill.py --no-lsh --articles 10000 --json results.json
+"""
+from typing import Dict, List
+import argparse
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+# Add src and this directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from backfill import BackfillDedupe
+from headline_generator import HeadlineGenerator
+
+
+def run(articles: int, workers: List[int], use_lsh: bool = True,
+        mean_interval_seconds: float = 5.0, seed: int = 0) -> List[Dict]:
+    """
+    Dedupe the same batch with each worker count.
+    
+    Args:
+        articles: Batch size
+        workers: Worker counts to run (1 runs in-process)
+        use_lsh: Narrow same-source candidates with LSH bands
+        mean_interval_seconds: Mean gap between article timestamps
+        seed: Generator seed
+    
+    Returns:
+        One result row per worker count
+    """
+    batch = HeadlineGenerator(seed=seed, start=1_700_000_000,
+                              mean_interval_seconds=mean_interval_seconds).articles(articles)
+    results = []
+    expected = None
+    for count in workers:
+        backfill = BackfillDedupe(use_lsh=use_lsh, workers=count)
+        started = time.perf_counter()
+        unique = backfill.process([dict(a) for a in batch])
+        elapsed = time.perf_counter() - started
+        
+        urls = [a['url'] for a in unique]
+        if expected is None:
+            expected = urls
+        results.append({
+            'workers': count,
+            'use_lsh': use_lsh,
+            'articles': articles,
+            'unique': len(unique),
+            'candidate_pairs': backfill.stats['candidate_pairs'],
+            'seconds': elapsed,
+            'articles_per_sec': articles / elapsed if elapsed else float('inf'),
+            'matches_first_run': urls == expected,
+        })
+    
+    baseline = results[0]['seconds']
+    for result in results:
+        result['speedup'] = baseline / result['seconds'] if result['seconds'] else float('inf')
+    return results
+
+
+def main(argv: List[str] = None) -> List[Dict]:
+    parser = argparse.ArgumentParser(description='Benchmark BackfillDedupe worker scaling')
+    parser.add_argument('--articles', type=int, default=10_000, help='Backfill batch size')
+    parser.add_argument('--workers', default='1,2,4,8', help='Comma-separated worker counts')
+    parser.add_argument('--no-lsh', action='store_true', help='Compare every same-source pair')
+    parser.add_argument('--interval', type=float, default=5.0, help='Mean seconds between articles')
+    parser.add_argument('--seed', type=int, default=0, help='Synthetic stream seed')
+    parser.add_argument('--json', help='Also write results to this JSON file')
+    args = parser.parse_args(argv)
+    
+    logging.basicConfig(level=logging.WARNING)
+    results = run(args.articles, [int(w) for w in args.workers.split(',')],
+                  use_lsh=not args.no_lsh, mean_interval_seconds=args.interval, seed=args.seed)
+    
+    for result in results:
+        print(f"{result['workers']:>3} workers: {result['seconds']:.2f}s  "
+              f"{result['articles_per_sec']:,.0f} articles/s  {result['speedup']:.2f}x  "
+              f"{result['candidate_pairs']:,} pairs  {result['unique']:,} unique"
+              f"{'' if result['matches_first_run'] else '  MISMATCH'}")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""
+Micro-benchmark for NewsDedupe.process.
+
+Warms each engine's cache to a target size with synthetic articles, then
+times ``process()`` on poll-sized batches and reports throughput, batch
+latency percentiles and peak traced memory.
+
+Usage:
+    python benchmarks/bench_dedupe.py
+    python benchmarks/bench_dedupe.py --cache-sizes 1000,10000 --engines lsh,baseline
+    python benchmarks/bench_dedupe.py --json results.json
+    python benchmarks/bench_dedupe.py --compare vectorized:lsh --cache-sizes 20000 --batch-size 100
+"""
+from datetime import datetime
+from difflib import SequenceMatcher
+from typing import Dict, List
+import argparse
+import gc
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add src and this directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from deduplicator import NewsDedupe
+from headline_generator import HeadlineGenerator
+
+
+class BruteForceDedupe:
+    """
+    The original SequenceMatcher engine: every cached article is compared.
+    
+    Kept as the reference point other engines are measured against.
+    """
+    
+    def __init__(self, window_hours: int = 24):
+        self.window_hours = window_hours
+        self.seen_urls = set()
+        self.seen_articles: List[Dict] = []
+    
+    def warm(self, articles: List[Dict]):
+        """Fill the cache without deduplicating."""
+        for article in articles:
+            self.seen_urls.add(article['url'])
+            self.seen_articles.append(article)
+    
+    def process(self, articles: List[Dict]) -> List[Dict]:
+        cutoff = int(datetime.now().timestamp()) - self.window_hours * 3600
+        self.seen_articles = [a for a in self.seen_articles if a['datetime'] > cutoff]
+        self.seen_urls = {a['url'] for a in self.seen_articles}
+        
+        unique = []
+        for article in articles:
+            if article['url'] in self.seen_urls:
+                continue
+            if any(self._are_similar(article, seen) for seen in self.seen_articles):
+                continue
+            self.seen_urls.add(article['url'])
+            self.seen_articles.append(article)
+            unique.append(article)
+        return unique
+    
+    @staticmethod
+    def _similarity(text1: str, text2: str) -> float:
+        if not text1 or not text2:
+            return 0.0
+        return SequenceMatcher(None, text1.lower().strip(), text2.lower().strip()).ratio()
+    
+    def _are_similar(self, art1: Dict, art2: Dict) -> bool:
+        if art1['source'] == art2['source']:
+            if self._similarity(art1['headline'], art2['headline']) > 0.85:
+                return True
+        if abs(art1['datetime'] - art2['datetime']) < 300:
+            symbols1 = {s.strip() for s in (art1.get('related') or '').split(',') if s.strip()}
+            symbols2 = {s.strip() for s in (art2.get('related') or '').split(',') if s.strip()}
+            if symbols1 & symbols2 and self._similarity(art1['headline'], art2['headline']) > 0.70:
+                return True
+        return False
+
+
+def _warm_news_dedupe(deduper: NewsDedupe, articles: List[Dict]):
+    """Fill a NewsDedupe cache directly, skipping the dedupe checks."""
+    for article in articles:
+        deduper._remember(deduper._make_record(article))
+
+
+# Engine name -> (factory, warm-up function)
+ENGINES: Dict[str, tuple] = {
+    'baseline': (BruteForceDedupe, lambda engine, articles: engine.warm(articles)),
+    'partitioned': (lambda: NewsDedupe(use_lsh=False, batch_min_size=0), _warm_news_dedupe),
+    'lsh': (lambda: NewsDedupe(batch_min_size=0), _warm_news_dedupe),
+    'vectorized': (lambda: NewsDedupe(batch_min_size=1), _warm_news_dedupe),
+}
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run_case(engine_name: str, cache_size: int, batches: int, batch_size: int,
+             seed: int = 0, trace_memory: bool = True) -> Dict:
+    """
+    Benchmark one engine at one cache size.
+    
+    Args:
+        engine_name: Key in ENGINES
+        cache_size: Articles cached before timing starts
+        batches: Number of timed process() calls
+        batch_size: Articles per process() call
+        seed: Generator seed (same seed = same articles for every engine)
+        trace_memory: Repeat the run under tracemalloc to record peak memory
+    
+    Returns:
+        Result row with throughput, latency and memory figures
+    """
+    factory, warm = ENGINES[engine_name]
+    
+    def build():
+        # Spread the warm-up over the last 20 hours so nothing expires
+        span = 20 * 3600
+        start = int(datetime.now().timestamp()) - span
+        generator = HeadlineGenerator(seed=seed, start=start,
+                                      mean_interval_seconds=span / max(cache_size, 1))
+        warm_articles = generator.articles(cache_size)
+        generator.mean_interval_seconds = 5.0  # Live polling rate
+        probes = [generator.articles(batch_size) for _ in range(batches)]
+        engine = factory()
+        warm(engine, warm_articles)
+        return engine, probes
+    
+    engine, probes = build()
+    gc.collect()
+    latencies = []
+    kept = 0
+    for batch in probes:
+        started = time.perf_counter()
+        kept += len(engine.process(batch))
+        latencies.append(time.perf_counter() - started)
+    
+    processed = batches * batch_size
+    total = sum(latencies)
+    result = {
+        'engine': engine_name,
+        'cache_size': cache_size,
+        'articles': processed,
+        'unique': kept,
+        'articles_per_sec': processed / total if total else float('inf'),
+        'batch_p50_ms': statistics.median(latencies) * 1000,
+        'batch_p95_ms': _percentile(latencies, 0.95) * 1000,
+        'batch_max_ms': max(latencies) * 1000,
+    }
+    if hasattr(engine, 'get_stats'):
+        result['cache_memory_mb'] = engine.get_stats()['cache_memory_bytes'] / 1e6
+    if hasattr(engine, 'similarity_stats'):
+        result['similarity_stats'] = dict(engine.similarity_stats)
+    del engine, probes
+    
+    if trace_memory:
+        gc.collect()
+        tracemalloc.start()
+        engine, probes = build()
+        for batch in probes:
+            engine.process(batch)
+        result['peak_memory_mb'] = tracemalloc.get_traced_memory()[1] / 1e6
+        tracemalloc.stop()
+        del engine, probes
+    
+    return result
+
+
+def compare(engine_name: str, baseline_name: str, cache_size: int, batches: int, batch_size: int,
+            seed: int = 0) -> Dict:
+    """
+    Throughput of one engine relative to another on the same articles.
+    
+    Args:
+        engine_name: Engine being measured
+        baseline_name: Engine it is measured against
+        cache_size: Articles cached before timing starts
+        batches: Number of timed process() calls
+        batch_size: Articles per process() call
+        seed: Generator seed
+    
+    Returns:
+        Both result rows plus ``speedup`` (engine / baseline articles per second)
+    """
+    engine = run_case(engine_name, cache_size, batches, batch_size, seed=seed, trace_memory=False)
+    baseline = run_case(baseline_name, cache_size, batches, batch_size, seed=seed, trace_memory=False)
+    return {
+        'engine': engine,
+        'baseline': baseline,
+        'speedup': engine['articles_per_sec'] / baseline['articles_per_sec']
+    }
+
+
+def format_table(results: List[Dict]) -> str:
+    """Render result rows as a fixed-width table."""
+    columns = [
+        ('engine', 'engine', '{}'),
+        ('cache', 'cache_size', '{:,}'),
+        ('art/s', 'articles_per_sec', '{:,.0f}'),
+        ('p50 ms', 'batch_p50_ms', '{:.1f}'),
+        ('p95 ms', 'batch_p95_ms', '{:.1f}'),
+        ('max ms', 'batch_max_ms', '{:.1f}'),
+        ('cache MB', 'cache_memory_mb', '{:.1f}'),
+        ('peak MB', 'peak_memory_mb', '{:.1f}'),
+    ]
+    rows = [[title for title, _, _ in columns]]
+    for result in results:
+        rows.append([fmt.format(result[key]) if key in result else '-' for _, key, fmt in columns])
+    widths = [max(len(row[i]) for row in rows) for i in range(len(columns))]
+    return '\n'.join('  '.join(cell.rjust(width) for cell, width in zip(row, widths)) for row in rows)
+
+
+def main(argv: List[str] = None) -> List[Dict]:
+    parser = argparse.ArgumentParser(description='Benchmark NewsDedupe engines')
+    parser.add_argument('--engines', default='lsh,partitioned',
+                        help=f"Comma-separated engines ({', '.join(ENGINES)})")
+    parser.add_argument('--cache-sizes', default='1000,10000,100000',
+                        help='Comma-separated cache sizes to warm to')
+    parser.add_argument('--batches', type=int, default=20, help='Timed process() calls per case')
+    parser.add_argument('--batch-size', type=int, default=50, help='Articles per process() call')
+    parser.add_argument('--seed', type=int, default=0, help='Synthetic stream seed')
+    parser.add_argument('--no-memory', action='store_true', help='Skip the tracemalloc pass')
+    parser.add_argument('--json', help='Also write results to this JSON file')
+    parser.add_argument('--compare', metavar='ENGINE:BASELINE',
+                        help='Report the speed-up of one engine over another instead of the table')
+    args = parser.parse_args(argv)
+    
+    if args.compare:
+        engine_name, baseline_name = args.compare.split(':')
+        comparisons = []
+        for cache_size in (int(s) for s in args.cache_sizes.split(',')):
+            comparison = compare(engine_name, baseline_name, cache_size, args.batches, args.batch_size, args.seed)
+            comparisons.append(comparison)
+            print(f"{engine_name} vs {baseline_name} @ {cache_size:,} cached, {args.batch_size}-article batches: "
+                  f"{comparison['engine']['articles_per_sec']:,.0f} vs "
+                  f"{comparison['baseline']['articles_per_sec']:,.0f} articles/s ({comparison['speedup']:.2f}x)")
+        if args.json:
+            with open(args.json, 'w') as f:
+                json.dump(comparisons, f, indent=2)
+        return comparisons
+    
+    results = []
+    for cache_size in (int(s) for s in args.cache_sizes.split(',')):
+        for engine_name in args.engines.split(','):
+            result = run_case(engine_name, cache_size, args.batches, args.batch_size,
+                              seed=args.seed, trace_memory=not args.no_memory)
+            results.append(result)
+            print(f"… {engine_name} @ {cache_size:,}: {result['articles_per_sec']:,.0f} articles/s",
+                  file=sys.stderr)
+    
+    print(format_table(results))
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    main()
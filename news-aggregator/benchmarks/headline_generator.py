@@ -0,0 +1,186 @@
+"""Synthetic financial headline stream for dedupe benchmarks."""
+from collections import deque
+from datetime import datetime
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
+import random
+
+COMPANIES = [
+    ('Apple', 'AAPL'), ('Tesla', 'TSLA'), ('Nvidia', 'NVDA'), ('Alphabet', 'GOOGL'),
+    ('Microsoft', 'MSFT'), ('Amazon', 'AMZN'), ('Meta', 'META'), ('Netflix', 'NFLX'),
+    ('AMD', 'AMD'), ('Intel', 'INTC'), ('JPMorgan', 'JPM'), ('Goldman Sachs', 'GS'),
+    ('Exxon', 'XOM'), ('Chevron', 'CVX'), ('Pfizer', 'PFE'), ('Eli Lilly', 'LLY'),
+    ('Boeing', 'BA'), ('Disney', 'DIS'), ('Walmart', 'WMT'), ('Costco', 'COST'),
+    ('Broadcom', 'AVGO'), ('Oracle', 'ORCL'), ('Salesforce', 'CRM'), ('Uber', 'UBER'),
+    ('Coinbase', 'COIN'), ('Palantir', 'PLTR'), ('Ford', 'F'), ('GM', 'GM'),
+]
+
+MACRO = [
+    ('Fed', 'SPY'), ('Treasury yields', 'TLT'), ('Oil', 'USO'), ('Gold', 'GLD'),
+    ('Bitcoin', 'BTCUSD'), ('Dollar', 'UUP'), ('S&P 500 futures', 'ES'), ('Nasdaq', 'QQQ'),
+]
+
+TEMPLATES = [
+    '{name} {verb} after {event}',
+    '{name} shares {verb} {amount}% as {event}',
+    '{name} {verb} on {event}',
+    '{name} reports {quarter} {metric} of ${value}B, {beat} estimates',
+    '{analyst} {rating} {name}, sets ${value}0 price target',
+    '{name} {verb} ahead of {event}',
+    '{name} to {action} in ${value}B deal',
+]
+
+WORDS = {
+    'verb': ['rises', 'falls', 'surges', 'slumps', 'jumps', 'drops', 'rallies', 'slides', 'climbs'],
+    'event': ['earnings beat', 'guidance cut', 'CPI report', 'jobs data', 'FOMC minutes',
+              'analyst downgrade', 'product launch', 'antitrust ruling', 'supply warning',
+              'record deliveries', 'buyback announcement', 'CEO departure'],
+    'quarter': ['Q1', 'Q2', 'Q3', 'Q4'],
+    'metric': ['revenue', 'EPS', 'operating income', 'free cash flow'],
+    'beat': ['topping', 'missing', 'matching'],
+    'analyst': ['Morgan Stanley', 'Goldman', 'UBS', 'Barclays', 'Jefferies', 'Citi'],
+    'rating': ['upgrades', 'downgrades', 'initiates coverage on', 'reiterates buy on'],
+    'action': ['acquire rival', 'sell unit', 'raise debt', 'expand buyback'],
+}
+
+# Word swaps used when a story is rewritten by another outlet
+SYNONYMS = {
+    'rises': 'gains', 'falls': 'declines', 'surges': 'soars', 'slumps': 'tumbles',
+    'jumps': 'leaps', 'drops': 'sinks', 'rallies': 'rebounds', 'shares': 'stock',
+    'after': 'following', 'reports': 'posts', 'upgrades': 'lifts rating on',
+    'topping': 'beating', 'acquire': 'buy', 'on': 'amid',
+}
+
+SUFFIXES = [' - report', ' - sources', ': Reuters', ' (update)', ', shares move', ' in premarket']
+
+SOURCES = ['Benzinga', 'Reuters', 'CNBC', 'MarketWatch', 'Bloomberg', 'Yahoo', 'Seeking Alpha', 'Zacks']
+
+TRACKING = ['utm_source=finnhub', 'utm_medium=api&utm_campaign=news', 'fbclid=abc', 'mc_cid=alpaca&mc_eid=1']
+
+# One generated story: (id, headline, source, symbols, timestamp)
+Story = Tuple[int, str, str, str, int]
+
+
+class HeadlineGenerator:
+    """
+    Deterministic stream of article dicts shaped like normalized API output.
+    
+    Most articles start a new story. A ``duplicate_rate`` fraction revisit a
+    recent story as one of:
+    
+    - a cross-source repost: identical headline from another source a few
+      minutes later, often the same URL with tracking parameters
+    - a rewrite: synonym swaps, a dropped word or an outlet suffix, from the
+      same or another source
+    - a symbol follow-up: a new story on an overlapping symbol set within
+      minutes (not a duplicate, but a Level 3 candidate)
+    """
+    
+    def __init__(self, seed: int = 0, duplicate_rate: float = 0.3,
+                 start: Optional[int] = None, mean_interval_seconds: float = 5.0,
+                 recent_stories: int = 200):
+        """
+        Initialize generator.
+        
+        Args:
+            seed: Random seed; equal seeds produce identical streams
+            duplicate_rate: Fraction of articles revisiting a recent story
+            start: Timestamp of the first article (default: now)
+            mean_interval_seconds: Mean gap between article timestamps
+            recent_stories: How many recent stories variants are drawn from
+        """
+        self.rng = random.Random(seed)
+        self.duplicate_rate = duplicate_rate
+        self.clock = float(start if start is not None else datetime.now().timestamp())
+        self.mean_interval_seconds = mean_interval_seconds
+        self._recent: Deque[Story] = deque(maxlen=recent_stories)
+        self._next_id = 0
+    
+    def articles(self, count: int) -> List[Dict]:
+        """Generate the next ``count`` articles."""
+        return [next(self) for _ in range(count)]
+    
+    def __iter__(self) -> Iterator[Dict]:
+        return self
+    
+    def __next__(self) -> Dict:
+        rng = self.rng
+        self.clock += rng.expovariate(1.0 / self.mean_interval_seconds)
+        
+        if self._recent and rng.random() < self.duplicate_rate:
+            story = rng.choice(self._recent)
+            kind = rng.random()
+            if kind < 0.4:
+                return self._repost(story)
+            if kind < 0.8:
+                return self._rewrite(story)
+            return self._follow_up(story)
+        return self._new_story()
+    
+    def _new_story(self, symbols: Optional[str] = None) -> Dict:
+        rng = self.rng
+        if rng.random() < 0.15:
+            name, symbol = rng.choice(MACRO)
+        else:
+            name, symbol = rng.choice(COMPANIES)
+        if symbols is None:
+            symbols = symbol
+            if rng.random() < 0.25:
+                symbols += ',' + rng.choice(COMPANIES)[1]  # Symbol overlap
+        
+        fields = {key: rng.choice(values) for key, values in WORDS.items()}
+        headline = rng.choice(TEMPLATES).format(
+            name=name,
+            amount=rng.randrange(1, 15),
+            value=f"{rng.uniform(1, 120):.1f}",
+            **fields
+        )
+        
+        story_id = self._next_id
+        self._next_id += 1
+        story = (story_id, headline, rng.choice(SOURCES), symbols, int(self.clock))
+        self._recent.append(story)
+        return self._article(story, story[1], story[2], f"/news/{story_id}")
+    
+    def _repost(self, story: Story) -> Dict:
+        rng = self.rng
+        source = rng.choice(SOURCES)
+        path = f"/news/{story[0]}"
+        if rng.random() < 0.6:
+            path += '?' + rng.choice(TRACKING)
+        else:
+            path = f"/{source.lower().replace(' ', '-')}/{story[0]}"
+        return self._article(story, story[1], source, path)
+    
+    def _rewrite(self, story: Story) -> Dict:
+        rng = self.rng
+        words = story[1].split()
+        for position, word in enumerate(words):
+            if word in SYNONYMS and rng.random() < 0.5:
+                words[position] = SYNONYMS[word]
+        if len(words) > 5 and rng.random() < 0.3:
+            del words[rng.randrange(1, len(words))]
+        headline = ' '.join(words)
+        if rng.random() < 0.5:
+            headline += rng.choice(SUFFIXES)
+        
+        source = story[2] if rng.random() < 0.5 else rng.choice(SOURCES)
+        return self._article(story, headline, source, f"/news/{story[0]}-r{self._next_id}")
+    
+    def _follow_up(self, story: Story) -> Dict:
+        return self._new_story(symbols=story[3])
+    
+    def _article(self, story: Story, headline: str, source: str, path: str) -> Dict:
+        domain = source.lower().replace(' ', '') + '.com'
+        self._next_id += 1
+        return {
+            'id': f"bench-{self._next_id}",
+            'headline': headline,
+            'summary': '',
+            'source': source,
+            'url': f"https://www.{domain}{path}",
+            'datetime': int(self.clock),
+            'related': story[3],
+            'image': '',
+            'category': 'company',
+            'origin': 'bench'
+        }
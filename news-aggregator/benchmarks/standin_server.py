@@ -0,0 +1,550 @@
+"""
+Local stand-in for every upstream the aggregator talks to.
+
+Serves Alpaca ``/news``, FinHub ``/news`` and ``/company-news``, the Yahoo
+VIX chart, Gemini ``generateContent`` and the Pulse ``/api/news`` sink from
+one port, each under its own path prefix. Three modes:
+
+- ``synth``: articles arrive on synthetic headline streams at ``--rate``
+  per second per feed, and cursors (Alpaca ``start``/``page_token``,
+  FinHub ``minId``, company-news dates) are honoured, so incremental
+  fetches behave like production at any volume
+- ``record``: requests are proxied to the real APIs and each response is
+  appended to a JSON-lines recording (request headers and query strings,
+  which carry the API keys, are not stored)
+- ``replay``: recorded responses are served back in order per endpoint,
+  cycling when they run out
+
+Every mode can add latency and fail a fraction of requests with 503.
+Point the aggregator at it with the environment lines printed on startup.
+
+Usage:
+    python benchmarks/standin_server.py --rate 50 --latency-ms 80 --error-ratio 0.02
+    python benchmarks/standin_server.py --mode record --recording upstream.jsonl
+    python benchmarks/standin_server.py --mode replay --recording upstream.jsonl
+"""
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+import argparse
+import hashlib
+import json
+import random
+import re
+import sys
+import threading
+import time
+from pathlib import Path
+
+import requests
+
+# Add this directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from headline_generator import HeadlineGenerator
+
+MODES = ('synth', 'record', 'replay')
+
+# Real API hosts proxied to in record mode, by path prefix
+UPSTREAMS = {
+    'alpaca': 'https://data.alpaca.markets',
+    'finnhub': 'https://finnhub.io',
+    'yahoo': 'https://query1.finance.yahoo.com',
+    'gemini': 'https://generativelanguage.googleapis.com',
+}
+
+# Environment variable -> path under the stand-in's root URL
+BASE_URL_PATHS = {
+    'ALPACA_BASE_URL': '/alpaca/v1beta1',
+    'FINNHUB_BASE_URL': '/finnhub/api/v1',
+    'YAHOO_CHART_URL': '/yahoo/v8/finance/chart',
+    'GEMINI_BASE_URL': '/gemini/',
+    'PULSE_ENDPOINT': '/pulse/api/news',
+}
+
+# Headers not forwarded when proxying
+HOP_HEADERS = {'host', 'connection', 'content-length', 'accept-encoding', 'keep-alive', 'transfer-encoding'}
+
+FINNHUB_PAGE = 100  # FinHub returns at most this many articles per call
+
+
+def route_of(method: str, path: str) -> Optional[str]:
+    """
+    Name the endpoint a request is for.
+    
+    Args:
+        method: HTTP method
+        path: URL path (without query string)
+    
+    Returns:
+        Route name, or None for unknown endpoints
+    """
+    if method == 'GET':
+        if path.startswith('/alpaca/') and path.endswith('/news'):
+            return 'alpaca_news'
+        if path.startswith('/finnhub/') and path.endswith('/company-news'):
+            return 'finnhub_company_news'
+        if path.startswith('/finnhub/') and path.endswith('/news'):
+            return 'finnhub_news'
+        if path.startswith('/yahoo/') and '/chart/' in path:
+            return 'yahoo_chart'
+    elif method == 'POST':
+        if path.startswith('/gemini/') and path.endswith(':generateContent'):
+            return 'gemini_generate'
+        if path == '/pulse/api/news':
+            return 'pulse_news'
+    return None
+
+
+class SyntheticFeed:
+    """
+    Articles from one synthetic headline stream, released as the clock passes them.
+    
+    Articles carry increasing integer ids and are kept in timestamp order;
+    the oldest are dropped beyond ``max_items``.
+    """
+    
+    def __init__(self, seed: int, rate: float, backlog_seconds: float, max_items: int = 50_000):
+        """
+        Initialize feed.
+        
+        Args:
+            seed: Headline generator seed
+            rate: Mean articles per second
+            backlog_seconds: Seconds of articles available at startup
+            max_items: Articles kept for cursor queries
+        """
+        self.generator = HeadlineGenerator(seed=seed, start=int(time.time() - backlog_seconds),
+                                           mean_interval_seconds=1.0 / rate)
+        self.max_items = max_items
+        self.articles: List[Dict] = []
+        self.times: List[int] = []
+        self._pending: Optional[Dict] = None
+        self._next_id = 1
+        self._lock = threading.Lock()
+    
+    def _advance(self, now: float):
+        while True:
+            if self._pending is None:
+                self._pending = next(self.generator)
+            if self._pending['datetime'] > now:
+                break
+            article = dict(self._pending, id=self._next_id)
+            self._next_id += 1
+            self.articles.append(article)
+            self.times.append(article['datetime'])
+            self._pending = None
+        if len(self.articles) > 2 * self.max_items:
+            del self.articles[:-self.max_items]
+            del self.times[:-self.max_items]
+    
+    def window(self, start: float, end: float) -> List[Dict]:
+        """Articles with start <= datetime <= end, oldest first."""
+        with self._lock:
+            self._advance(time.time())
+            return self.articles[bisect_left(self.times, start):bisect_right(self.times, end)]
+    
+    def latest(self, count: int, min_id: int = 0) -> List[Dict]:
+        """Up to ``count`` newest articles with id > min_id, newest first."""
+        with self._lock:
+            self._advance(time.time())
+            newest = []
+            for article in reversed(self.articles):
+                if article['id'] <= min_id or len(newest) >= count:
+                    break
+                newest.append(article)
+            return newest
+
+
+def _iso(timestamp: int) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def _parse_iso(value: str) -> Optional[float]:
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except (AttributeError, ValueError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)  # Bare dates (company news) are UTC
+    return parsed.timestamp()
+
+
+def alpaca_item(article: Dict) -> Dict:
+    """Raw Alpaca news item for a synthetic article."""
+    return {
+        'id': article['id'],
+        'headline': article['headline'],
+        'summary': article['summary'],
+        'author': '',
+        'created_at': _iso(article['datetime']),
+        'updated_at': _iso(article['datetime']),
+        'url': article['url'],
+        'source': article['source'].lower(),
+        'symbols': article['related'].split(','),
+        'images': []
+    }
+
+
+def finnhub_item(article: Dict, category: str) -> Dict:
+    """Raw FinHub news item for a synthetic article."""
+    return {
+        'id': article['id'],
+        'category': category,
+        'datetime': article['datetime'],
+        'headline': article['headline'],
+        'image': '',
+        'related': article['related'],
+        'source': article['source'],
+        'summary': article['summary'],
+        'url': article['url']
+    }
+
+
+SENTIMENTS = ['very_negative', 'negative', 'neutral', 'positive', 'very_positive']
+EVENT_TYPES = ['macro_critical', 'geopolitical', 'corporate', 'minor']
+
+
+def _analysis_for(text: str) -> Dict:
+    """Sentiment analysis derived from a hash of the text, so it is stable."""
+    digest = hashlib.sha1(text.encode()).digest()
+    sentiment = SENTIMENTS[digest[0] % len(SENTIMENTS)]
+    return {
+        'sentiment': sentiment,
+        'event_type': EVENT_TYPES[digest[1] % len(EVENT_TYPES)],
+        'confidence': round(0.5 + digest[2] / 510, 2),
+        'direction': 'bearish' if 'negative' in sentiment else 'bullish' if 'positive' in sentiment else 'neutral'
+    }
+
+
+def gemini_reply(request_body: bytes) -> Dict:
+    """
+    generateContent response with a sentiment analysis for the prompt.
+    
+    The analysis is derived from a hash of the prompt, so it is stable for
+    a given headline. Requests with an ``ARRAY`` response schema (batched
+    scoring) get an array with one indexed analysis per numbered
+    ``N. "headline"`` line, each hashed on its headline.
+    """
+    try:
+        request = json.loads(request_body)
+        prompt = request['contents'][0]['parts'][0]['text']
+    except (ValueError, KeyError, IndexError, TypeError):
+        request, prompt = {}, ''
+    schema = (request.get('generationConfig') or {}).get('responseSchema') or {}
+    if schema.get('type') == 'ARRAY':
+        reply = [
+            {'index': int(match.group(1)), **_analysis_for(json.loads(match.group(2)))}
+            for match in re.finditer(r'^(\d+)\. (".*")$', prompt, re.MULTILINE)
+        ]
+    else:
+        reply = _analysis_for(prompt)
+    return {
+        'candidates': [{
+            'content': {'parts': [{'text': json.dumps(reply)}], 'role': 'model'},
+            'finishReason': 'STOP',
+            'index': 0
+        }],
+        'usageMetadata': {'promptTokenCount': len(prompt) // 4, 'candidatesTokenCount': 30}
+    }
+
+
+class StandinServer(ThreadingHTTPServer):
+    """
+    Stand-in HTTP server for Alpaca, FinHub, Yahoo, Gemini and Pulse.
+    
+    Use ``start()`` to serve on a background thread (tests, in-process
+    benchmarks) or ``serve_forever()`` from the command line.
+    """
+    
+    daemon_threads = True
+    
+    def __init__(self, mode: str = 'synth', host: str = '127.0.0.1', port: int = 0,
+                 rate: float = 1.0, backlog_seconds: float = 300, latency_ms: float = 0.0,
+                 jitter_ms: float = 0.0, error_ratio: float = 0.0, seed: int = 0,
+                 recording_path: Optional[str] = None, upstreams: Optional[Dict[str, str]] = None):
+        """
+        Initialize stand-in server.
+        
+        Args:
+            mode: 'synth', 'record' or 'replay'
+            host: Interface to bind
+            port: Port to bind (0 picks a free one)
+            rate: Synthetic articles per second per feed
+            backlog_seconds: Seconds of synthetic articles available at startup
+            latency_ms: Delay added to every response
+            jitter_ms: Mean of an exponential delay added on top
+            error_ratio: Fraction of requests failed with 503
+            seed: Seed for synthetic feeds, latency and errors
+            recording_path: JSON-lines file written in record mode, read in replay mode
+            upstreams: Path prefix -> real host proxied to in record mode
+        """
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {', '.join(MODES)}")
+        if mode != 'synth' and not recording_path:
+            raise ValueError(f"{mode} mode needs a recording path")
+        super().__init__((host, port), StandinHandler)
+        
+        self.mode = mode
+        self.rate = rate
+        self.backlog_seconds = backlog_seconds
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_ratio = error_ratio
+        self.seed = seed
+        self.recording_path = recording_path
+        self.upstreams = dict(upstreams or UPSTREAMS)
+        
+        self.rng = random.Random(seed)
+        self.feeds: Dict[str, SyntheticFeed] = {}
+        self.replay: Dict[str, List[Tuple[int, str]]] = {}
+        self.replay_positions: Dict[str, int] = {}
+        self.proxy = requests.Session() if mode == 'record' else None
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        
+        self.stats = {
+            'requests': {},
+            'errors_injected': 0,
+            'pulse_articles': 0
+        }
+        
+        if mode == 'replay':
+            self._load_recording()
+    
+    @property
+    def root_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def base_urls(self) -> Dict[str, str]:
+        """Environment variable -> URL pointing the aggregator at this server."""
+        return {name: self.root_url + path for name, path in BASE_URL_PATHS.items()}
+    
+    def start(self) -> 'StandinServer':
+        """Serve on a daemon thread."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        """Stop serving and close the socket."""
+        self.shutdown()
+        self.server_close()
+        if self.proxy is not None:
+            self.proxy.close()
+    
+    def get_stats(self) -> Dict:
+        """Requests per route, injected errors and articles delivered to the Pulse sink."""
+        with self._lock:
+            return {**self.stats, 'requests': dict(self.stats['requests'])}
+    
+    def feed(self, name: str) -> SyntheticFeed:
+        """Synthetic feed for an endpoint (created on first use)."""
+        with self._lock:
+            if name not in self.feeds:
+                seed = self.seed * 1000 + int(hashlib.sha1(name.encode()).hexdigest()[:6], 16)
+                self.feeds[name] = SyntheticFeed(seed, self.rate, self.backlog_seconds)
+            return self.feeds[name]
+    
+    def count(self, route: str):
+        with self._lock:
+            self.stats['requests'][route] = self.stats['requests'].get(route, 0) + 1
+    
+    def delay_and_fail(self) -> bool:
+        """Sleep for the configured latency; True if this request should fail."""
+        with self._lock:
+            delay = self.latency_ms
+            if self.jitter_ms:
+                delay += self.rng.expovariate(1.0 / self.jitter_ms)
+            fail = self.rng.random() < self.error_ratio
+            if fail:
+                self.stats['errors_injected'] += 1
+        if delay:
+            time.sleep(delay / 1000)
+        return fail
+    
+    def record(self, route: str, status: int, body: str):
+        """Append one response to the recording."""
+        line = json.dumps({'route': route, 'status': status, 'body': body})
+        with self._lock:
+            with open(self.recording_path, 'a') as f:
+                f.write(line + '\n')
+    
+    def next_replay(self, route: str) -> Optional[Tuple[int, str]]:
+        """Next recorded response for a route, cycling (None if none were recorded)."""
+        with self._lock:
+            responses = self.replay.get(route)
+            if not responses:
+                return None
+            position = self.replay_positions.get(route, 0)
+            self.replay_positions[route] = position + 1
+            return responses[position % len(responses)]
+    
+    def _load_recording(self):
+        with open(self.recording_path) as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self.replay.setdefault(entry['route'], []).append((entry['status'], entry['body']))
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    """Dispatches requests to the server's mode."""
+    
+    protocol_version = 'HTTP/1.1'
+    server: StandinServer
+    
+    def do_GET(self):
+        self._handle('GET', b'')
+    
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        self._handle('POST', self.rfile.read(length))
+    
+    def log_message(self, *args):
+        pass
+    
+    def _handle(self, method: str, body: bytes):
+        parsed = urlparse(self.path)
+        if parsed.path == '/_standin/stats':
+            return self._reply(200, json.dumps(self.server.get_stats()))
+        route = route_of(method, parsed.path)
+        if route is None:
+            return self._reply(404, json.dumps({'error': f"no stand-in for {method} {parsed.path}"}))
+        
+        self.server.count(route)
+        if self.server.delay_and_fail():
+            return self._reply(503, json.dumps({'error': 'injected failure'}))
+        
+        if route == 'pulse_news':
+            return self._pulse(body)
+        if self.server.mode == 'record':
+            return self._proxy(route, method, parsed, body)
+        if self.server.mode == 'replay':
+            recorded = self.server.next_replay(route)
+            if recorded is None:
+                return self._reply(404, json.dumps({'error': f"nothing recorded for {route}"}))
+            return self._reply(*recorded)
+        return self._synth(route, parse_qs(parsed.query), body)
+    
+    def _reply(self, status: int, body: str):
+        data = body.encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def _pulse(self, body: bytes):
+        try:
+            received = len(json.loads(body).get('news', []))
+        except (ValueError, AttributeError):
+            return self._reply(400, json.dumps({'error': 'expected {"news": [...]}'}))
+        with self.server._lock:
+            self.server.stats['pulse_articles'] += received
+        self._reply(200, json.dumps({'received': received}))
+    
+    def _proxy(self, route: str, method: str, parsed, body: bytes):
+        prefix, _, rest = parsed.path.lstrip('/').partition('/')
+        url = f"{self.server.upstreams[prefix]}/{rest}"
+        if parsed.query:
+            url += '?' + parsed.query
+        headers = {k: v for k, v in self.headers.items() if k.lower() not in HOP_HEADERS}
+        try:
+            response = self.server.proxy.request(method, url, headers=headers, data=body or None, timeout=30)
+        except requests.exceptions.RequestException as e:
+            return self._reply(502, json.dumps({'error': str(e)}))
+        self.server.record(route, response.status_code, response.text)
+        self._reply(response.status_code, response.text)
+    
+    def _synth(self, route: str, query: Dict[str, List[str]], body: bytes):
+        def param(name, default=None):
+            return query.get(name, [default])[0]
+        
+        if route == 'alpaca_news':
+            return self._reply(200, json.dumps(self._alpaca_page(param)))
+        
+        if route == 'finnhub_news':
+            category = param('category', 'general')
+            items = self.server.feed(f"finnhub:{category}").latest(FINNHUB_PAGE, int(param('minId', 0)))
+            return self._reply(200, json.dumps([finnhub_item(a, category) for a in items]))
+        
+        if route == 'finnhub_company_news':
+            symbol = param('symbol', '')
+            start = _parse_iso(param('from', '1970-01-01')) or 0
+            end = (_parse_iso(param('to', '2100-01-01')) or time.time()) + 86400
+            items = [
+                finnhub_item(article, 'company')
+                for article in reversed(self.server.feed('finnhub:company').window(start, end))
+                if symbol in article['related'].split(',')
+            ]
+            return self._reply(200, json.dumps(items[:FINNHUB_PAGE]))
+        
+        if route == 'yahoo_chart':
+            with self.server._lock:
+                vix = round(15 + self.server.rng.gauss(0, 2), 2)
+            return self._reply(200, json.dumps({'chart': {'result': [{'meta': {'regularMarketPrice': vix}}]}}))
+        
+        return self._reply(200, json.dumps(gemini_reply(body)))
+    
+    def _alpaca_page(self, param) -> Dict:
+        start = _parse_iso(param('start', '')) or time.time() - 3600
+        end = _parse_iso(param('end', '')) or time.time()
+        limit = min(int(param('limit', 10)), 50)
+        symbols = set(filter(None, param('symbols', '').split(',')))
+        
+        articles = self.server.feed('alpaca').window(start, end)
+        if symbols:
+            articles = [a for a in articles if symbols & set(a['related'].split(','))]
+        if param('sort', 'desc') != 'asc':
+            articles = articles[::-1]
+        
+        offset = int(param('page_token', 0))
+        page = articles[offset:offset + limit]
+        next_token = str(offset + limit) if offset + limit < len(articles) else None
+        return {'news': [alpaca_item(a) for a in page], 'next_page_token': next_token}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--mode', choices=MODES, default='synth')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--rate', type=float, default=1.0, help='Synthetic articles per second per feed')
+    parser.add_argument('--backlog', type=float, default=300, help='Seconds of synthetic articles at startup')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Delay added to every response')
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help='Mean extra exponential delay')
+    parser.add_argument('--error-ratio', type=float, default=0.0, help='Fraction of requests failed with 503')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--recording', help='JSON-lines recording (record/replay modes)')
+    args = parser.parse_args()
+    
+    server = StandinServer(
+        mode=args.mode,
+        host=args.host,
+        port=args.port,
+        rate=args.rate,
+        backlog_seconds=args.backlog,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_ratio=args.error_ratio,
+        seed=args.seed,
+        recording_path=args.recording
+    )
+    print(f"🧪 Stand-in upstreams ({args.mode}) on {server.root_url}; point the aggregator at it with:")
+    for name, url in server.base_urls().items():
+        print(f"export {name}={url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"📈 Stats: {server.get_stats()}")
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,185 @@
+"""
+Local stand-in for Alpaca's real-time news WebSocket.
+
+Speaks the stream protocol (welcome, auth, subscribe, ``"T": "n"`` news
+messages) and pushes synthetic headlines to subscribed clients at
+``--rate`` per second. Articles can also be published explicitly, and
+open connections dropped to exercise reconnects. Needs ``websockets``.
+
+Usage:
+    python benchmarks/standin_stream.py --rate 5
+    python benchmarks/standin_stream.py --rate 50 --key test --secret test
+"""
+from typing import Dict, List, Optional, Set
+import argparse
+import asyncio
+import json
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+from websockets.asyncio.server import serve
+
+# Add this directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from headline_generator import HeadlineGenerator
+from standin_server import alpaca_item
+
+
+class StandinStream:
+    """
+    Alpaca news stream stand-in running on its own event loop thread.
+    
+    ``publish()`` and ``drop_connections()`` may be called from any thread.
+    """
+    
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, rate: float = 0.0, seed: int = 0,
+                 key: Optional[str] = None, secret: Optional[str] = None):
+        """
+        Initialize stream stand-in.
+        
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free one)
+            rate: Synthetic articles per second (0 sends only published ones)
+            seed: Headline generator seed
+            key: Required API key (None accepts any)
+            secret: Required API secret
+        """
+        self.host = host
+        self.port = port
+        self.rate = rate
+        self.key = key
+        self.secret = secret
+        self.generator = HeadlineGenerator(seed=seed)
+        self.rng = random.Random(seed)
+        self._clients: Dict[object, Set[str]] = {}
+        self._next_id = 1
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stopped: Optional[asyncio.Event] = None
+        self._ready = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        
+        self.stats = {
+            'connections': 0,
+            'auth_failures': 0,
+            'articles_sent': 0
+        }
+    
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}/v1beta1/news"
+    
+    @property
+    def subscribers(self) -> int:
+        return len(self._clients)
+    
+    def start(self) -> 'StandinStream':
+        """Serve on a daemon thread; returns once the port is bound."""
+        self._thread = threading.Thread(target=lambda: asyncio.run(self._serve()), daemon=True)
+        self._thread.start()
+        self._ready.wait(10)
+        return self
+    
+    def stop(self):
+        """Close every connection and stop serving."""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._stopped.set)
+            self._thread.join(10)
+    
+    def publish(self, items: List[Dict]):
+        """Send raw Alpaca news items (without ``T``) to matching subscribers."""
+        asyncio.run_coroutine_threadsafe(self._broadcast(items), self._loop).result(10)
+    
+    def make_item(self, **overrides) -> Dict:
+        """Synthetic raw news item timestamped now."""
+        article = dict(next(self.generator), id=self._next_id, datetime=int(time.time()))
+        self._next_id += 1
+        return {**alpaca_item(article), **overrides}
+    
+    def drop_connections(self):
+        """Close every open connection (clients should reconnect)."""
+        async def close_all():
+            for ws in list(self._clients):
+                await ws.close()
+        asyncio.run_coroutine_threadsafe(close_all(), self._loop).result(10)
+    
+    async def _serve(self):
+        self._loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        async with serve(self._handler, self.host, self.port) as server:
+            self.port = server.sockets[0].getsockname()[1]
+            self._ready.set()
+            synth = asyncio.create_task(self._synthesize()) if self.rate > 0 else None
+            await self._stopped.wait()
+            if synth:
+                synth.cancel()
+            server.close()
+    
+    async def _handler(self, ws):
+        self.stats['connections'] += 1
+        await ws.send(json.dumps([{'T': 'success', 'msg': 'connected'}]))
+        auth = json.loads(await ws.recv())
+        if self.key is not None and (auth.get('key'), auth.get('secret')) != (self.key, self.secret):
+            self.stats['auth_failures'] += 1
+            await ws.send(json.dumps([{'T': 'error', 'code': 402, 'msg': 'auth failed'}]))
+            await ws.close()
+            return
+        await ws.send(json.dumps([{'T': 'success', 'msg': 'authenticated'}]))
+        
+        subscribe = json.loads(await ws.recv())
+        symbols = subscribe.get('news') or ['*']
+        await ws.send(json.dumps([{'T': 'subscription', 'news': symbols}]))
+        self._clients[ws] = set(symbols)
+        try:
+            await ws.wait_closed()
+        finally:
+            self._clients.pop(ws, None)
+    
+    async def _broadcast(self, items: List[Dict]):
+        for ws, symbols in list(self._clients.items()):
+            matching = [
+                {'T': 'n', **item} for item in items
+                if '*' in symbols or symbols & set(item.get('symbols', []))
+            ]
+            if matching:
+                try:
+                    await ws.send(json.dumps(matching))
+                except Exception:
+                    continue  # Closing; the handler removes it
+                self.stats['articles_sent'] += len(matching)
+    
+    async def _synthesize(self):
+        while True:
+            await asyncio.sleep(self.rng.expovariate(self.rate))
+            await self._broadcast([self.make_item()])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--rate', type=float, default=1.0, help='Synthetic articles per second')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--key', help='Required API key (default: accept any)')
+    parser.add_argument('--secret', help='Required API secret')
+    args = parser.parse_args()
+    
+    stream = StandinStream(args.host, args.port, args.rate, args.seed, args.key, args.secret).start()
+    print(f"🧪 Stand-in Alpaca news stream on {stream.url}; point the aggregator at it with:")
+    print(f"export ALPACA_STREAM_URL={stream.url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"📈 Stats: {stream.stats}")
+        stream.stop()
+
+
+if __name__ == '__main__':
+    main()
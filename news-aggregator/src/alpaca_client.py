@@ -1,16 +1,60 @@
 """Alpaca Market Data API client for news fetching."""
 import requests
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Dict, Optional, Tuple
+import json
 import logging
+import os
+import time
+
+from article_merge import merge_by_time
+from checkpoint import write_json_atomic
+from config import ALPACA_BASE_URL, ALPACA_SYMBOL_CHUNK_SIZE
+from fast_json import decode_response
+from http_pool import get_session
+from lazy_article import FieldMap, LazyArticle
+from resilience import CircuitBreaker, CircuitOpenError, Hedger, get_breaker, get_hedger, guarded_get
 
 logger = logging.getLogger(__name__)
 
 
+def _created_timestamp(article: Dict) -> int:
+    created_at = article.get('created_at', article.get('updated_at', ''))
+    try:
+        return int(datetime.fromisoformat(created_at.replace('Z', '+00:00')).timestamp())
+    except (AttributeError, TypeError, ValueError):
+        return int(time.time())
+
+
+def _first_image(article: Dict) -> str:
+    images = article.get('images')
+    return images[0].get('url', '') if images else ''
+
+
+# Normalized field -> extractor for raw Alpaca articles (see LazyArticle)
+ALPACA_FIELDS: FieldMap = {
+    'id': lambda article: article.get('id', 0),
+    'headline': lambda article: article.get('headline', ''),
+    'summary': lambda article: article.get('summary', ''),
+    'url': lambda article: article.get('url', ''),
+    'image': _first_image,
+    'source': lambda article: article.get('source', 'Alpaca'),
+    'datetime': _created_timestamp,
+    'category': lambda article: 'company',
+    'related': lambda article: ','.join(article.get('symbols') or []),
+    'origin': lambda article: 'alpaca',
+}
+
+
 class AlpacaNewsClient:
     """Client for fetching news from Alpaca Market Data API."""
     
-    def __init__(self, api_key: Optional[str] = None, api_secret: Optional[str] = None, base_url: str = "https://data.alpaca.markets/v1beta1"):
+    def __init__(self, api_key: Optional[str] = None, api_secret: Optional[str] = None, base_url: str = ALPACA_BASE_URL,
+                 session: Optional[requests.Session] = None, cursor_path: Optional[str] = None,
+                 cursor_overlap_seconds: int = 60, breaker: Optional[CircuitBreaker] = None,
+                 hedger: Optional[Hedger] = None, symbol_chunk_size: int = ALPACA_SYMBOL_CHUNK_SIZE,
+                 max_workers: int = 4):
         """
         Initialize Alpaca news client.
         
@@ -18,110 +62,411 @@ class AlpacaNewsClient:
             api_key: Alpaca API key (optional for crypto data)
             api_secret: Alpaca API secret (optional for crypto data)
             base_url: Base URL for Alpaca API
+            session: HTTP session (defaults to the shared pooled session)
+            cursor_path: Optional JSON file persisting the high-water mark across restarts
+            cursor_overlap_seconds: How far before the high-water mark each incremental
+                fetch starts, to catch late-indexed items (overlap is removed by dedupe)
+            breaker: Circuit breaker for Alpaca (defaults to the shared one)
+            hedger: Hedger for news requests (defaults to the shared one when
+                HEDGE_REQUESTS is on)
+            symbol_chunk_size: Symbols per request; larger watchlists are split
+                into chunks fetched concurrently, each with its own page limit
+            max_workers: Chunks fetched at once
         """
         self.api_key = api_key
         self.api_secret = api_secret
         self.base_url = base_url
+        self.session = session or get_session()
+        self.breaker = breaker or get_breaker('alpaca')
+        self.hedger = hedger if hedger is not None else get_hedger('alpaca')
         self.last_fetch_time = None
+        self.cursor_path = cursor_path
+        self.cursor_overlap_seconds = cursor_overlap_seconds
+        # Newest created_at seen so far (UTC); incremental fetches start here
+        self.high_water_mark: Optional[datetime] = self._load_cursor()
+        self.last_fetch_pages = 0
+        self.symbol_chunk_size = symbol_chunk_size
+        self.max_workers = max_workers
+    
+    def get_news(self, symbols: Optional[List[str]] = None, hours_back: int = 1, limit: int = 50,
+                 use_incremental: bool = True, max_pages: Optional[int] = None) -> List[Dict]:
+        """
+        Fetch news from Alpaca API and advance the high-water mark past it.
+        
+        Args:
+            symbols: List of symbols to fetch news for (None for all)
+            hours_back: How many hours back to fetch news when there is no
+                high-water mark yet (or use_incremental is False)
+            limit: Articles per page (Alpaca allows up to 50)
+            use_incremental: Start from the high-water mark instead of hours_back
+            max_pages: Stop after this many pages (None for all); the rest is
+                picked up by the next incremental fetch
+        
+        Returns:
+            List of news articles in normalized format, oldest first
+        """
+        articles, mark = self.fetch_news(symbols, hours_back, limit, use_incremental, max_pages)
+        self.commit_cursor(mark)
+        return articles
     
-    def get_news(self, symbols: Optional[List[str]] = None, hours_back: int = 1, limit: int = 50) -> List[Dict]:
+    def fetch_news(self, symbols: Optional[List[str]] = None, hours_back: int = 1, limit: int = 50,
+                   use_incremental: bool = True, max_pages: Optional[int] = None,
+                   deadline: Optional[float] = None) -> Tuple[List[Dict], Optional[datetime]]:
         """
-        Fetch news from Alpaca API.
+        Fetch news from Alpaca API, following pagination, without moving the cursor.
+        
+        Watchlists longer than ``symbol_chunk_size`` are fetched in
+        concurrent chunks (see ``get_news_chunked``). The new high-water
+        mark is returned rather than applied: pass it to ``commit_cursor``
+        once the articles are used, and a fetch whose results are dropped
+        is simply repeated next time.
         
         Args:
             symbols: List of symbols to fetch news for (None for all)
-            hours_back: How many hours back to fetch news
-            limit: Maximum number of articles to return
+            hours_back: Window used when there is no high-water mark
+            limit: Articles per page (Alpaca allows up to 50)
+            use_incremental: Start from the high-water mark instead of hours_back
+            max_pages: Stop after this many pages (None for all)
+            deadline: ``time.monotonic()`` by which every request, including
+                retries, must finish (None for the 30s per-request timeout only)
         
         Returns:
-            List of news articles in normalized format
+            (articles in normalized format oldest first, new high-water mark
+            or None if it should not move)
         """
+        if symbols and len(symbols) > self.symbol_chunk_size:
+            return self._fetch_chunked(symbols, hours_back, limit, use_incremental, max_pages, deadline)
+        
+        start, end = self._fetch_window(hours_back, use_incremental)
+        logger.info(f"Fetching Alpaca news: symbols={symbols}, since={self._format_time(start)}")
+        news_items = []
+        self.last_fetch_pages = 0
         try:
-            # Calculate time range
-            end = datetime.now()
-            start = end - timedelta(hours=hours_back)
+            for page, _ in self._iter_raw_pages(symbols, start, end, limit, max_pages, deadline=deadline):
+                news_items.extend(page)
+                self.last_fetch_pages += 1
+                self.last_fetch_time = datetime.now()
+        except CircuitOpenError as e:
+            logger.warning(f"⚡ {e}")
+        except requests.exceptions.RequestException as e:
+            logger.error(f"❌ Error fetching Alpaca news: {e}")
+        except Exception as e:
+            logger.error(f"❌ Unexpected error in Alpaca client: {e}")
+        
+        # Pages arrive oldest first, so the pages received are a complete prefix
+        articles = [self._normalize_article(article) for article in news_items]
+        if self.last_fetch_pages:
+            logger.info(f"✅ Fetched {len(articles)} articles from Alpaca ({self.last_fetch_pages} pages)")
+        return articles, self._newest(news_items)
+    
+    def get_latest_news(self, symbols: Optional[List[str]] = None, hours_back: int = 1,
+                        limit: int = 50) -> List[Dict]:
+        """
+        Fetch the newest articles with a single request, for on-demand readers.
+        
+        Unlike ``get_news`` this never reads or moves the high-water mark, so
+        callers such as the HTTP API see the same window on every request
+        whatever symbols they ask for.
+        
+        Args:
+            symbols: List of symbols to fetch news for (None for all)
+            hours_back: How many hours back to look
+            limit: Maximum number of articles (Alpaca allows up to 50)
+        
+        Returns:
+            Up to ``limit`` articles in normalized format, newest first
+        """
+        end = datetime.now(timezone.utc)
+        start = end - timedelta(hours=hours_back)
+        try:
+            news_items, _ = next(self._iter_raw_pages(symbols, start, end, limit, max_pages=1, sort="desc"))
+        except CircuitOpenError as e:
+            logger.warning(f"⚡ {e}")
+            return []
+        except requests.exceptions.RequestException as e:
+            logger.error(f"❌ Error fetching Alpaca news: {e}")
+            return []
+        except Exception as e:
+            logger.error(f"❌ Unexpected error in Alpaca client: {e}")
+            return []
+        return [self._normalize_article(article) for article in news_items]
+    
+    def iter_news_pages(self, symbols: Optional[List[str]] = None, hours_back: int = 1, limit: int = 50,
+                        use_incremental: bool = True, max_pages: Optional[int] = None
+                        ) -> Iterator[Tuple[List[Dict], Optional[datetime]]]:
+        """
+        Stream pages of news as they arrive, following ``next_page_token``.
+        
+        Pages are requested oldest first and each comes with the high-water
+        mark it reaches. Like ``fetch_news``, the cursor is left to the
+        caller: pass a page's mark to ``commit_cursor`` once its articles are
+        used, so a capped or interrupted stream resumes after the last page
+        handled and never skips items. Request errors propagate to the caller.
+        
+        Args:
+            symbols: List of symbols to fetch news for (None for all)
+            hours_back: Window used when there is no high-water mark
+            limit: Articles per page
+            use_incremental: Start from the high-water mark instead of hours_back
+            max_pages: Stop after this many pages (None for all)
+        
+        Yields:
+            (normalized articles of one page, high-water mark after that page)
+        """
+        start, end = self._fetch_window(hours_back, use_incremental)
+        logger.info(f"Fetching Alpaca news: symbols={symbols}, since={self._format_time(start)}")
+        self.last_fetch_pages = 0
+        for news_items, _ in self._iter_raw_pages(symbols, start, end, limit, max_pages):
+            self.last_fetch_pages += 1
+            self.last_fetch_time = datetime.now()
             
-            # Build request parameters
-            params = {
-                "start": start.isoformat() + "Z",
-                "end": end.isoformat() + "Z",
-                "limit": limit,
-                "sort": "desc"
+            yield [self._normalize_article(article) for article in news_items], self._newest(news_items)
+    
+    def get_news_chunked(self, symbols: List[str], hours_back: int = 1, limit: int = 50,
+                         use_incremental: bool = True, max_pages: Optional[int] = None) -> List[Dict]:
+        """
+        Fetch news for a large watchlist in concurrent symbol chunks.
+        
+        Each chunk has its own page limit, so busy tickers cannot crowd
+        quiet ones out of a shared ``limit``, and URLs stay bounded. Chunks
+        share one time window and their oldest-first results are k-way
+        merged; an article tagged with symbols in several chunks is kept
+        once. The high-water mark only moves once every chunk has
+        succeeded, and never past an unfinished (page-capped) chunk.
+        
+        Args:
+            symbols: Symbols to fetch news for
+            hours_back: Window used when there is no high-water mark
+            limit: Articles per page, per chunk
+            use_incremental: Start from the high-water mark instead of hours_back
+            max_pages: Page cap per chunk (None for all)
+        
+        Returns:
+            List of news articles in normalized format, oldest first
+        """
+        articles, mark = self._fetch_chunked(symbols, hours_back, limit, use_incremental, max_pages)
+        self.commit_cursor(mark)
+        return articles
+    
+    def _fetch_chunked(self, symbols: List[str], hours_back: int, limit: int, use_incremental: bool,
+                       max_pages: Optional[int], deadline: Optional[float] = None
+                       ) -> Tuple[List[Dict], Optional[datetime]]:
+        """Chunked fetch behind get_news_chunked, returning the new mark instead of applying it."""
+        chunks = [symbols[i:i + self.symbol_chunk_size] for i in range(0, len(symbols), self.symbol_chunk_size)]
+        start, end = self._fetch_window(hours_back, use_incremental)
+        logger.info(
+            f"Fetching Alpaca news: {len(symbols)} symbols in {len(chunks)} chunks, since={self._format_time(start)}"
+        )
+        
+        results = []
+        failed = False
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(chunks)), thread_name_prefix='alpaca') as pool:
+            futures = [
+                pool.submit(self._fetch_chunk, chunk, start, end, limit, max_pages, deadline) for chunk in chunks
+            ]
+            for future in futures:
+                try:
+                    results.append(future.result())
+                except CircuitOpenError as e:
+                    logger.warning(f"⚡ {e}")
+                    failed = True
+                except requests.exceptions.RequestException as e:
+                    logger.error(f"❌ Error fetching Alpaca news chunk: {e}")
+                    failed = True
+                except Exception as e:
+                    logger.error(f"❌ Unexpected error in Alpaca client: {e}")
+                    failed = True
+        
+        self.last_fetch_pages = sum(pages for _, pages, _ in results)
+        self.last_fetch_time = datetime.now()
+        mark = None
+        if not failed:
+            # A capped chunk has unseen items after its newest one; don't move past it
+            capped = [self._newest(items) for items, _, complete in results if not complete]
+            newest = [self._newest(items) for items, _, _ in results]
+            mark = min(capped) if capped else max((m for m in newest if m is not None), default=None)
+        
+        articles = list(merge_by_time(
+            ([self._normalize_article(article) for article in items] for items, _, _ in results),
+            newest_first=False,
+            unique_ids=True
+        ))
+        logger.info(f"✅ Fetched {len(articles)} articles from Alpaca ({self.last_fetch_pages} pages)")
+        return articles, mark
+    
+    def _fetch_chunk(self, symbols: List[str], start: datetime, end: datetime, limit: int,
+                     max_pages: Optional[int], deadline: Optional[float] = None) -> Tuple[List[Dict], int, bool]:
+        """Raw articles, page count and whether the window was fully paged for one chunk."""
+        news_items = []
+        pages = 0
+        complete = True
+        for page, has_more in self._iter_raw_pages(symbols, start, end, limit, max_pages, deadline=deadline):
+            news_items.extend(page)
+            pages += 1
+            complete = not has_more
+        return news_items, pages, complete
+    
+    def _fetch_window(self, hours_back: int, use_incremental: bool) -> Tuple[datetime, datetime]:
+        """Start and end of the next fetch."""
+        end = datetime.now(timezone.utc)
+        if use_incremental and self.high_water_mark is not None:
+            start = self.high_water_mark - timedelta(seconds=self.cursor_overlap_seconds)
+        else:
+            start = end - timedelta(hours=hours_back)
+        return start, end
+    
+    def _iter_raw_pages(self, symbols: Optional[List[str]], start: datetime, end: datetime, limit: int,
+                        max_pages: Optional[int], sort: str = "asc",
+                        deadline: Optional[float] = None) -> Iterator[Tuple[List[Dict], bool]]:
+        """
+        Request pages (oldest first by default), following ``next_page_token``.
+        
+        With a deadline, page requests and their retries all end by it.
+        
+        Yields:
+            (raw articles, whether more pages were left unfetched)
+        """
+        params = {
+            "start": self._format_time(start),
+            "end": self._format_time(end),
+            "limit": limit,
+            "sort": sort
+        }
+        if symbols:
+            params["symbols"] = ",".join(symbols)
+        
+        headers = {}
+        if self.api_key and self.api_secret:
+            headers = {
+                "APCA-API-KEY-ID": self.api_key,
+                "APCA-API-SECRET-KEY": self.api_secret
             }
-            
-            if symbols:
-                params["symbols"] = ",".join(symbols)
-            
-            # Build headers
-            headers = {}
-            if self.api_key and self.api_secret:
-                headers = {
-                    "APCA-API-KEY-ID": self.api_key,
-                    "APCA-API-SECRET-KEY": self.api_secret
-                }
-            
-            # Make request
-            logger.info(f"Fetching Alpaca news: symbols={symbols}, hours_back={hours_back}")
-            response = requests.get(
+        
+        pages = 0
+        while True:
+            response = guarded_get(
+                self.session,
                 f"{self.base_url}/news",
-                params=params,
+                self.breaker,
+                self.hedger,
+                deadline=deadline,
+                params=dict(params),
                 headers=headers,
                 timeout=30
             )
-            
             response.raise_for_status()
-            data = response.json()
+            data = decode_response(response)
+            pages += 1
             
             # Extract news array from response
             news_items = data.get('news', []) if isinstance(data, dict) else data
+            page_token = data.get('next_page_token') if isinstance(data, dict) else None
+            has_more = bool(page_token and news_items)
+            capped = has_more and max_pages is not None and pages >= max_pages
+            yield news_items, capped
             
-            logger.info(f"✅ Fetched {len(news_items)} articles from Alpaca")
-            self.last_fetch_time = datetime.now()
-            
-            # Normalize to common format
-            return [self._normalize_article(article) for article in news_items]
-            
-        except requests.exceptions.RequestException as e:
-            logger.error(f"❌ Error fetching Alpaca news: {e}")
-            return []
-        except Exception as e:
-            logger.error(f"❌ Unexpected error in Alpaca client: {e}")
-            return []
+            if not has_more:
+                break
+            if capped:
+                if sort == "asc":
+                    logger.info(f"Alpaca page limit ({max_pages}) reached; resuming next cycle")
+                break
+            params["page_token"] = page_token
+    
+    @staticmethod
+    def _format_time(value: datetime) -> str:
+        """Format a UTC datetime as RFC 3339 for the Alpaca API."""
+        return value.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+    
+    @staticmethod
+    def _parse_time(value: str) -> Optional[datetime]:
+        """Parse an Alpaca RFC 3339 timestamp (None if missing or malformed)."""
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except (AttributeError, ValueError):
+            return None
+    
+    def _newest(self, news_items: List[Dict]) -> Optional[datetime]:
+        """Newest created_at among raw articles (None if there are none)."""
+        times = [self._parse_time(article.get('created_at')) for article in news_items]
+        return max((t for t in times if t is not None), default=None)
     
-    def _normalize_article(self, article: Dict) -> Dict:
+    def _raise_mark(self, mark: Optional[datetime]):
+        """Move the high-water mark forward to mark (never back)."""
+        if mark is not None and (self.high_water_mark is None or mark > self.high_water_mark):
+            self.high_water_mark = mark
+    
+    def commit_cursor(self, mark: Optional[datetime]):
         """
-        Normalize Alpaca article to common format.
+        Apply a high-water mark returned by ``fetch_news`` (or yielded by
+        ``iter_news_pages``) and persist it.
         
         Args:
-            article: Raw article from Alpaca API
-        
-        Returns:
-            Normalized article dictionary
+            mark: New high-water mark (None or an older mark leaves it as is)
         """
-        # Parse timestamp
-        created_at = article.get('created_at', article.get('updated_at', ''))
+        self._raise_mark(mark)
+        self._save_cursor()
+    
+    def _load_cursor(self) -> Optional[datetime]:
+        """Read the persisted high-water mark, if any."""
+        if not self.cursor_path or not os.path.exists(self.cursor_path):
+            return None
         try:
-            dt = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-            timestamp = int(dt.timestamp())
-        except:
-            timestamp = int(datetime.now().timestamp())
-        
-        # Extract symbols
-        symbols = article.get('symbols', [])
-        related = ','.join(symbols) if symbols else ''
+            with open(self.cursor_path) as f:
+                return self._parse_time(json.load(f).get('high_water_mark'))
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️  Ignoring unreadable Alpaca cursor {self.cursor_path}: {e}")
+            return None
+    
+    def _save_cursor(self):
+        """Persist the high-water mark atomically (write, then rename)."""
+        if not self.cursor_path or self.high_water_mark is None:
+            return
+        try:
+            write_json_atomic(self.cursor_path, {'high_water_mark': self._format_time(self.high_water_mark)})
+        except OSError as e:
+            logger.error(f"❌ Error saving Alpaca cursor {self.cursor_path}: {e}")
+    
+    def get_state(self) -> Dict:
+        """
+        Cursor state for checkpointing.
         
+        Returns:
+            JSON-serializable high-water mark and last fetch time
+        """
         return {
-            'id': article.get('id', 0),
-            'headline': article.get('headline', ''),
-            'summary': article.get('summary', ''),
-            'url': article.get('url', ''),
-            'image': article.get('images', [{}])[0].get('url', '') if article.get('images') else '',
-            'source': article.get('source', 'Alpaca'),
-            'datetime': timestamp,
-            'category': 'company',
-            'related': related,
-            'origin': 'alpaca'
+            'high_water_mark': self._format_time(self.high_water_mark) if self.high_water_mark else None,
+            'last_fetch_time': self.last_fetch_time.isoformat() if self.last_fetch_time else None
         }
+    
+    def load_state(self, state: Dict):
+        """
+        Restore cursor state from a checkpoint.
+        
+        The newer of the checkpointed and current high-water marks wins, so
+        a mark already loaded from ``cursor_path`` is never moved back.
+        
+        Args:
+            state: Output of get_state()
+        """
+        self._raise_mark(self._parse_time(state.get('high_water_mark')))
+        if state.get('last_fetch_time') and self.last_fetch_time is None:
+            self.last_fetch_time = datetime.fromisoformat(state['last_fetch_time'])
+    
+    def _normalize_article(self, article: Dict) -> LazyArticle:
+        """
+        Normalize Alpaca article to common format.
+        
+        Fields are converted on first read, so articles dropped by dedupe
+        never parse their summary or images.
+        
+        Args:
+            article: Raw article from Alpaca API
+        
+        Returns:
+            Normalized article (dict-like; ``to_dict()`` for a plain dict)
+        """
+        return LazyArticle(article, ALPACA_FIELDS)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,171 @@
+"""Alpaca real-time news over WebSocket."""
+import asyncio
+import json
+import logging
+import random
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from alpaca_client import ALPACA_FIELDS
+from config import ALPACA_STREAM_URL
+from lazy_article import LazyArticle
+
+try:
+    from websockets.asyncio.client import connect as ws_connect
+    from websockets.exceptions import ConnectionClosed, InvalidHandshake
+except ImportError:  # websockets is optional; only streaming mode needs it
+    ws_connect = None
+    ConnectionClosed = InvalidHandshake = OSError
+
+logger = logging.getLogger(__name__)
+
+
+class StreamError(Exception):
+    """The stream rejected the connection (e.g. auth failed, connection limit)."""
+
+
+def websockets_available() -> bool:
+    """Whether the websockets package is installed."""
+    return ws_connect is not None
+
+
+class AlpacaNewsStream:
+    """
+    Subscriber to Alpaca's real-time news WebSocket.
+    
+    Articles arrive as soon as Alpaca publishes them and are handed to a
+    callback in the same normalized form as ``AlpacaNewsClient.get_news``.
+    Dropped connections are retried with jittered exponential backoff;
+    ``on_reconnect`` fires after each successful reconnect so the caller
+    can poll REST for anything published while the socket was down.
+    """
+    
+    def __init__(self, api_key: Optional[str], api_secret: Optional[str], url: str = ALPACA_STREAM_URL,
+                 symbols: Optional[List[str]] = None, reconnect_min_seconds: float = 1.0,
+                 reconnect_max_seconds: float = 60.0):
+        """
+        Initialize news stream.
+        
+        Args:
+            api_key: Alpaca API key
+            api_secret: Alpaca API secret
+            url: News stream URL
+            symbols: Symbols to subscribe to (None for all news)
+            reconnect_min_seconds: First reconnect delay
+            reconnect_max_seconds: Longest reconnect delay
+        """
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.url = url
+        self.symbols = list(symbols) if symbols else ['*']
+        self.reconnect_min_seconds = reconnect_min_seconds
+        self.reconnect_max_seconds = reconnect_max_seconds
+        self.connected = False
+        self._stopping = asyncio.Event()
+        self._ws = None
+        
+        self.stats = {
+            'connects': 0,
+            'reconnects': 0,
+            'messages': 0,
+            'articles': 0,
+            'errors': 0
+        }
+    
+    async def run(self, on_articles: Callable[[List[Dict]], Awaitable[None]],
+                  on_reconnect: Optional[Callable[[], None]] = None):
+        """
+        Stream news until ``stop()`` is called.
+        
+        Args:
+            on_articles: Awaited with each batch of normalized articles
+            on_reconnect: Called after every reconnect (not the first connect)
+        
+        Raises:
+            RuntimeError: If websockets is not installed
+        """
+        if ws_connect is None:
+            raise RuntimeError("Alpaca streaming needs the websockets package (pip install websockets)")
+        
+        delay = self.reconnect_min_seconds
+        while not self._stopping.is_set():
+            try:
+                async with ws_connect(self.url, open_timeout=10, ping_interval=20) as ws:
+                    self._ws = ws
+                    await self._handshake(ws)
+                    self.connected = True
+                    self.stats['connects'] += 1
+                    delay = self.reconnect_min_seconds
+                    if self.stats['connects'] > 1:
+                        self.stats['reconnects'] += 1
+                        logger.info("📡 Alpaca news stream reconnected")
+                        if on_reconnect:
+                            on_reconnect()
+                    else:
+                        logger.info(f"📡 Alpaca news stream connected ({','.join(self.symbols)})")
+                    
+                    async for message in ws:
+                        articles = self._parse(message)
+                        if articles:
+                            await on_articles(articles)
+            except (OSError, ConnectionClosed, InvalidHandshake, StreamError, asyncio.TimeoutError, ValueError) as e:
+                self.stats['errors'] += 1
+                logger.warning(f"⚠️  Alpaca news stream error: {e}")
+            finally:
+                self.connected = False
+                self._ws = None
+            
+            if self._stopping.is_set():
+                break
+            wait = delay * random.uniform(0.5, 1.0)
+            logger.info(f"🔁 Reconnecting to Alpaca news stream in {wait:.1f}s")
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=wait)
+            except asyncio.TimeoutError:
+                pass
+            delay = min(delay * 2, self.reconnect_max_seconds)
+    
+    async def stop(self):
+        """Stop streaming and close the connection."""
+        self._stopping.set()
+        if self._ws is not None:
+            await self._ws.close()
+    
+    async def _handshake(self, ws):
+        """Authenticate and subscribe."""
+        self._check(json.loads(await ws.recv()))  # Welcome message
+        await ws.send(json.dumps({'action': 'auth', 'key': self.api_key, 'secret': self.api_secret}))
+        replies = json.loads(await ws.recv())
+        self._check(replies)
+        if not any(reply.get('msg') == 'authenticated' for reply in replies):
+            raise StreamError(f"unexpected auth reply {replies}")
+        await ws.send(json.dumps({'action': 'subscribe', 'news': self.symbols}))
+    
+    @staticmethod
+    def _check(replies: List[Dict]):
+        for reply in replies:
+            if reply.get('T') == 'error':
+                raise StreamError(f"{reply.get('code')} {reply.get('msg')}")
+    
+    def _parse(self, message) -> List[Dict]:
+        """Normalized news articles in one stream message."""
+        self.stats['messages'] += 1
+        try:
+            items = json.loads(message)
+        except ValueError:
+            logger.warning("⚠️  Ignoring malformed Alpaca stream message")
+            return []
+        
+        articles = []
+        for item in items if isinstance(items, list) else [items]:
+            kind = item.get('T')
+            if kind == 'n':
+                articles.append(LazyArticle(item, ALPACA_FIELDS))
+            elif kind == 'error':
+                self.stats['errors'] += 1
+                logger.warning(f"⚠️  Alpaca news stream error {item.get('code')}: {item.get('msg')}")
+        self.stats['articles'] += len(articles)
+        return articles
+    
+    def get_stats(self) -> Dict:
+        """Connection state plus counters."""
+        return {'connected': self.connected, **self.stats}
@@ -0,0 +1,71 @@
+"""Merging time-ordered article streams."""
+import heapq
+from operator import itemgetter
+from typing import Dict, Iterable, Iterator, List, Sequence
+
+_by_time = itemgetter('datetime')
+
+
+def oriented(articles: Sequence[Dict], newest_first: bool) -> Sequence[Dict]:
+    """
+    Articles in the requested time order.
+    
+    Upstreams already return their articles sorted (Alpaca oldest first,
+    FinHub newest first), so this is normally an O(n) check plus, at
+    most, a reversed view; only unsorted input pays for a sort.
+    
+    Args:
+        articles: Articles with a ``datetime`` field
+        newest_first: Order wanted
+    
+    Returns:
+        The articles, a reversed view of them, or a sorted copy
+    """
+    times = [article['datetime'] for article in articles]
+    if all(a <= b for a, b in zip(times, times[1:])):
+        return articles[::-1] if newest_first else articles
+    if all(a >= b for a, b in zip(times, times[1:])):
+        return articles if newest_first else articles[::-1]
+    return sorted(articles, key=_by_time, reverse=newest_first)
+
+
+def merge_by_time(streams: Iterable[Sequence[Dict]], newest_first: bool = True,
+                  unique_ids: bool = False) -> Iterator[Dict]:
+    """
+    K-way merge of article streams that are each already in time order.
+    
+    Costs O(n log k) for k streams instead of re-sorting all n articles,
+    and is lazy, so taking the first few articles stops early.
+    
+    Args:
+        streams: Article lists, each sorted in the ``newest_first`` order
+        newest_first: Order of the inputs and the output
+        unique_ids: Yield each ``id`` once (only for streams from one upstream,
+            whose ids share a namespace)
+    
+    Yields:
+        Articles in time order
+    """
+    merged = heapq.merge(*streams, key=_by_time, reverse=newest_first)
+    if not unique_ids:
+        yield from merged
+        return
+    seen_ids = set()
+    for article in merged:
+        if article['id'] not in seen_ids:
+            seen_ids.add(article['id'])
+            yield article
+
+
+def merge_sources(sources: Iterable[Sequence[Dict]], newest_first: bool = True) -> List[Dict]:
+    """
+    Merge per-source article lists into one time-ordered list.
+    
+    Args:
+        sources: Article lists, each sorted either way (or unsorted)
+        newest_first: Order of the result
+    
+    Returns:
+        All articles in time order
+    """
+    return list(merge_by_time((oriented(articles, newest_first) for articles in sources), newest_first))
@@ -0,0 +1,383 @@
+"""Sharded multi-process deduplication for historical backfills."""
+from array import array
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from difflib import SequenceMatcher
+from operator import eq
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+import logging
+import os
+import time
+
+from deduplicator import (
+    SOURCE_SIMILARITY_THRESHOLD,
+    TIME_PROXIMITY_SECONDS,
+    TIME_SYMBOL_SIMILARITY_THRESHOLD,
+    NewsDedupe,
+)
+from lsh_index import MinHashLSH
+from url_fingerprint import url_fingerprint
+
+logger = logging.getLogger(__name__)
+
+# Candidate group kinds
+_SAME_SOURCE = 1
+_TIME_SYMBOL = 2
+
+# Per-article fields computed in the shard workers
+ShardRecord = Tuple[int, int, Optional[str], Optional[bytes]]
+
+# Candidate group: (kind, band number or symbol, member indexes, first
+# comparable position per member); every member is compared with the members
+# from its first comparable position up to itself
+CandidateGroup = Tuple[int, object, array, Optional[array]]
+
+# Batch fields shared with pair-scoring workers (set by _init_pair_worker)
+_worker_state: Dict[str, Sequence] = {}
+
+
+def _build_shard(shard: List[Tuple[int, str, str]], use_lsh: bool) -> List[ShardRecord]:
+    """
+    Compute URL fingerprints, normalized headlines and LSH band keys for a shard.
+    
+    Args:
+        shard: (article index, url, headline) tuples
+        use_lsh: Whether to compute band keys
+    
+    Returns:
+        (article index, url fingerprint, normalized headline, band key bytes) tuples
+    """
+    lsh = MinHashLSH() if use_lsh else None
+    records = []
+    for index, url, headline in shard:
+        normalized = NewsDedupe._normalize_headline(headline) or None  # Same as NewsDedupe._make_record
+        band_keys = lsh.band_keys(normalized).tobytes() if lsh is not None and normalized else None
+        records.append((index, url_fingerprint(url), normalized, band_keys))
+    return records
+
+
+def _init_pair_worker(headlines: Sequence[Optional[str]], symbols: Sequence[frozenset],
+                      timestamps: Sequence[float], band_keys: Sequence[Optional[bytes]],
+                      groups: Sequence[CandidateGroup]):
+    """Make the batch fields and candidate groups available to a pair-scoring worker."""
+    decoded = []
+    for keys in band_keys:
+        if keys is not None:
+            row = array('q')
+            row.frombytes(keys)
+            keys = row
+        decoded.append(keys)
+    _worker_state.update(headlines=headlines, symbols=symbols, timestamps=timestamps,
+                         band_keys=decoded, groups=groups)
+
+
+def _score_segments(segments: bytes) -> Tuple[int, bytes]:
+    """
+    Enumerate and score the candidate pairs of some group segments.
+    
+    A pair can sit in several groups (several shared bands, several shared
+    symbols, or both levels). It is scored only in the group that owns it,
+    so every pair is compared once: a Level 3 group if the pair is a Level 3
+    candidate (its 0.70 threshold decides both levels), the smallest shared
+    symbol among those, otherwise the first shared band. Scoring mirrors
+    ``NewsDedupe._similar_by_source`` / ``_similar_by_time_symbol`` (ratio
+    of the newer headline against the older one), checking the cheap
+    ``real_quick_ratio``/``quick_ratio`` upper bounds first.
+    
+    Args:
+        segments: array('q') bytes of (group number, start, end) triples;
+            members at positions start..end-1 are compared with the earlier
+            members in their group
+    
+    Returns:
+        (pairs scored, array('q') bytes of interleaved newer/older indexes
+        of the duplicate pairs)
+    """
+    triples = array('q')
+    triples.frombytes(segments)
+    headlines = _worker_state['headlines']
+    symbols = _worker_state['symbols']
+    timestamps = _worker_state['timestamps']
+    band_keys = _worker_state['band_keys']
+    groups = _worker_state['groups']
+    
+    scored = 0
+    duplicates = array('q')
+    matcher = SequenceMatcher(None)
+    for g in range(0, len(triples), 3):
+        kind, key, members, firsts = groups[triples[g]]
+        threshold = TIME_SYMBOL_SIMILARITY_THRESHOLD if kind == _TIME_SYMBOL else SOURCE_SIMILARITY_THRESHOLD
+        for position in range(triples[g + 1], triples[g + 2]):
+            index = members[position]
+            symbols_i = symbols[index]
+            for other in members[firsts[position] if firsts is not None else 0:position]:
+                if kind == _TIME_SYMBOL:
+                    newer, older = (index, other) if index > other else (other, index)
+                    if len(symbols_i) > 1 and min(symbols_i & symbols[other]) != key:
+                        continue
+                else:
+                    newer, older = index, other
+                    if (abs(timestamps[index] - timestamps[other]) < TIME_PROXIMITY_SECONDS
+                            and not symbols_i.isdisjoint(symbols[other])):
+                        continue
+                    if key is not None and any(map(eq, band_keys[index][:key], band_keys[other][:key])):
+                        continue
+                
+                scored += 1
+                matcher.set_seqs(headlines[newer], headlines[older])
+                if matcher.real_quick_ratio() <= threshold or matcher.quick_ratio() <= threshold:
+                    continue
+                if matcher.ratio() > threshold:
+                    duplicates.append(newer)
+                    duplicates.append(older)
+    return scored, duplicates.tobytes()
+
+
+class BackfillDedupe:
+    """
+    Deduplicate a large historical batch across worker processes.
+    
+    The result is identical to ``NewsDedupe(use_lsh=..., batch_min_size=0)``
+    processing the same list on a fresh cache:
+    
+    1. Articles are sharded by time bucket and primary symbol, and each
+       shard's fingerprints, normalized headlines and LSH band keys are
+       computed in a worker.
+    2. The parent groups articles that the sequential run could compare,
+       including across shard boundaries: by source (and LSH band when
+       enabled), and by symbol with each member's ``TIME_PROXIMITY_SECONDS``
+       window. This is linear in the batch size.
+    3. Workers enumerate the pairs of group segments and score them with
+       SequenceMatcher, so no full pair list is ever built.
+    4. Articles are resolved in input order: an article is dropped if its
+       URL or a matching pair belongs to an article already kept.
+    """
+    
+    def __init__(self, use_lsh: bool = True, workers: Optional[int] = None,
+                 shard_seconds: int = 3600, pair_chunk_size: int = 20000):
+        """
+        Initialize backfill deduplicator.
+        
+        Args:
+            use_lsh: Match NewsDedupe's LSH candidate filter for Level 2
+                (False compares every same-source pair)
+            workers: Worker processes (default: CPU count; 1 runs in-process)
+            shard_seconds: Time bucket width used to shard articles
+            pair_chunk_size: Approximate candidate pairs enumerated per worker task
+        """
+        self.use_lsh = use_lsh
+        self.workers = workers or os.cpu_count() or 1
+        self.shard_seconds = shard_seconds
+        self.pair_chunk_size = pair_chunk_size
+        self.stats = self._empty_stats()
+    
+    @staticmethod
+    def _empty_stats() -> Dict:
+        return {
+            'total_processed': 0,
+            'exact_url_dupes': 0,
+            'similarity_dupes': 0,
+            'unique_articles': 0,
+            'shards': 0,
+            'candidate_pairs': 0
+        }
+    
+    def process(self, articles: List[Dict]) -> List[Dict]:
+        """
+        Deduplicate a backfill batch.
+        
+        Args:
+            articles: List of normalized articles, in the order a sequential
+                run would process them
+        
+        Returns:
+            List of unique articles after deduplication
+        """
+        self.stats = self._empty_stats()
+        if not articles:
+            return []
+        
+        started = time.perf_counter()
+        symbols = [NewsDedupe._parse_symbols(a.get('related', '')) for a in articles]
+        shards = self._shard(articles, symbols)
+        self.stats['shards'] = len(shards)
+        
+        pool = ProcessPoolExecutor(max_workers=self.workers) if self.workers > 1 else None
+        try:
+            url_hashes, headlines, band_keys = self._build_records(articles, shards, pool)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        
+        groups = self._candidate_groups(articles, symbols, headlines, band_keys)
+        timestamps = [article['datetime'] for article in articles]
+        duplicates_of = self._score(groups, headlines, symbols, timestamps, band_keys)
+        
+        unique = self._resolve(articles, url_hashes, duplicates_of)
+        
+        elapsed = time.perf_counter() - started
+        logger.info(
+            f"🧹 Backfill dedupe: {len(unique)}/{len(articles)} unique articles "
+            f"({len(shards)} shards, {self.stats['candidate_pairs']} candidate pairs, {elapsed:.1f}s)"
+        )
+        return unique
+    
+    def _shard(self, articles: List[Dict], symbols: List[frozenset]) -> List[List[Tuple[int, str, str]]]:
+        """Group article indexes by (time bucket, primary symbol)."""
+        shards: Dict[Tuple[int, str], List[Tuple[int, str, str]]] = defaultdict(list)
+        for index, (article, article_symbols) in enumerate(zip(articles, symbols)):
+            primary = min(article_symbols) if article_symbols else ''
+            key = (int(article['datetime']) // self.shard_seconds, primary)
+            shards[key].append((index, article['url'], article['headline']))
+        return list(shards.values())
+    
+    def _build_records(self, articles: List[Dict], shards: List[List[Tuple[int, str, str]]],
+                       pool: Optional[ProcessPoolExecutor]):
+        """Phase 1: compute per-article fields shard by shard."""
+        count = len(articles)
+        url_hashes: List[int] = [0] * count
+        headlines: List[Optional[str]] = [None] * count
+        band_keys: List[Optional[bytes]] = [None] * count
+        
+        if pool is None:
+            results: Iterator[List[ShardRecord]] = (_build_shard(s, self.use_lsh) for s in shards)
+        else:
+            chunksize = max(1, len(shards) // (self.workers * 4))
+            results = pool.map(_build_shard, shards, [self.use_lsh] * len(shards), chunksize=chunksize)
+        
+        for shard_records in results:
+            for index, url_hash, headline, keys in shard_records:
+                url_hashes[index] = url_hash
+                headlines[index] = headline
+                band_keys[index] = keys
+        return url_hashes, headlines, band_keys
+    
+    def _candidate_groups(self, articles: List[Dict], symbols: List[frozenset],
+                          headlines: List[Optional[str]],
+                          band_keys: List[Optional[bytes]]) -> List[CandidateGroup]:
+        """
+        Phase 2: group the articles the sequential run could compare.
+        
+        Returns:
+            Groups with at least one candidate pair
+        """
+        # Level 2: same source, narrowed to shared LSH bands when enabled
+        by_source: Dict[Tuple, List[int]] = defaultdict(list)
+        for index, article in enumerate(articles):
+            if headlines[index] is None:
+                continue  # Never clears the similarity threshold
+            source = article['source']
+            if not self.use_lsh:
+                by_source[(source, None)].append(index)
+                continue
+            keys = array('q')
+            keys.frombytes(band_keys[index])
+            for band, key in enumerate(keys):
+                by_source[(source, band, key)].append(index)
+        
+        groups: List[CandidateGroup] = [
+            (_SAME_SOURCE, key[1], array('q', members), None)
+            for key, members in by_source.items() if len(members) > 1
+        ]
+        
+        # Level 3: shared symbol within the time window
+        by_symbol: Dict[str, List[Tuple[float, int]]] = defaultdict(list)
+        for index, article_symbols in enumerate(symbols):
+            if headlines[index] is None:
+                continue
+            for symbol in article_symbols:
+                by_symbol[symbol].append((articles[index]['datetime'], index))
+        
+        for symbol, timeline in by_symbol.items():
+            if len(timeline) < 2:
+                continue
+            timeline.sort()
+            firsts = array('q')
+            start = 0
+            for timestamp, _ in timeline:
+                while timestamp - timeline[start][0] >= TIME_PROXIMITY_SECONDS:
+                    start += 1
+                firsts.append(start)
+            groups.append((_TIME_SYMBOL, symbol, array('q', (index for _, index in timeline)), firsts))
+        
+        return groups
+    
+    def _segments(self, groups: List[CandidateGroup]) -> List[bytes]:
+        """Split the groups into worker tasks of about ``pair_chunk_size`` pairs."""
+        tasks = []
+        task = array('q')
+        budget = 0
+        for number, (_, _, members, firsts) in enumerate(groups):
+            start = 0
+            for position in range(len(members)):
+                budget += position - (firsts[position] if firsts is not None else 0)
+                if budget >= self.pair_chunk_size:
+                    task.extend((number, start, position + 1))
+                    tasks.append(task.tobytes())
+                    task = array('q')
+                    budget = 0
+                    start = position + 1
+            if start < len(members):
+                task.extend((number, start, len(members)))
+        if task:
+            tasks.append(task.tobytes())
+        return tasks
+    
+    def _score(self, groups: List[CandidateGroup], headlines: List[Optional[str]],
+               symbols: List[frozenset], timestamps: List[float],
+               band_keys: List[Optional[bytes]]) -> Dict[int, List[int]]:
+        """
+        Phase 3: enumerate and score candidate pairs in parallel.
+        
+        Returns:
+            Mapping of article index to earlier indexes it duplicates
+        """
+        tasks = self._segments(groups)
+        initargs = (headlines, symbols, timestamps, band_keys, groups)
+        if self.workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_pair_worker,
+                initargs=initargs
+            ) as pool:
+                results = list(pool.map(_score_segments, tasks))
+        else:
+            _init_pair_worker(*initargs)
+            results = [_score_segments(task) for task in tasks]
+            _worker_state.clear()
+        
+        duplicates_of: Dict[int, List[int]] = defaultdict(list)
+        for scored, duplicates in results:
+            self.stats['candidate_pairs'] += scored
+            pairs = array('q')
+            pairs.frombytes(duplicates)
+            for k in range(0, len(pairs), 2):
+                duplicates_of[pairs[k]].append(pairs[k + 1])
+        return duplicates_of
+    
+    def _resolve(self, articles: List[Dict], url_hashes: List[int],
+                 duplicates_of: Dict[int, List[int]]) -> List[Dict]:
+        """Phase 4: replay the sequential keep/drop decisions in input order."""
+        kept = [False] * len(articles)
+        kept_urls = set()
+        unique = []
+        
+        for index, article in enumerate(articles):
+            self.stats['total_processed'] += 1
+            if url_hashes[index] in kept_urls:
+                self.stats['exact_url_dupes'] += 1
+                continue
+            if any(kept[older] for older in duplicates_of.get(index, ())):
+                self.stats['similarity_dupes'] += 1
+                continue
+            
+            kept[index] = True
+            kept_urls.add(url_hashes[index])
+            self.stats['unique_articles'] += 1
+            unique.append(article)
+        
+        return unique
+    
+    def get_stats(self) -> Dict:
+        """Get statistics of the last backfill run."""
+        return dict(self.stats)
@@ -0,0 +1,188 @@
+"""Vectorized candidate generation for batch deduplication."""
+import sys
+import zlib
+from typing import Dict, Hashable, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; NewsDedupe falls back to per-article matching
+    np = None
+
+
+def vectorized_available() -> bool:
+    """Whether numpy is installed and batch vectors can be built."""
+    return np is not None
+
+
+class HashedNgramVectorizer:
+    """
+    Hash headlines into L2-normalized character n-gram count vectors.
+    
+    Hash collisions can only add shared dimensions, so they raise cosine
+    scores and never hide a candidate.
+    """
+    
+    def __init__(self, ngram_size: int = 2, dimensions: int = 1024):
+        """
+        Initialize vectorizer.
+        
+        Args:
+            ngram_size: Character n-gram length
+            dimensions: Number of hashed dimensions
+        """
+        if np is None:
+            raise ImportError("numpy is required for vectorized batch similarity")
+        
+        self.ngram_size = ngram_size
+        self.dimensions = dimensions
+    
+    def transform(self, texts: Sequence[Optional[str]]) -> 'np.ndarray':
+        """
+        Vectorize normalized texts.
+        
+        Args:
+            texts: Normalized texts (None or empty rows stay all-zero)
+        
+        Returns:
+            float32 matrix of shape (len(texts), dimensions)
+        """
+        n = self.ngram_size
+        dims = self.dimensions
+        matrix = np.zeros((len(texts), dims), dtype=np.float32)
+        
+        for row, text in enumerate(texts):
+            if not text:
+                continue
+            if len(text) <= n:
+                grams = [text]
+            else:
+                grams = [text[i:i + n] for i in range(len(text) - n + 1)]
+            indexes = [zlib.crc32(g.encode('utf-8')) % dims for g in grams]
+            matrix[row] = np.bincount(indexes, minlength=dims)
+        
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+
+class VectorStore:
+    """
+    Vectors of cached items, one matrix row each, kept across batches.
+    
+    Rows are filled as items are added and cleared (group -1, which no
+    query group matches) when they are removed; freed rows are reused
+    before the matrix grows. Scoring a batch against the cache then only
+    needs the batch's own vectors.
+    """
+    
+    def __init__(self, dimensions: int, initial_rows: int = 1024):
+        """
+        Initialize store.
+        
+        Args:
+            dimensions: Vector width (the vectorizer's dimensions)
+            initial_rows: Rows allocated up front; the matrix doubles when full
+        """
+        if np is None:
+            raise ImportError("numpy is required for vectorized batch similarity")
+        
+        self.matrix = np.zeros((initial_rows, dimensions), dtype=np.float32)
+        self.groups = np.full(initial_rows, -1, dtype=np.int64)
+        self.items: List[Optional[Hashable]] = [None] * initial_rows
+        # Rows below this index have been used at least once
+        self.size = 0
+        self._rows: Dict[Hashable, int] = {}
+        self._free: List[int] = []
+    
+    def __len__(self) -> int:
+        return len(self._rows)
+    
+    def add(self, item: Hashable, vector: 'np.ndarray', group: int):
+        """
+        Store an item's vector.
+        
+        Args:
+            item: Cached item (hashable, e.g. a dedupe record)
+            vector: Normalized vector
+            group: Non-negative group id (e.g. source id)
+        """
+        if self._free:
+            row = self._free.pop()
+        else:
+            if self.size == len(self.items):
+                self._grow()
+            row = self.size
+            self.size += 1
+        self.matrix[row] = vector
+        self.groups[row] = group
+        self.items[row] = item
+        self._rows[item] = row
+    
+    def remove(self, item: Hashable):
+        """Drop an item's vector, if stored."""
+        row = self._rows.pop(item, None)
+        if row is None:
+            return
+        self.groups[row] = -1
+        self.items[row] = None
+        self._free.append(row)
+    
+    def memory_bytes(self) -> int:
+        """Approximate bytes held by the matrix, group ids and row maps."""
+        return (self.matrix.nbytes + self.groups.nbytes + sys.getsizeof(self.items)
+                + sys.getsizeof(self._rows) + sys.getsizeof(self._free))
+    
+    def _grow(self):
+        rows = len(self.items)
+        matrix = np.zeros((2 * rows, self.matrix.shape[1]), dtype=np.float32)
+        matrix[:rows] = self.matrix
+        groups = np.full(2 * rows, -1, dtype=np.int64)
+        groups[:rows] = self.groups
+        self.matrix, self.groups = matrix, groups
+        self.items.extend([None] * rows)
+
+
+def candidate_pairs(
+    queries: 'np.ndarray',
+    references: 'np.ndarray',
+    query_groups: 'np.ndarray',
+    reference_groups: 'np.ndarray',
+    threshold: float,
+    chunk_size: int = 4096
+) -> List['np.ndarray']:
+    """
+    Find reference rows in the same group whose cosine clears a threshold.
+    
+    The score matrix is computed one reference chunk at a time so memory
+    stays bounded at ``len(queries) * chunk_size`` floats.
+    
+    Args:
+        queries: Normalized query vectors (Q x D)
+        references: Normalized reference vectors (R x D)
+        query_groups: Group id per query row (e.g. source id)
+        reference_groups: Group id per reference row
+        threshold: Minimum cosine similarity for a candidate
+        chunk_size: Reference rows scored per matrix product
+    
+    Returns:
+        One sorted array of reference row indexes per query row
+    """
+    per_query: List[List['np.ndarray']] = [[] for _ in range(len(queries))]
+    
+    for start in range(0, len(references), chunk_size):
+        chunk = references[start:start + chunk_size]
+        scores = queries @ chunk.T
+        mask = scores >= threshold
+        mask &= query_groups[:, None] == reference_groups[None, start:start + chunk_size]
+        
+        rows, cols = np.nonzero(mask)
+        if not len(rows):
+            continue
+        # np.nonzero returns row-major order, so split by row boundaries
+        boundaries = np.searchsorted(rows, np.arange(len(queries) + 1))
+        for query in np.unique(rows):
+            hits = cols[boundaries[query]:boundaries[query + 1]]
+            per_query[query].append(hits + start)
+    
+    empty = np.empty(0, dtype=np.intp)
+    return [np.concatenate(hits) if hits else empty for hits in per_query]
@@ -0,0 +1,101 @@
+"""Atomic on-disk checkpoint of fetch cursors and aggregator counters."""
+import json
+import os
+import tempfile
+import time
+from typing import Any, Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Bump when the checkpoint layout changes incompatibly; older files are ignored
+CHECKPOINT_VERSION = 1
+
+
+def write_json_atomic(path: str, data: Any):
+    """
+    Write JSON so readers see either the old file or the new one, never a mix.
+    
+    The data goes to a temporary file in the same directory, is fsynced,
+    and then renamed over ``path``.
+    
+    Args:
+        path: Destination file
+        data: JSON-serializable data
+    
+    Raises:
+        OSError: If the file cannot be written
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + '.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+class Checkpoint:
+    """
+    JSON checkpoint file holding the aggregator's restartable state.
+    
+    The state is whatever ``NewsAggregator.get_state()`` returns: source
+    cursors plus counters. Saves are atomic, so a crash mid-write leaves
+    the previous checkpoint intact.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Initialize checkpoint.
+        
+        Args:
+            path: Checkpoint file path
+        """
+        self.path = path
+        self.saves = 0
+        self.last_saved: Optional[float] = None
+    
+    def load(self) -> Optional[Dict]:
+        """
+        Read the checkpoint.
+        
+        Returns:
+            Saved state, or None if there is none or it is unreadable
+        """
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path) as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️  Ignoring unreadable checkpoint {self.path}: {e}")
+            return None
+        
+        if not isinstance(state, dict) or state.get('version') != CHECKPOINT_VERSION:
+            logger.warning(f"⚠️  Ignoring checkpoint {self.path} with unsupported version")
+            return None
+        return state
+    
+    def save(self, state: Dict) -> bool:
+        """
+        Atomically replace the checkpoint.
+        
+        Args:
+            state: JSON-serializable state
+        
+        Returns:
+            True if written
+        """
+        try:
+            write_json_atomic(self.path, {**state, 'version': CHECKPOINT_VERSION, 'saved_at': int(time.time())})
+        except (OSError, TypeError, ValueError) as e:
+            logger.error(f"❌ Error saving checkpoint {self.path}: {e}")
+            return False
+        self.saves += 1
+        self.last_saved = time.time()
+        return True
@@ -8,22 +8,66 @@ load_dotenv()
 # Alpaca API Configuration
 ALPACA_API_KEY = os.getenv('ALPACA_API_KEY')
 ALPACA_API_SECRET = os.getenv('ALPACA_API_SECRET')
-ALPACA_BASE_URL = "https://data.alpaca.markets/v1beta1"
+ALPACA_BASE_URL = os.getenv('ALPACA_BASE_URL', "https://data.alpaca.markets/v1beta1")
+ALPACA_CURSOR_PATH = os.getenv('ALPACA_CURSOR_PATH')  # JSON high-water mark; unset keeps it in memory only
+ALPACA_SYMBOL_CHUNK_SIZE = int(os.getenv('ALPACA_SYMBOL_CHUNK_SIZE', 20))  # Symbols per request; chunks fetched concurrently
+# Real-time news WebSocket; REST polling keeps running as a gap-filler
+ALPACA_STREAM = os.getenv('ALPACA_STREAM', 'false').lower() in ('1', 'true', 'yes')
+ALPACA_STREAM_URL = os.getenv('ALPACA_STREAM_URL', "wss://stream.data.alpaca.markets/v1beta1/news")
 
 # FinHub API Configuration
 FINNHUB_API_KEY = os.getenv('FINNHUB_API_KEY')
-FINNHUB_BASE_URL = "https://finnhub.io/api/v1"
+FINNHUB_BASE_URL = os.getenv('FINNHUB_BASE_URL', "https://finnhub.io/api/v1")
+# News categories fetched concurrently each cycle, each with its own minId cursor
+FINNHUB_CATEGORIES_STR = os.getenv('FINNHUB_CATEGORIES', 'general,forex,crypto,merger')
+FINNHUB_CATEGORIES = [c.strip() for c in FINNHUB_CATEGORIES_STR.split(',') if c.strip()]
+FINNHUB_CALLS_PER_MINUTE = int(os.getenv('FINNHUB_CALLS_PER_MINUTE', 60))  # Plan quota shared by all FinHub calls
+# Per-symbol company news for TRACKED_SYMBOLS, fanned out under the quota
+FINNHUB_COMPANY_NEWS = os.getenv('FINNHUB_COMPANY_NEWS', 'true').lower() in ('1', 'true', 'yes')
+FINNHUB_COMPANY_WORKERS = int(os.getenv('FINNHUB_COMPANY_WORKERS', 8))  # Company news requests in flight at once
 
 # Gemini API Configuration (for IV scoring)
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
+GEMINI_BASE_URL = os.getenv('GEMINI_BASE_URL')  # Unset uses the SDK's default endpoint
+YAHOO_CHART_URL = os.getenv('YAHOO_CHART_URL', "https://query1.finance.yahoo.com/v8/finance/chart")  # VIX quotes
+GEMINI_CACHE_SIZE = int(os.getenv('GEMINI_CACHE_SIZE', 2048))  # Headline analyses kept in memory; 0 disables
+GEMINI_CACHE_TTL_SECONDS = float(os.getenv('GEMINI_CACHE_TTL_SECONDS', 1800))  # How long a cached analysis is reused
+GEMINI_BATCH_SIZE = int(os.getenv('GEMINI_BATCH_SIZE', 10))  # Headlines per batched Gemini request
+GEMINI_MAX_CONCURRENCY = int(os.getenv('GEMINI_MAX_CONCURRENCY', 4))  # Batched Gemini requests in flight at once
+GEMINI_REQUESTS_PER_MINUTE = int(os.getenv('GEMINI_REQUESTS_PER_MINUTE', 60))  # Gemini quota shared by scoring
 
 # Instrument Configuration (for IV scoring)
 SELECTED_INSTRUMENT = os.getenv('SELECTED_INSTRUMENT', '/MES')  # Default to Micro E-mini S&P 500
 
 # Application Configuration
 POLL_INTERVAL_SECONDS = int(os.getenv('POLL_INTERVAL_SECONDS', 60))
+# Adaptive polling: per-source intervals follow article arrival rates within these bounds
+POLL_ADAPTIVE = os.getenv('POLL_ADAPTIVE', 'false').lower() in ('1', 'true', 'yes')
+POLL_MIN_INTERVAL_SECONDS = int(os.getenv('POLL_MIN_INTERVAL_SECONDS', 15))
+POLL_MAX_INTERVAL_SECONDS = int(os.getenv('POLL_MAX_INTERVAL_SECONDS', 300))
 DEDUPE_WINDOW_HOURS = int(os.getenv('DEDUPE_WINDOW_HOURS', 24))
+CHECKPOINT_PATH = os.getenv('CHECKPOINT_PATH')  # JSON checkpoint of cursors/counters; unset keeps them in memory only
+DEDUPE_STORE_PATH = os.getenv('DEDUPE_STORE_PATH')  # SQLite file; unset keeps the cache in memory only
+# Remember URLs longer than the similarity window in a Bloom filter; unset disables
+DEDUPE_URL_WINDOW_HOURS = int(os.getenv('DEDUPE_URL_WINDOW_HOURS', 0)) or None
 PULSE_ENDPOINT = os.getenv('PULSE_ENDPOINT', 'http://localhost:5000/api/news')
+SOURCE_TIMEOUT_SECONDS = float(os.getenv('SOURCE_TIMEOUT_SECONDS', 25))  # Per-source fetch deadline
+
+# Shared HTTP connection pool (see http_pool.py)
+HTTP_POOL_CONNECTIONS = int(os.getenv('HTTP_POOL_CONNECTIONS', 10))  # Hosts with a kept-alive pool
+# Category requests, their hedges and the company fan-out can all be open to finnhub.io at
+# once; a smaller per-host pool makes urllib3 discard connections instead of keeping them alive
+FINNHUB_PEAK_CONNECTIONS = 2 * len(FINNHUB_CATEGORIES) + FINNHUB_COMPANY_WORKERS
+HTTP_POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', max(10, FINNHUB_PEAK_CONNECTIONS)))  # Open connections per host
+HTTP_MAX_RETRIES = int(os.getenv('HTTP_MAX_RETRIES', 3))  # Retries on connection errors, 429 and 5xx
+HTTP_BACKOFF_FACTOR = float(os.getenv('HTTP_BACKOFF_FACTOR', 0.5))
+
+# Upstream resilience (see resilience.py)
+BREAKER_FAILURE_THRESHOLD = int(os.getenv('BREAKER_FAILURE_THRESHOLD', 5))  # Consecutive failures that open a circuit
+BREAKER_RESET_SECONDS = float(os.getenv('BREAKER_RESET_SECONDS', 30))  # Open time before a probe request
+HEDGE_REQUESTS = os.getenv('HEDGE_REQUESTS', 'false').lower() in ('1', 'true', 'yes')  # Duplicate slow news GETs
+HEDGE_QUANTILE = float(os.getenv('HEDGE_QUANTILE', 0.95))  # Latency quantile after which a duplicate is sent
+HEDGE_MIN_SAMPLES = int(os.getenv('HEDGE_MIN_SAMPLES', 20))
 
 # Symbols to track
 TRACKED_SYMBOLS_STR = os.getenv('TRACKED_SYMBOLS', 'AAPL,TSLA,NVDA,GOOGL,MSFT,AMZN')
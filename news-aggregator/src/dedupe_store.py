@@ -0,0 +1,163 @@
+"""SQLite backing store for the dedupe cache."""
+import sqlite3
+from array import array
+from typing import Iterator, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+_SIGNED_64 = 1 << 63
+
+# Row layout returned by DedupeStore.load
+StoredRecord = Tuple[int, int, str, str, Optional[str], Optional[array]]
+
+
+def _to_signed(value: int) -> int:
+    """Map an unsigned 64-bit fingerprint into SQLite's signed INTEGER range."""
+    return value - (1 << 64) if value >= _SIGNED_64 else value
+
+
+def _to_unsigned(value: int) -> int:
+    """Inverse of _to_signed."""
+    return value + (1 << 64) if value < 0 else value
+
+
+class DedupeStore:
+    """
+    Persistent, warm-restartable store for ``NewsDedupe`` records.
+    
+    Writes are buffered in memory and committed in a single transaction per
+    ``flush()`` (once per ``NewsDedupe.process`` call). LSH band keys are
+    stored alongside each record so a restart does not have to recompute
+    MinHash signatures for the whole window.
+    """
+    
+    def __init__(self, path: str, lsh_config: str = ''):
+        """
+        Open (or create) the store.
+        
+        Args:
+            path: SQLite database file path
+            lsh_config: Identifier of the LSH parameters the stored band keys
+                were computed with; band keys from other configs are ignored
+        """
+        self.path = path
+        self.lsh_config = lsh_config
+        self._pending: List[Tuple] = []
+        self._removed: List[Tuple[int]] = []
+        self._expire_before: Optional[int] = None
+        
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS records (
+                url_hash INTEGER PRIMARY KEY,
+                timestamp INTEGER NOT NULL,
+                source TEXT NOT NULL,
+                symbols TEXT NOT NULL,
+                headline TEXT,
+                band_keys BLOB
+            );
+            CREATE INDEX IF NOT EXISTS records_timestamp ON records (timestamp);
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+        """)
+        
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'lsh_config'").fetchone()
+        self._band_keys_valid = row is not None and row[0] == lsh_config
+        if not self._band_keys_valid:
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('lsh_config', ?)",
+                    (lsh_config,)
+                )
+    
+    def load(self, cutoff_timestamp: int) -> Iterator[StoredRecord]:
+        """
+        Stream records newer than the cutoff, oldest first.
+        
+        Args:
+            cutoff_timestamp: Records at or before this timestamp are skipped
+        
+        Yields:
+            (url_hash, timestamp, source, symbols, headline, band_keys) tuples;
+            band_keys is None when it has to be recomputed
+        """
+        cursor = self._conn.execute(
+            "SELECT url_hash, timestamp, source, symbols, headline, band_keys "
+            "FROM records WHERE timestamp > ? ORDER BY timestamp",
+            (cutoff_timestamp,)
+        )
+        for url_hash, timestamp, source, symbols, headline, blob in cursor:
+            band_keys = None
+            if blob is not None and self._band_keys_valid:
+                band_keys = array('q')
+                band_keys.frombytes(blob)
+            yield _to_unsigned(url_hash), timestamp, source, symbols, headline, band_keys
+    
+    def add(self, url_hash: int, timestamp: int, source: str, symbols: str,
+            headline: Optional[str], band_keys: Optional[array] = None):
+        """
+        Buffer a record for the next flush.
+        
+        Args:
+            url_hash: 64-bit URL fingerprint
+            timestamp: Article timestamp
+            source: Source name
+            symbols: Comma-separated symbols
+            headline: Normalized headline (None if empty)
+            band_keys: LSH band keys of the headline
+        """
+        blob = band_keys.tobytes() if band_keys else None
+        self._pending.append((_to_signed(url_hash), timestamp, source, symbols, headline, blob))
+    
+    def remove(self, url_hash: int):
+        """Schedule deletion of one record on the next flush (after buffered adds)."""
+        self._removed.append((_to_signed(url_hash),))
+    
+    def expire(self, cutoff_timestamp: int):
+        """Schedule deletion of records at or before the cutoff on the next flush."""
+        if self._expire_before is None or cutoff_timestamp > self._expire_before:
+            self._expire_before = cutoff_timestamp
+    
+    def flush(self):
+        """Write buffered records, removals and expirations in one transaction."""
+        if not self._pending and not self._removed and self._expire_before is None:
+            return
+        
+        try:
+            with self._conn:
+                if self._pending:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO records "
+                        "(url_hash, timestamp, source, symbols, headline, band_keys) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        self._pending
+                    )
+                if self._removed:
+                    self._conn.executemany("DELETE FROM records WHERE url_hash = ?", self._removed)
+                if self._expire_before is not None:
+                    self._conn.execute(
+                        "DELETE FROM records WHERE timestamp <= ?",
+                        (self._expire_before,)
+                    )
+        except sqlite3.Error as e:
+            logger.error(f"❌ Error writing dedupe store {self.path}: {e}")
+            return
+        
+        logger.debug(f"💾 Persisted {len(self._pending)} dedupe records")
+        self._pending = []
+        self._removed = []
+        self._expire_before = None
+    
+    def count(self) -> int:
+        """Number of records currently on disk."""
+        return self._conn.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+    
+    def close(self):
+        """Flush pending writes and close the database."""
+        self.flush()
+        self._conn.close()
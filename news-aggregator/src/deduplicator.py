@@ -1,31 +1,126 @@
 """News deduplication logic."""
+from array import array
+from collections import Counter, deque
 from difflib import SequenceMatcher
 from datetime import datetime, timedelta
-from typing import List, Dict, Set
+from typing import Deque, List, Dict, FrozenSet, Iterable, Optional, Set, Tuple
 import logging
+import sys
+import time
+
+from batch_similarity import HashedNgramVectorizer, VectorStore, candidate_pairs, np, vectorized_available
+from dedupe_store import DedupeStore
+from lsh_index import MinHashLSH
+from url_fingerprint import FingerprintSet, RotatingBloomFilter, url_fingerprint
 
 logger = logging.getLogger(__name__)
 
+# Level 3 time window; also the width of the symbol index time buckets
+TIME_PROXIMITY_SECONDS = 300
+
+# Headline similarity thresholds for Level 2 (same source) and Level 3 (time + symbol)
+SOURCE_SIMILARITY_THRESHOLD = 0.85
+TIME_SYMBOL_SIMILARITY_THRESHOLD = 0.70
+
+
+class DedupeRecord:
+    """
+    Compact cache entry holding only the fields dedupe compares.
+    
+    ``headline`` is pre-normalized (lowercased and stripped), or ``None``
+    when the original headline was empty or only whitespace.
+    """
+    
+    __slots__ = ('url_hash', 'timestamp', 'source_id', 'symbols', 'headline')
+    
+    def __init__(self, url_hash: int, timestamp: int, source_id: int,
+                 symbols: FrozenSet[str], headline: Optional[str]):
+        self.url_hash = url_hash
+        self.timestamp = timestamp
+        self.source_id = source_id
+        self.symbols = symbols
+        self.headline = headline
+    
+    def memory_bytes(self) -> int:
+        """Approximate resident size of the record and the objects it owns."""
+        size = sys.getsizeof(self) + sys.getsizeof(self.url_hash) + sys.getsizeof(self.timestamp)
+        if self.symbols:
+            size += sys.getsizeof(self.symbols)
+        if self.headline is not None:
+            size += sys.getsizeof(self.headline)
+        return size
+    
+    def __repr__(self) -> str:
+        return f"DedupeRecord(timestamp={self.timestamp}, headline={self.headline!r})"
+
 
 class NewsDedupe:
     """Intelligent news deduplication using multi-level matching."""
     
-    def __init__(self, window_hours: int = 24):
+    def __init__(self, window_hours: int = 24, use_lsh: bool = True,
+                 store_path: Optional[str] = None, batch_min_size: Optional[int] = None,
+                 batch_cosine_threshold: float = 0.5,
+                 url_window_hours: Optional[int] = None):
         """
         Initialize deduplicator.
         
         Args:
             window_hours: How many hours of articles to keep in cache
+            use_lsh: Only run similarity checks against MinHash/LSH candidates
+                instead of every cached article
+            store_path: Optional SQLite file persisting the cache across restarts
+            batch_min_size: Batches at least this large are matched in one
+                vectorized pass when numpy is available (None or 0 disables).
+                Enabling it keeps an n-gram vector per cached article
+                (4 KB each)
+            batch_cosine_threshold: Minimum n-gram cosine for a vectorized
+                Level 2 candidate to be confirmed with SequenceMatcher
+            url_window_hours: Remember URLs for longer than ``window_hours``
+                in a time-sliced Bloom filter (rare false positives are
+                dropped as URL duplicates); None or <= window_hours disables
         """
         self.window_hours = window_hours
-        self.seen_urls: Set[str] = set()
-        self.seen_articles: List[Dict] = []
+        self.batch_min_size = batch_min_size
+        self.batch_cosine_threshold = batch_cosine_threshold
+        self.url_window_hours = url_window_hours
+        # Canonical URL fingerprints of cached records (see url_fingerprint)
+        self.seen_urls = FingerprintSet()
+        # URLs evicted from the cache but still inside url_window_hours
+        self._url_bloom: Optional[RotatingBloomFilter] = None
+        if url_window_hours and url_window_hours > window_hours:
+            self._url_bloom = RotatingBloomFilter(url_window_hours)
+        # Cached records ordered by timestamp (oldest first)
+        self.seen_articles: Deque[DedupeRecord] = deque()
+        # Candidate indexes over the records in seen_articles
+        self._by_source: Dict[int, Set[DedupeRecord]] = {}
+        self._by_symbol_bucket: Dict[Tuple[str, int], Set[DedupeRecord]] = {}
+        self._lsh = MinHashLSH() if use_lsh else None
+        self._source_ids: Dict[str, int] = {}
+        self._source_names: List[str] = []
+        self._records_bytes = 0
         self.stats = {
             'total_processed': 0,
             'exact_url_dupes': 0,
             'similarity_dupes': 0,
-            'unique_articles': 0
+            'unique_articles': 0,
+            'vectorized_batches': 0
         }
+        # N-gram vectors of cached records, kept only when batches are vectorized
+        self._vectorizer: Optional[HashedNgramVectorizer] = None
+        self._vectors: Optional[VectorStore] = None
+        if batch_min_size and vectorized_available():
+            self._vectorizer = HashedNgramVectorizer()
+            self._vectors = VectorStore(self._vectorizer.dimensions)
+        # Pairs pruned by each tier of the similarity cascade
+        self.similarity_stats = self._empty_similarity_stats()
+        # Character counts of the headline currently being checked
+        self._char_counts: Tuple[Optional[str], Dict[str, int]] = (None, {})
+        
+        self._store = None
+        if store_path:
+            lsh_config = self._lsh.config_id if self._lsh is not None else ''
+            self._store = DedupeStore(store_path, lsh_config=lsh_config)
+            self._restore()
     
     def process(self, articles: List[Dict]) -> List[Dict]:
         """
@@ -43,44 +138,394 @@ class NewsDedupe:
         # Clean old cache (articles older than window_hours)
         self._clean_cache()
         
+        if self._vectors is not None and len(articles) >= self.batch_min_size:
+            unique = self._process_batch(articles)
+        else:
+            unique = []
+            for article in articles:
+                record = self._make_record(article)
+                if self._process_record(record, article):
+                    unique.append(article)
+        
+        if self._store is not None:
+            self._store.flush()
+        
+        logger.info(f"🧹 Deduplication: {len(unique)}/{len(articles)} unique articles")
+        return unique
+    
+    def forget(self, articles: List[Dict]) -> int:
+        """
+        Drop articles previously kept by ``process()`` so they count as new again.
+        
+        For unique articles that were never delivered: their next fetch
+        must not be discarded as a duplicate of themselves.
+        
+        Args:
+            articles: Articles returned by process()
+        
+        Returns:
+            Number of cached records removed
+        """
+        url_hashes = {url_fingerprint(article['url']) for article in articles}
+        if not url_hashes:
+            return 0
+        
+        # Cached URLs are unique, so each hash matches at most one record
+        kept: Deque[DedupeRecord] = deque()
+        removed = 0
+        for record in self.seen_articles:
+            if record.url_hash in url_hashes:
+                self._forget(record)
+                removed += 1
+            else:
+                kept.append(record)
+        self.seen_articles = kept
+        
+        if self._store is not None:
+            for url_hash in url_hashes:
+                self._store.remove(url_hash)
+            self._store.flush()
+        
+        logger.info(f"↩️  Forgot {removed} undelivered articles")
+        return removed
+    
+    def _process_record(self, record: DedupeRecord, article: Dict,
+                        source_candidates: Optional[Iterable[DedupeRecord]] = None,
+                        vector: Optional['np.ndarray'] = None) -> bool:
+        """
+        Check one article and cache it if unique.
+        
+        Args:
+            record: Compact record of the article
+            article: Article being processed
+            source_candidates: Precomputed Level 2 candidates (None to use
+                the source partition / LSH index)
+            vector: Precomputed n-gram vector of the headline, if any
+        
+        Returns:
+            True if the article is unique
+        """
+        self.stats['total_processed'] += 1
+        
+        band_keys = self._lsh_band_keys(record)
+        if self._is_duplicate(record, article, band_keys, source_candidates):
+            return False
+        
+        self._remember(record, band_keys, vector)
+        self.stats['unique_articles'] += 1
+        if self._store is not None:
+            self._persist(record, band_keys)
+        return True
+    
+    def _process_batch(self, articles: List[Dict]) -> List[Dict]:
+        """
+        Deduplicate a large batch with one vectorized Level 2 pass.
+        
+        Every headline in the batch is hashed into a character n-gram
+        vector and scored with matrix products against the batch and the
+        cached records' vectors (computed once, when each was cached).
+        Pairs from the same source whose cosine clears
+        ``batch_cosine_threshold`` become the Level 2 candidates, which are
+        then confirmed with SequenceMatcher in the usual order, so earlier
+        batch articles only count once they have been kept. Levels 1 and 3
+        run unchanged.
+        
+        Args:
+            articles: List of normalized articles
+        
+        Returns:
+            List of unique articles after deduplication
+        """
+        self.stats['vectorized_batches'] += 1
+        
+        records = [self._make_record(article) for article in articles]
+        batch_vectors = self._vectorizer.transform([r.headline for r in records])
+        batch_sources = np.fromiter((r.source_id for r in records), dtype=np.int64, count=len(records))
+        threshold = self.batch_cosine_threshold
+        
+        vectors = self._vectors
+        cached_count = len(vectors)
+        if cached_count:
+            size = vectors.size
+            cache_hits = candidate_pairs(batch_vectors, vectors.matrix[:size], batch_sources,
+                                         vectors.groups[:size], threshold)
+            # Resolve rows now: records kept below may reuse rows freed earlier
+            cache_candidates = [[vectors.items[j] for j in hits] for hits in cache_hits]
+        else:
+            cache_candidates = [[] for _ in records]
+        batch_hits = candidate_pairs(batch_vectors, batch_vectors, batch_sources, batch_sources, threshold)
+        
         unique = []
-        for article in articles:
-            self.stats['total_processed'] += 1
+        kept = [False] * len(records)
+        for i, (article, record) in enumerate(zip(articles, records)):
+            candidates = cache_candidates[i]
+            candidates.extend(records[j] for j in batch_hits[i] if j < i and kept[j])
             
-            if not self._is_duplicate(article):
+            if self._process_record(record, article, candidates, batch_vectors[i]):
                 unique.append(article)
-                self.seen_urls.add(article['url'])
-                self.seen_articles.append(article)
-                self.stats['unique_articles'] += 1
+                kept[i] = True
         
-        logger.info(f"🧹 Deduplication: {len(unique)}/{len(articles)} unique articles")
+        logger.debug(f"Vectorized dedupe of {len(records)} articles against {cached_count} cached")
         return unique
     
-    def _is_duplicate(self, article: Dict) -> bool:
+    def _restore(self):
+        """Warm the cache from the backing store, skipping expired records."""
+        started = time.perf_counter()
+        cutoff_timestamp = self._cutoff_timestamp()
+        store_cutoff = self._store_cutoff_timestamp()
+        
+        restored = 0
+        for url_hash, timestamp, source, symbols, headline, band_keys in self._store.load(store_cutoff):
+            if timestamp <= cutoff_timestamp:
+                # Only the URL outlives the similarity window
+                self._url_bloom.add(url_hash, timestamp)
+                continue
+            record = DedupeRecord(
+                url_hash,
+                timestamp,
+                self._intern_source(source),
+                self._parse_symbols(symbols),
+                headline or None
+            )
+            if band_keys is None:
+                band_keys = self._lsh_band_keys(record)
+            self._remember(record, band_keys)
+            restored += 1
+        
+        self._store.expire(store_cutoff)
+        self._store.flush()
+        
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        logger.info(f"♻️  Restored {restored} dedupe records from {self._store.path} in {elapsed_ms:.0f}ms")
+    
+    def _persist(self, record: DedupeRecord, band_keys: Optional[array]):
+        """Buffer a newly cached record for the backing store."""
+        self._store.add(
+            record.url_hash,
+            record.timestamp,
+            self._source_names[record.source_id],
+            ','.join(sorted(record.symbols)),
+            record.headline,
+            band_keys
+        )
+    
+    def _intern_source(self, source: str) -> int:
+        """Map a source name to a small integer id."""
+        source_id = self._source_ids.get(source)
+        if source_id is None:
+            source_id = self._source_ids[source] = len(self._source_names)
+            self._source_names.append(source)
+        return source_id
+    
+    def _make_record(self, article: Dict) -> DedupeRecord:
+        """
+        Build the compact cache record for an article.
+        
+        Args:
+            article: Normalized article
+        
+        Returns:
+            Record with hashed URL, interned source and parsed symbols
+        """
+        headline = article['headline']
+        return DedupeRecord(
+            url_fingerprint(article['url']),
+            article['datetime'],
+            self._intern_source(article['source']),
+            self._parse_symbols(article.get('related', '')),
+            # Whitespace-only headlines are treated like missing ones on every path
+            self._normalize_headline(headline) or None
+        )
+    
+    def _lsh_band_keys(self, record: DedupeRecord) -> Optional[array]:
+        """Compute a record's LSH band keys once for both lookup and insert."""
+        if self._lsh is None or not record.headline:
+            return None
+        return self._lsh.band_keys(record.headline)
+    
+    def _is_duplicate(self, record: DedupeRecord, article: Dict,
+                      band_keys: Optional[array] = None,
+                      source_candidates: Optional[Iterable[DedupeRecord]] = None) -> bool:
         """
         Check if article is a duplicate using multi-level matching.
         
         Args:
-            article: Article to check
+            record: Compact record of the article
+            article: Article to check (used for logging)
+            band_keys: Precomputed LSH band keys of the record
+            source_candidates: Precomputed Level 2 candidates, if any
         
         Returns:
             True if duplicate, False if unique
         """
-        # Level 1: Exact URL match
-        if article['url'] in self.seen_urls:
+        # Level 1: Exact match on the canonical URL
+        url_bloom = self._url_bloom
+        if record.url_hash in self.seen_urls or (url_bloom is not None and record.url_hash in url_bloom):
             self.stats['exact_url_dupes'] += 1
             logger.debug(f"Duplicate (URL): {article['headline'][:50]}...")
             return True
         
-        # Level 2 & 3: Similarity matching
-        for seen in self.seen_articles:
-            if self._are_similar(article, seen):
+        # Level 2: Same source + high headline similarity
+        if source_candidates is None:
+            source_candidates = self._source_candidates(record, band_keys)
+        for seen in source_candidates:
+            if self._similar_by_source(record, seen):
+                self.stats['similarity_dupes'] += 1
+                logger.debug(f"Duplicate (similarity): {article['headline'][:50]}...")
+                return True
+        
+        # Level 3: Time proximity + related symbol + moderate similarity
+        for seen in self._time_symbol_candidates(record):
+            if self._similar_by_time_symbol(record, seen):
                 self.stats['similarity_dupes'] += 1
                 logger.debug(f"Duplicate (similarity): {article['headline'][:50]}...")
                 return True
         
         return False
     
+    def _remember(self, record: DedupeRecord, band_keys: Optional[array] = None,
+                  vector: Optional['np.ndarray'] = None):
+        """Add a unique record to the URL set, cache and candidate indexes."""
+        self.seen_urls.add(record.url_hash)
+        self._insert_in_time_order(record)
+        self._records_bytes += record.memory_bytes()
+        
+        self._by_source.setdefault(record.source_id, set()).add(record)
+        
+        bucket = self._time_bucket(record.timestamp)
+        for symbol in record.symbols:
+            self._by_symbol_bucket.setdefault((symbol, bucket), set()).add(record)
+        
+        if self._lsh is not None and record.headline:
+            if band_keys is None:
+                band_keys = self._lsh.band_keys(record.headline)
+            self._lsh.add_band_keys(record, band_keys)
+        
+        if self._vectors is not None:
+            if vector is None:
+                vector = self._vectorizer.transform([record.headline])[0]
+            self._vectors.add(record, vector, record.source_id)
+    
+    def _insert_in_time_order(self, record: DedupeRecord):
+        """
+        Insert a record into the time-ordered cache.
+        
+        Records normally arrive newest-last and are appended in O(1).
+        Late arrivals (e.g. delayed Alpaca items) are inserted after the
+        last cached record that is not newer, found by walking back from
+        the newest end.
+        
+        Args:
+            record: Record to cache
+        """
+        cache = self.seen_articles
+        timestamp = record.timestamp
+        if not cache or cache[-1].timestamp <= timestamp:
+            cache.append(record)
+            return
+        
+        depth = 0
+        for cached in reversed(cache):
+            if cached.timestamp <= timestamp:
+                break
+            depth += 1
+        cache.insert(len(cache) - depth, record)
+    
+    def _forget(self, record: DedupeRecord):
+        """Drop an evicted record from the URL set and candidate indexes."""
+        self.seen_urls.discard(record.url_hash)
+        self._records_bytes -= record.memory_bytes()
+        
+        source_partition = self._by_source.get(record.source_id)
+        if source_partition is not None:
+            source_partition.discard(record)
+            if not source_partition:
+                del self._by_source[record.source_id]
+        
+        bucket = self._time_bucket(record.timestamp)
+        for symbol in record.symbols:
+            partition = self._by_symbol_bucket.get((symbol, bucket))
+            if partition is not None:
+                partition.discard(record)
+                if not partition:
+                    del self._by_symbol_bucket[(symbol, bucket)]
+        
+        if self._lsh is not None:
+            self._lsh.remove(record)
+        if self._vectors is not None:
+            self._vectors.remove(record)
+    
+    def _source_candidates(self, record: DedupeRecord,
+                           band_keys: Optional[array] = None) -> Iterable[DedupeRecord]:
+        """
+        Get cached records that could match the same-source rule (Level 2).
+        
+        Only records from the same source are returned. With LSH enabled
+        the partition is further narrowed to records sharing a MinHash band
+        with the headline.
+        
+        Args:
+            record: Record to check
+            band_keys: Precomputed LSH band keys of the record
+        
+        Returns:
+            Cached records to run the Level 2 rule against
+        """
+        partition = self._by_source.get(record.source_id)
+        if not partition:
+            return []
+        
+        if self._lsh is None:
+            return list(partition)
+        
+        if record.headline is None:
+            return []  # Missing headlines score 0.0 in _bounded_similarity
+        if band_keys is None:
+            band_keys = self._lsh.band_keys(record.headline)
+        return [seen for seen in self._lsh.query_band_keys(band_keys) if seen in partition]
+    
+    def _time_symbol_candidates(self, record: DedupeRecord) -> Iterable[DedupeRecord]:
+        """
+        Get cached records that could match the time+symbol rule (Level 3).
+        
+        Records within the 5-minute window always fall in the same or an
+        adjacent bucket, so only those buckets are visited for each symbol.
+        
+        Args:
+            record: Record to check
+        
+        Returns:
+            Cached records sharing a symbol in a neighbouring time bucket
+        """
+        if not record.symbols:
+            return []
+        
+        bucket = self._time_bucket(record.timestamp)
+        candidates: Set[DedupeRecord] = set()
+        for symbol in record.symbols:
+            for neighbour in (bucket - 1, bucket, bucket + 1):
+                partition = self._by_symbol_bucket.get((symbol, neighbour))
+                if partition:
+                    candidates.update(partition)
+        return candidates
+    
+    @staticmethod
+    def _time_bucket(timestamp: int) -> int:
+        """Map a timestamp to its Level 3 time bucket."""
+        return int(timestamp) // TIME_PROXIMITY_SECONDS
+    
+    @staticmethod
+    def _parse_symbols(related: str) -> FrozenSet[str]:
+        """Parse a comma-separated ``related`` field into a set of symbols."""
+        if not related:
+            return frozenset()
+        return frozenset(sys.intern(s.strip()) for s in related.split(',') if s.strip())
+    
+    @staticmethod
+    def _normalize_headline(headline: str) -> str:
+        """Normalize a headline the same way _calculate_similarity does."""
+        return headline.lower().strip() if headline else ''
+    
     def _are_similar(self, art1: Dict, art2: Dict) -> bool:
         """
         Check if two articles are similar enough to be considered duplicates.
@@ -96,34 +541,88 @@ class NewsDedupe:
         Returns:
             True if articles are similar, False otherwise
         """
-        # Level 2: Same source + high headline similarity
-        if art1['source'] == art2['source']:
-            similarity = self._calculate_similarity(
-                art1['headline'],
-                art2['headline']
-            )
-            if similarity > 0.85:
-                logger.debug(f"Similar match (source): {similarity:.2f}")
-                return True
+        rec1 = self._make_record(art1)
+        rec2 = self._make_record(art2)
+        return self._similar_by_source(rec1, rec2) or self._similar_by_time_symbol(rec1, rec2)
+    
+    def _similar_by_source(self, rec1: DedupeRecord, rec2: DedupeRecord) -> bool:
+        """Level 2: same source + high headline similarity (>85%)."""
+        if rec1.source_id != rec2.source_id:
+            return False
         
-        # Level 3: Time proximity + related symbol + moderate similarity
-        time_diff = abs(art1['datetime'] - art2['datetime'])
-        if time_diff < 300:  # 5 minutes
-            # Check if they have overlapping symbols
-            art1_symbols = set(s.strip() for s in art1.get('related', '').split(',') if s.strip())
-            art2_symbols = set(s.strip() for s in art2.get('related', '').split(',') if s.strip())
-            
-            if art1_symbols and art2_symbols and art1_symbols & art2_symbols:
-                similarity = self._calculate_similarity(
-                    art1['headline'],
-                    art2['headline']
-                )
-                if similarity > 0.70:
-                    logger.debug(f"Similar match (time+symbol): {similarity:.2f}")
-                    return True
+        similarity = self._bounded_similarity(rec1.headline, rec2.headline, SOURCE_SIMILARITY_THRESHOLD)
+        if similarity > SOURCE_SIMILARITY_THRESHOLD:
+            logger.debug(f"Similar match (source): {similarity:.2f}")
+            return True
+        return False
+    
+    def _similar_by_time_symbol(self, rec1: DedupeRecord, rec2: DedupeRecord) -> bool:
+        """Level 3: time proximity (<5 min) + symbol match + moderate similarity (>70%)."""
+        if abs(rec1.timestamp - rec2.timestamp) >= TIME_PROXIMITY_SECONDS:
+            return False
+        
+        # Check if they have overlapping symbols
+        if rec1.symbols.isdisjoint(rec2.symbols):
+            return False
         
+        similarity = self._bounded_similarity(rec1.headline, rec2.headline, TIME_SYMBOL_SIMILARITY_THRESHOLD)
+        if similarity > TIME_SYMBOL_SIMILARITY_THRESHOLD:
+            logger.debug(f"Similar match (time+symbol): {similarity:.2f}")
+            return True
         return False
     
+    def _bounded_similarity(self, headline1: Optional[str], headline2: Optional[str],
+                            threshold: float) -> float:
+        """
+        Headline similarity, skipping SequenceMatcher when it cannot clear a threshold.
+        
+        Cascade (each tier is an upper bound on ``ratio()``, computed with
+        the same ``2.0 * matches / total`` formula, so pruning never changes
+        a decision):
+        
+        1. Length bound (``real_quick_ratio``): at most the shorter headline
+           can match.
+        2. Character-count bound (``quick_ratio``): matches are limited by
+           the shared character multiset. Counts for ``headline1`` are
+           reused across the candidates of the record being checked.
+        3. Full ``SequenceMatcher.ratio()``.
+        
+        Args:
+            headline1: Normalized headline of the record being checked (None if empty)
+            headline2: Normalized headline of the cached record (None if empty)
+            threshold: Similarity the caller needs to exceed
+        
+        Returns:
+            The exact ratio, or an upper bound <= threshold if the pair was pruned
+        """
+        if headline1 is None or headline2 is None:
+            return 0.0
+        
+        stats = self.similarity_stats
+        stats['pairs_checked'] += 1
+        total = len(headline1) + len(headline2)
+        if not total:
+            stats['full_ratio_calls'] += 1
+            return SequenceMatcher(None, headline1, headline2).ratio()
+        
+        bound = 2.0 * min(len(headline1), len(headline2)) / total
+        if bound <= threshold:
+            stats['pruned_by_length'] += 1
+            return bound
+        
+        cached_headline, counts1 = self._char_counts
+        if cached_headline is not headline1:
+            counts1 = Counter(headline1)
+            self._char_counts = (headline1, counts1)
+        shared = sum(min(count, counts1[char]) for char, count in Counter(headline2).items() if char in counts1)
+        bound = 2.0 * shared / total
+        if bound <= threshold:
+            stats['pruned_by_char_counts'] += 1
+            return bound
+        
+        stats['full_ratio_calls'] += 1
+        return SequenceMatcher(None, headline1, headline2).ratio()
+    
     def _calculate_similarity(self, text1: str, text2: str) -> float:
         """
         Calculate similarity between two text strings.
@@ -144,32 +643,86 @@ class NewsDedupe:
             text2.lower().strip()
         ).ratio()
     
+    def _cutoff_timestamp(self, hours: Optional[int] = None) -> int:
+        """Timestamp at or before which cached articles have expired."""
+        cutoff_time = datetime.now() - timedelta(hours=self.window_hours if hours is None else hours)
+        return int(cutoff_time.timestamp())
+    
+    def _store_cutoff_timestamp(self) -> int:
+        """Timestamp at or before which stored rows are no longer needed."""
+        if self._url_bloom is not None:
+            return self._cutoff_timestamp(self.url_window_hours)
+        return self._cutoff_timestamp()
+    
     def _clean_cache(self):
         """Remove articles older than the configured window from cache."""
-        cutoff_time = datetime.now() - timedelta(hours=self.window_hours)
-        cutoff_timestamp = int(cutoff_time.timestamp())
+        cutoff_timestamp = self._cutoff_timestamp()
         
-        before_count = len(self.seen_articles)
+        # Cache is kept in time order, so expired records are at the left
+        removed = 0
+        url_bloom = self._url_bloom
+        while self.seen_articles and self.seen_articles[0].timestamp <= cutoff_timestamp:
+            record = self.seen_articles.popleft()
+            self._forget(record)
+            if url_bloom is not None:
+                url_bloom.add(record.url_hash, record.timestamp)
+            removed += 1
         
-        # Filter out old articles
-        self.seen_articles = [
-            article for article in self.seen_articles
-            if article['datetime'] > cutoff_timestamp
-        ]
+        if url_bloom is not None:
+            url_bloom.expire(self._store_cutoff_timestamp())
         
-        # Rebuild URL set from remaining articles
-        self.seen_urls = {article['url'] for article in self.seen_articles}
-        
-        removed = before_count - len(self.seen_articles)
         if removed > 0:
             logger.debug(f"🗑️  Cleaned {removed} old articles from cache")
+            if self._store is not None:
+                self._store.expire(self._store_cutoff_timestamp())
+    
+    def get_memory_usage(self) -> Dict:
+        """
+        Estimate memory held by the dedupe cache.
+        
+        Returns:
+            Approximate bytes for records, the URL set and the indexes
+        """
+        url_bytes = self.seen_urls.memory_bytes()
+        index_bytes = sys.getsizeof(self._by_source) + sys.getsizeof(self._by_symbol_bucket)
+        index_bytes += sum(sys.getsizeof(p) for p in self._by_source.values())
+        index_bytes += sum(sys.getsizeof(p) for p in self._by_symbol_bucket.values())
+        
+        return {
+            'records_bytes': self._records_bytes + sys.getsizeof(self.seen_articles),
+            'url_set_bytes': url_bytes,
+            'index_bytes': index_bytes,
+            'lsh_bytes': self._lsh.memory_bytes() if self._lsh is not None else 0,
+            'url_bloom_bytes': self._url_bloom.memory_bytes() if self._url_bloom is not None else 0,
+            'vector_bytes': self._vectors.memory_bytes() if self._vectors is not None else 0
+        }
     
     def get_stats(self) -> Dict:
         """Get deduplication statistics."""
+        memory = self.get_memory_usage()
         return {
             **self.stats,
             'cache_size': len(self.seen_articles),
-            'url_cache_size': len(self.seen_urls)
+            'url_cache_size': len(self.seen_urls),
+            'url_bloom_size': len(self._url_bloom) if self._url_bloom is not None else 0,
+            'lsh_index_size': len(self._lsh) if self._lsh is not None else 0,
+            'cache_memory_bytes': sum(memory.values()),
+            **self.similarity_stats
+        }
+    
+    def close(self):
+        """Flush and close the backing store, if any."""
+        if self._store is not None:
+            self._store.close()
+            self._store = None
+    
+    @staticmethod
+    def _empty_similarity_stats() -> Dict:
+        return {
+            'pairs_checked': 0,
+            'pruned_by_length': 0,
+            'pruned_by_char_counts': 0,
+            'full_ratio_calls': 0
         }
     
     def reset_stats(self):
@@ -178,8 +731,10 @@ class NewsDedupe:
             'total_processed': 0,
             'exact_url_dupes': 0,
             'similarity_dupes': 0,
-            'unique_articles': 0
+            'unique_articles': 0,
+            'vectorized_batches': 0
         }
+        self.similarity_stats = self._empty_similarity_stats()
 
 
 if __name__ == "__main__":
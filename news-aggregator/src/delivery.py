@@ -1,23 +1,29 @@
 """Delivery module for sending news to Pulse application."""
+import asyncio
 import requests
-from typing import List, Dict
+from typing import List, Dict, Optional
 import logging
 import json
 
+from http_pool import get_session
+
 logger = logging.getLogger(__name__)
 
 
 class NewsDelivery:
     """Handles delivery of news articles to the Pulse application."""
     
-    def __init__(self, pulse_endpoint: str = "http://localhost:5000/api/news"):
+    def __init__(self, pulse_endpoint: str = "http://localhost:5000/api/news",
+                 session: Optional[requests.Session] = None):
         """
         Initialize news delivery.
         
         Args:
             pulse_endpoint: Endpoint URL for Pulse news API
+            session: HTTP session (defaults to the shared pooled session)
         """
         self.pulse_endpoint = pulse_endpoint
+        self.session = session or get_session()
         self.delivery_stats = {
             'total_sent': 0,
             'successful': 0,
@@ -26,7 +32,7 @@ class NewsDelivery:
     
     async def send_to_pulse(self, news_items: List[Dict]) -> Dict:
         """
-        Send news items to Pulse application (async compatible).
+        Send news items to Pulse application without blocking the event loop.
         
         Args:
             news_items: List of deduplicated news articles
@@ -34,7 +40,7 @@ class NewsDelivery:
         Returns:
             Summary of delivery operation
         """
-        return self.send_to_pulse_sync(news_items)
+        return await asyncio.to_thread(self.send_to_pulse_sync, news_items)
     
     def send_to_pulse_sync(self, news_items: List[Dict]) -> Dict:
         """
@@ -60,7 +66,7 @@ class NewsDelivery:
             # For now, just log the formatted data
             # In production, this would POST to Pulse endpoint
             if self.pulse_endpoint.startswith('http'):
-                response = requests.post(
+                response = self.session.post(
                     self.pulse_endpoint,
                     json={'news': formatted},
                     headers={'Content-Type': 'application/json'},
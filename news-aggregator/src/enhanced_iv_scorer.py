@@ -7,11 +7,20 @@ Integrates:
 """
 
 import requests
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
+from hashlib import blake2b
 import json
+import re
+import unicodedata
 from google import genai
 
+from config import GEMINI_BASE_URL, GEMINI_BATCH_SIZE, GEMINI_CACHE_SIZE, GEMINI_CACHE_TTL_SECONDS, YAHOO_CHART_URL
+from fast_json import decode_response
+from http_pool import get_session
+from resilience import get_breaker, guarded_get
+from ttl_cache import TTLCache
+
 # Historical Event Database for Calibration
 HISTORICAL_EVENTS = [
     # Format: (date, event, actual_ES_move_pts, VIX_at_time)
@@ -30,21 +39,86 @@ HISTORICAL_EVENTS = [
     ("2024-01-15", "Minor Fed comments", +15, 12.80),
 ]
 
+SENTIMENTS = ("very_negative", "negative", "neutral", "positive", "very_positive")
+EVENT_TYPES = ("macro_critical", "geopolitical", "corporate", "minor")
+DIRECTIONS = ("bearish", "neutral", "bullish")
+
+# Structured output for batched analyses: one object per headline, tagged with its index
+BATCH_RESPONSE_SCHEMA = {
+    "type": "ARRAY",
+    "items": {
+        "type": "OBJECT",
+        "properties": {
+            "index": {"type": "INTEGER"},
+            "sentiment": {"type": "STRING", "enum": list(SENTIMENTS)},
+            "event_type": {"type": "STRING", "enum": list(EVENT_TYPES)},
+            "confidence": {"type": "NUMBER"},
+            "direction": {"type": "STRING", "enum": list(DIRECTIONS)}
+        },
+        "required": ["index", "sentiment", "event_type", "confidence", "direction"]
+    }
+}
+
+# Wire-service markers that syndicated reposts add or drop
+# ("UPDATE: ..." or "Alert - ..."; a bare leading word like "Update on ..." is content)
+_HEADLINE_PREFIX = re.compile(r'^(?:breaking|update|updated|exclusive|urgent|alert)\s*[:\-\u2013\u2014|]+\s*')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def headline_fingerprint(headline: str) -> int:
+    """
+    Fingerprint a headline so reposts of it share a cache entry.
+    
+    Only case, Unicode compatibility forms, runs of whitespace and a leading
+    "BREAKING:"/"UPDATE -" style marker are folded. Punctuation is kept:
+    signs, percentages, prices and decimals ("+2.1%" vs "-2.1%") change
+    the analysis.
+    
+    Args:
+        headline: News headline text
+    
+    Returns:
+        Unsigned 64-bit integer fingerprint
+    """
+    text = unicodedata.normalize('NFKC', headline).lower().strip()
+    text = _HEADLINE_PREFIX.sub('', text)
+    text = _WHITESPACE.sub(' ', text).strip()
+    return int.from_bytes(blake2b(text.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
 class EnhancedIVScorer:
     """
     Advanced IV scoring using real-time VIX, Gemini sentiment, and historical calibration.
     """
     
-    def __init__(self, gemini_api_key: str):
+    def __init__(self, gemini_api_key: str, session: Optional[requests.Session] = None,
+                 vix_url: str = YAHOO_CHART_URL, gemini_base_url: Optional[str] = GEMINI_BASE_URL,
+                 cache_size: int = GEMINI_CACHE_SIZE, cache_ttl_seconds: float = GEMINI_CACHE_TTL_SECONDS,
+                 batch_size: int = GEMINI_BATCH_SIZE):
         """
         Initialize the IV scorer.
         
         Args:
             gemini_api_key: Google Gemini API key for NLP analysis
+            session: HTTP session for VIX quotes (defaults to the shared pooled session)
+            vix_url: Yahoo Finance chart API base URL for VIX quotes
+            gemini_base_url: Gemini API endpoint (None for the SDK default)
+            cache_size: Headline analyses kept in memory (0 disables the cache)
+            cache_ttl_seconds: Seconds a cached analysis is reused
+            batch_size: Headlines packed into one Gemini request by the batch API
         """
-        self.gemini_client = genai.Client(api_key=gemini_api_key)
+        http_options = {'base_url': gemini_base_url} if gemini_base_url else None
+        self.gemini_client = genai.Client(api_key=gemini_api_key, http_options=http_options)
+        self.vix_url = vix_url
+        self.session = session or get_session()
+        # While Yahoo is down, skip straight to the cached VIX instead of waiting on timeouts
+        self.vix_breaker = get_breaker('yahoo')
         self.vix_cache = {"value": 15.0, "timestamp": 0}  # Cache VIX for 5 min
         self.calibration_factors = self._calculate_calibration()
+        # Gemini analyses keyed by headline fingerprint; reposts skip the model call
+        self.analysis_cache = TTLCache(cache_size, cache_ttl_seconds) if cache_size > 0 else None
+        self.batch_size = max(1, batch_size)
+        self.batch_stats = {'requests': 0, 'headlines': 0, 'fallbacks': 0}
     
     def _calculate_calibration(self) -> Dict:
         """
@@ -83,8 +157,10 @@ class EnhancedIVScorer:
         
         try:
             # Try Yahoo Finance as primary source (^VIX symbol)
-            response = requests.get(
-                f"https://query1.finance.yahoo.com/v8/finance/chart/%5EVIX",
+            response = guarded_get(
+                self.session,
+                f"{self.vix_url}/%5EVIX",
+                self.vix_breaker,
                 params={
                     "interval": "1m",
                     "range": "1d"
@@ -93,7 +169,7 @@ class EnhancedIVScorer:
             )
             
             if response.ok:
-                data = response.json()
+                data = decode_response(response)
                 vix = data["chart"]["result"][0]["meta"]["regularMarketPrice"]
                 self.vix_cache = {"value": vix, "timestamp": now}
                 return vix
@@ -107,12 +183,22 @@ class EnhancedIVScorer:
         """
         Use Gemini to analyze news sentiment and classify event type.
         
+        Successful analyses are cached by ``headline_fingerprint``, so a
+        repeated or trivially reworded headline returns without a model call.
+        Malformed replies and keyword fallbacks are not cached.
+        
         Args:
             headline: News headline text
         
         Returns:
             Dictionary with sentiment, event_type, and confidence
         """
+        key = headline_fingerprint(headline) if self.analysis_cache is not None else None
+        if key is not None:
+            cached = self.analysis_cache.get(key)
+            if cached is not None:
+                return dict(cached)
+        
         prompt = f"""Analyze this financial news headline and provide:
 1. Sentiment: "very_negative", "negative", "neutral", "positive", "very_positive"
 2. Event Type: "macro_critical" (Fed/CPI/NFP/GDP), "geopolitical" (war/crisis), "corporate" (earnings/M&A), "minor" (commentary)
@@ -123,29 +209,140 @@ Headline: "{headline}"
 
 Respond ONLY in JSON format:
 {{"sentiment": "...", "event_type": "...", "confidence": 0.0, "direction": "..."}}"""
-
+        
         try:
             response = self.gemini_client.models.generate_content(
                 model='gemini-2.5-flash',  # Latest Gemini 2.5
                 contents=prompt
             )
             
-            # Parse JSON from response
-            result_text = response.text.strip()
-            # Remove markdown code blocks if present
-            if result_text.startswith("```json"):
-                result_text = result_text[7:-3]
-            elif result_text.startswith("```"):
-                result_text = result_text[3:-3]
-            
-            analysis = json.loads(result_text)
+            analysis = self._validate_analysis(json.loads(self._strip_code_fence(response.text)))
+            if analysis is None:
+                print(f"⚠️  Gemini analysis malformed: {response.text[:200]!r}")
+                return self._fallback_sentiment(headline)
+            if key is not None:
+                self.analysis_cache.put(key, dict(analysis))
             return analysis
-            
+        
         except Exception as e:
             print(f"⚠️  Gemini analysis failed: {e}")
             # Fallback to simple keyword-based analysis
             return self._fallback_sentiment(headline)
     
+    def analyze_sentiment_batch(self, headlines: List[str]) -> List[Dict]:
+        """
+        Analyze many headlines with one Gemini request per ``batch_size``.
+        
+        Cached and repeated headlines are answered without the model. Each
+        returned item is validated on its own; an item that is missing or
+        malformed (or a whole request that fails) falls back to
+        ``_fallback_sentiment`` for just those headlines.
+        
+        Args:
+            headlines: News headline texts
+        
+        Returns:
+            One analysis per headline, in input order
+        """
+        analyses: List[Optional[Dict]] = [None] * len(headlines)
+        pending: Dict[int, List[int]] = {}  # Fingerprint -> positions awaiting the model
+        for position, headline in enumerate(headlines):
+            key = headline_fingerprint(headline)
+            if key in pending:
+                pending[key].append(position)
+                continue
+            cached = self.analysis_cache.get(key) if self.analysis_cache is not None else None
+            if cached is not None:
+                analyses[position] = dict(cached)
+            else:
+                pending[key] = [position]
+        
+        keys = list(pending)
+        for start in range(0, len(keys), self.batch_size):
+            chunk = keys[start:start + self.batch_size]
+            results = self._analyze_chunk([headlines[pending[key][0]] for key in chunk])
+            for key, analysis in zip(chunk, results):
+                if analysis is None:
+                    self.batch_stats['fallbacks'] += 1
+                    analysis = self._fallback_sentiment(headlines[pending[key][0]])
+                elif self.analysis_cache is not None:
+                    self.analysis_cache.put(key, dict(analysis))
+                for position in pending[key]:
+                    analyses[position] = dict(analysis)
+        return analyses
+    
+    def _analyze_chunk(self, headlines: List[str]) -> List[Optional[Dict]]:
+        """One Gemini request for up to ``batch_size`` headlines; None marks items to fall back."""
+        numbered = "\n".join(f"{i}. {json.dumps(headline)}" for i, headline in enumerate(headlines))
+        prompt = f"""Analyze each of these financial news headlines and provide:
+1. Sentiment: "very_negative", "negative", "neutral", "positive", "very_positive"
+2. Event Type: "macro_critical" (Fed/CPI/NFP/GDP), "geopolitical" (war/crisis), "corporate" (earnings/M&A), "minor" (commentary)
+3. Confidence: 0.0 to 1.0
+4. Expected Market Impact Direction: "bearish", "neutral", "bullish"
+
+Headlines:
+{numbered}
+
+Respond ONLY with a JSON array holding one object per headline, with "index" set to the headline's number:
+[{{"index": 0, "sentiment": "...", "event_type": "...", "confidence": 0.0, "direction": "..."}}]"""
+        
+        self.batch_stats['requests'] += 1
+        self.batch_stats['headlines'] += len(headlines)
+        try:
+            response = self.gemini_client.models.generate_content(
+                model='gemini-2.5-flash',
+                contents=prompt,
+                config={
+                    'response_mime_type': 'application/json',
+                    'response_schema': BATCH_RESPONSE_SCHEMA
+                }
+            )
+            items = json.loads(self._strip_code_fence(response.text))
+        except Exception as e:
+            print(f"⚠️  Gemini batch analysis failed ({len(headlines)} headlines): {e}")
+            return [None] * len(headlines)
+        
+        results: List[Optional[Dict]] = [None] * len(headlines)
+        for item in items if isinstance(items, list) else []:
+            analysis = self._validate_analysis(item)
+            index = item.get('index') if isinstance(item, dict) else None
+            if analysis is not None and isinstance(index, int) and 0 <= index < len(headlines):
+                results[index] = analysis
+        return results
+    
+    @staticmethod
+    def _validate_analysis(item) -> Optional[Dict]:
+        """Analysis fields of one model reply item, or None if any is missing or out of range."""
+        if not isinstance(item, dict):
+            return None
+        confidence = item.get('confidence')
+        if (item.get('sentiment') not in SENTIMENTS or item.get('event_type') not in EVENT_TYPES
+                or item.get('direction') not in DIRECTIONS
+                or isinstance(confidence, bool) or not isinstance(confidence, (int, float))
+                or not 0.0 <= confidence <= 1.0):
+            return None
+        return {
+            'sentiment': item['sentiment'],
+            'event_type': item['event_type'],
+            'confidence': float(confidence),
+            'direction': item['direction']
+        }
+    
+    @staticmethod
+    def _strip_code_fence(text: str) -> str:
+        """Model reply without a surrounding markdown code block."""
+        text = text.strip()
+        if text.startswith("```json"):
+            text = text[7:-3]
+        elif text.startswith("```"):
+            text = text[3:-3]
+        return text
+    
+    def get_cache_stats(self) -> Dict:
+        """Analysis cache size plus hit, miss and eviction counts."""
+        stats = self.analysis_cache.get_stats() if self.analysis_cache is not None else {'size': 0}
+        return {**stats, 'batch': dict(self.batch_stats)}
+    
     def _fallback_sentiment(self, headline: str) -> Dict:
         """Simple keyword-based fallback if Gemini fails."""
         hl = headline.lower()
@@ -208,6 +405,34 @@ Respond ONLY in JSON format:
         # 2. Analyze sentiment with Gemini
         sentiment_analysis = self.analyze_sentiment_with_gemini(headline)
         
+        return self._score_analysis(sentiment_analysis, current_vix, instrument)
+    
+    def calculate_iv_scores(self, headlines: List[str], instrument: str = "/MES",
+                            current_vix: Optional[float] = None) -> List[Dict]:
+        """
+        Calculate IV scores for many headlines with batched Gemini requests.
+        
+        VIX is read once, and headlines are analyzed ``batch_size`` at a
+        time (see ``analyze_sentiment_batch``), so N headlines cost about
+        N / batch_size model calls instead of N.
+        
+        Args:
+            headlines: News headlines to analyze
+            instrument: Trading instrument (/MES, /MNQ, /MGC, /SIL)
+            current_vix: VIX level to score at (None fetches it)
+        
+        Returns:
+            One score per headline, in input order (same fields as calculate_iv_score)
+        """
+        if not headlines:
+            return []
+        if current_vix is None:
+            current_vix = self.get_current_vix()
+        analyses = self.analyze_sentiment_batch(headlines)
+        return [self._score_analysis(analysis, current_vix, instrument) for analysis in analyses]
+    
+    def _score_analysis(self, sentiment_analysis: Dict, current_vix: float, instrument: str) -> Dict:
+        """IV score for one sentiment analysis at the given VIX level."""
         # 3. Calculate base points from event type
         event_type = sentiment_analysis["event_type"]
         base_points_map = {
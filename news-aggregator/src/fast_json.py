@@ -0,0 +1,51 @@
+"""JSON decoding for upstream payloads, using orjson when it is installed."""
+import json
+from typing import Any, Union
+
+import requests
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib parser is used instead
+    orjson = None
+
+
+def fast_json_available() -> bool:
+    """Whether orjson is installed and used for decoding."""
+    return orjson is not None
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    Decode a JSON document.
+    
+    Args:
+        data: Raw JSON bytes or text
+    
+    Returns:
+        Decoded Python object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def decode_response(response: requests.Response) -> Any:
+    """
+    Decode a JSON response body.
+    
+    orjson parses the raw bytes directly, skipping requests' text decoding
+    and charset detection; without it this is ``response.json()``.
+    
+    Args:
+        response: Response with a JSON body
+    
+    Returns:
+        Decoded Python object
+    
+    Raises:
+        ValueError: If the body is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
@@ -1,39 +1,134 @@
 """FinHub Market News API client."""
 import requests
-from typing import List, Dict, Optional
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Dict, Optional, Tuple
+from datetime import datetime, timedelta, timezone
 import logging
+import time
+
+from article_merge import merge_by_time, oriented
+from config import FINNHUB_BASE_URL, FINNHUB_CALLS_PER_MINUTE, FINNHUB_COMPANY_WORKERS
+from fast_json import decode_response
+from http_pool import get_session
+from lazy_article import FieldMap, LazyArticle
+from rate_limit import TokenBucket
+from resilience import CircuitBreaker, CircuitOpenError, Hedger, get_breaker, get_hedger, guarded_get
 
 logger = logging.getLogger(__name__)
 
+# Categories served by /news; each has its own id sequence for minId, so an id
+# only identifies an article within its category
+CATEGORIES = ('general', 'forex', 'crypto', 'merger')
+
+# FinHub also caps bursts at 30 calls/second regardless of plan
+MAX_BURST = 30
+
+
+# Normalized field -> extractor for raw FinHub articles (see LazyArticle)
+FINNHUB_FIELDS: FieldMap = {
+    'id': lambda article: article.get('id', 0),
+    'headline': lambda article: article.get('headline', ''),
+    'summary': lambda article: article.get('summary', ''),
+    'url': lambda article: article.get('url', ''),
+    'image': lambda article: article.get('image', ''),
+    'source': lambda article: article.get('source', 'FinHub'),
+    'datetime': lambda article: article['datetime'] if 'datetime' in article else int(time.time()),
+    'category': lambda article: article.get('category', 'general'),
+    'related': lambda article: article.get('related', ''),
+    'origin': lambda article: 'finnhub',
+}
+
+
+def merge_newest_first(results: Iterable[List[Dict]], unique_ids: bool = True) -> List[Dict]:
+    """Merge per-request article lists newest first, keeping each id once if ``unique_ids``."""
+    return list(merge_by_time((oriented(articles, newest_first=True) for articles in results),
+                              unique_ids=unique_ids))
+
+
+def merge_cursors(updates: Iterable[Dict]) -> Dict:
+    """Combine cursor updates for distinct categories or symbols into one."""
+    merged: Dict[str, Dict] = {}
+    for update in updates:
+        for kind, cursors in update.items():
+            merged.setdefault(kind, {}).update(cursors)
+    return merged
+
 
 class FinnHubNewsClient:
     """Client for fetching news from FinHub API."""
     
-    def __init__(self, api_key: str, base_url: str = "https://finnhub.io/api/v1"):
+    def __init__(self, api_key: str, base_url: str = FINNHUB_BASE_URL,
+                 session: Optional[requests.Session] = None, rate_limiter: Optional[TokenBucket] = None,
+                 breaker: Optional[CircuitBreaker] = None, hedger: Optional[Hedger] = None):
         """
         Initialize FinHub news client.
         
         Args:
             api_key: FinHub API key
             base_url: Base URL for FinHub API
+            session: HTTP session (defaults to the shared pooled session)
+            rate_limiter: Limiter every request waits on (defaults to
+                FINNHUB_CALLS_PER_MINUTE, shared by all of this client's calls)
+            breaker: Circuit breaker for FinHub (defaults to the shared one)
+            hedger: Hedger for category news requests (defaults to the shared
+                one when HEDGE_REQUESTS is on); a duplicate is only sent if a
+                spare rate-limit token is available
         """
         self.api_key = api_key
         self.base_url = base_url
-        self.last_id = None
+        self.session = session or get_session()
+        self.rate_limiter = rate_limiter or TokenBucket.per_minute(
+            FINNHUB_CALLS_PER_MINUTE, burst=min(FINNHUB_CALLS_PER_MINUTE, MAX_BURST)
+        )
+        self.breaker = breaker or get_breaker('finnhub')
+        self.hedger = hedger if hedger is not None else get_hedger('finnhub')
+        # Highest article id seen per category (minId cursor)
+        self.last_ids: Dict[str, int] = {}
+        # Newest article timestamp seen per symbol (company-news cursor)
+        self.company_cursors: Dict[str, int] = {}
+        # When each symbol was last polled, so capped fan-outs rotate through the list
+        self._company_polled: Dict[str, float] = {}
+    
+    @property
+    def last_id(self) -> Optional[int]:
+        """minId cursor of the general category."""
+        return self.last_ids.get('general')
     
     def get_news(self, category: str = "general", use_incremental: bool = True) -> List[Dict]:
         """
-        Fetch news from FinHub API.
+        Fetch news from FinHub API and advance the category's minId cursor.
         
         Args:
             category: News category (general, forex, crypto, merger)
-            use_incremental: Whether to use minId for incremental fetching
+            use_incremental: Whether to use the category's minId cursor
         
         Returns:
             List of news articles in normalized format
         """
+        articles, cursor = self.fetch_news(category, use_incremental)
+        self.commit_cursor(cursor)
+        return articles
+    
+    def fetch_news(self, category: str = "general", use_incremental: bool = True,
+                   deadline: Optional[float] = None) -> Tuple[List[Dict], Dict]:
+        """
+        Fetch one category without moving its cursor.
+        
+        Args:
+            category: News category (general, forex, crypto, merger)
+            use_incremental: Whether to use the category's minId cursor
+            deadline: ``time.monotonic()`` by which the rate-limit wait and
+                request, including retries, must finish (None for 30s each)
+        
+        Returns:
+            (normalized articles, cursor update for ``commit_cursor``)
+        """
         try:
+            last_id = self.last_ids.get(category)
+            if not self._acquire_token(deadline):
+                logger.warning(f"⚠️  FinHub rate limit: skipping {category} news this cycle")
+                return [], {}
+            
             # Build request parameters
             params = {
                 "category": category,
@@ -41,40 +136,91 @@ class FinnHubNewsClient:
             }
             
             # Use minId for incremental updates
-            if use_incremental and self.last_id:
-                params["minId"] = self.last_id
-                logger.info(f"Fetching FinHub news incrementally from ID {self.last_id}")
+            if use_incremental and last_id:
+                params["minId"] = last_id
+                logger.info(f"Fetching FinHub {category} news incrementally from ID {last_id}")
             else:
                 logger.info(f"Fetching FinHub news: category={category}")
             
             # Make request
-            response = requests.get(
+            response = guarded_get(
+                self.session,
                 f"{self.base_url}/news",
+                self.breaker,
+                self.hedger,
+                can_hedge=self.rate_limiter.try_acquire,
+                deadline=deadline,
                 params=params,
                 timeout=30
             )
             
             response.raise_for_status()
-            news_items = response.json()
+            news_items = decode_response(response)
             
-            # Update last_id for next incremental fetch
+            # Cursor for the next incremental fetch, applied by commit_cursor
+            cursor = {}
             if news_items and len(news_items) > 0:
-                max_id = max(article.get('id', 0) for article in news_items)
-                if max_id > (self.last_id or 0):
-                    self.last_id = max_id
-                    logger.debug(f"Updated last_id to {self.last_id}")
+                cursor = {'last_ids': {category: max(article.get('id', 0) for article in news_items)}}
             
-            logger.info(f"✅ Fetched {len(news_items)} articles from FinHub")
+            logger.info(f"✅ Fetched {len(news_items)} {category} articles from FinHub")
             
             # Normalize to common format
-            return [self._normalize_article(article) for article in news_items]
-            
+            return [self._normalize_article(article) for article in news_items], cursor
+        
+        except CircuitOpenError as e:
+            logger.warning(f"⚡ {e}")
+            return [], {}
         except requests.exceptions.RequestException as e:
             logger.error(f"❌ Error fetching FinHub news: {e}")
-            return []
+            return [], {}
         except Exception as e:
             logger.error(f"❌ Unexpected error in FinHub client: {e}")
-            return []
+            return [], {}
+    
+    def get_all_news(self, categories: Iterable[str] = CATEGORIES, use_incremental: bool = True) -> List[Dict]:
+        """
+        Fetch several categories concurrently and merge them.
+        
+        Each category is requested on its own pooled connection with its own
+        minId cursor, so the fan-out costs one round trip rather than one per
+        category. A failing category contributes nothing and keeps its cursor.
+        
+        Args:
+            categories: News categories to fetch
+            use_incremental: Whether to use each category's minId cursor
+        
+        Returns:
+            Normalized articles from all categories, newest first (equal ids
+            in different categories are different articles; a story listed
+            under several categories is left to dedupe's URL match)
+        """
+        articles, cursor = self.fetch_all_news(categories, use_incremental)
+        self.commit_cursor(cursor)
+        return articles
+    
+    def fetch_all_news(self, categories: Iterable[str] = CATEGORIES, use_incremental: bool = True,
+                       deadline: Optional[float] = None) -> Tuple[List[Dict], Dict]:
+        """
+        Fetch several categories concurrently without moving their cursors.
+        
+        Args:
+            categories: News categories to fetch
+            use_incremental: Whether to use each category's minId cursor
+            deadline: Passed to fetch_news for every category
+        
+        Returns:
+            (normalized articles newest first, cursor update for ``commit_cursor``)
+        """
+        categories = list(categories)
+        if len(categories) <= 1:
+            results = [self.fetch_news(category, use_incremental, deadline) for category in categories]
+        else:
+            with ThreadPoolExecutor(max_workers=len(categories), thread_name_prefix='finnhub') as pool:
+                results = list(pool.map(lambda category: self.fetch_news(category, use_incremental, deadline),
+                                        categories))
+        # Ids are per category, so they cannot be used to drop cross-category repeats
+        merged = merge_newest_first((articles for articles, _ in results), unique_ids=False)
+        return merged, merge_cursors(cursor for _, cursor in results)
     
     def get_company_news(self, symbol: str, from_date: str, to_date: str) -> List[Dict]:
         """
@@ -88,6 +234,21 @@ class FinnHubNewsClient:
         Returns:
             List of news articles in normalized format
         """
+        if not self._acquire_token(None):
+            logger.warning(f"⚠️  FinHub rate limit: skipping {symbol} company news")
+            return []
+        return self._request_company_news(symbol, from_date, to_date) or []
+    
+    def _acquire_token(self, deadline: Optional[float], timeout: Optional[float] = 30) -> bool:
+        """Wait for a rate-limit token for up to timeout seconds, and never past the deadline."""
+        if deadline is not None:
+            remaining = max(0.0, deadline - time.monotonic())
+            timeout = remaining if timeout is None else min(timeout, remaining)
+        return self.rate_limiter.acquire(timeout=timeout)
+    
+    def _request_company_news(self, symbol: str, from_date: str, to_date: str,
+                              deadline: Optional[float] = None) -> Optional[List[Dict]]:
+        """Request /company-news once a rate-limit token is held (None if the request failed)."""
         try:
             params = {
                 "symbol": symbol,
@@ -97,49 +258,165 @@ class FinnHubNewsClient:
             }
             
             logger.info(f"Fetching FinHub company news: {symbol}")
-            response = requests.get(
+            response = guarded_get(
+                self.session,
                 f"{self.base_url}/company-news",
+                self.breaker,
+                deadline=deadline,
                 params=params,
                 timeout=30
             )
             
             response.raise_for_status()
-            news_items = response.json()
+            news_items = decode_response(response)
             
             logger.info(f"✅ Fetched {len(news_items)} company articles from FinHub")
             
             # Normalize to common format
             return [self._normalize_article(article) for article in news_items]
-            
+        
+        except CircuitOpenError as e:
+            logger.warning(f"⚡ {e}")
+            return None
         except requests.exceptions.RequestException as e:
             logger.error(f"❌ Error fetching FinHub company news: {e}")
-            return []
+            return None
         except Exception as e:
             logger.error(f"❌ Unexpected error in FinHub company client: {e}")
-            return []
+            return None
     
-    def _normalize_article(self, article: Dict) -> Dict:
+    def get_company_news_bulk(self, symbols: Iterable[str], lookback_days: int = 1,
+                              max_workers: int = FINNHUB_COMPANY_WORKERS,
+                              deadline_seconds: Optional[float] = None) -> List[Dict]:
         """
-        Normalize FinHub article to common format.
+        Fetch company news for many symbols concurrently under the rate limit.
+        
+        Each symbol keeps a cursor at the newest article seen: requests start
+        on that article's date (FinHub filters by day) and anything older
+        than the cursor is dropped client-side. Symbols polled least recently
+        go first, so when the quota or deadline cuts a fan-out short, or a
+        symbol's request fails, the next cycle starts with those symbols.
         
         Args:
-            article: Raw article from FinHub API
+            symbols: Symbols to fetch
+            lookback_days: Days fetched for a symbol with no cursor yet
+            max_workers: Concurrent requests in flight (the shared session's
+                per-host pool is sized for this plus the category fetches)
+            deadline_seconds: Finish every request within this long; symbols
+                that could not get a rate-limit token in time are skipped
+        
+        Returns:
+            Normalized articles from all symbols, newest first, with articles
+            tagged on several symbols kept once
+        """
+        deadline = None if deadline_seconds is None else time.monotonic() + deadline_seconds
+        articles, cursor = self.fetch_company_news_bulk(symbols, lookback_days, max_workers, deadline)
+        self.commit_cursor(cursor)
+        return articles
+    
+    def fetch_company_news_bulk(self, symbols: Iterable[str], lookback_days: int = 1,
+                                max_workers: int = FINNHUB_COMPANY_WORKERS,
+                                deadline: Optional[float] = None) -> Tuple[List[Dict], Dict]:
+        """
+        Company-news fan-out behind get_company_news_bulk, without moving cursors.
+        
+        Args:
+            symbols: Symbols to fetch
+            lookback_days: Days fetched for a symbol with no cursor yet
+            max_workers: Concurrent requests in flight
+            deadline: ``time.monotonic()`` by which rate-limit waits and
+                requests must finish (None for no limit)
+        
+        Returns:
+            (normalized articles newest first, cursor update for ``commit_cursor``)
+        """
+        symbols = sorted(set(symbols), key=lambda symbol: self._company_polled.get(symbol, 0.0))
+        if not symbols:
+            return [], {}
+        started = time.monotonic()
+        today = datetime.now(timezone.utc).date()
+        cursors: Dict[str, int] = {}
+        
+        def fetch(symbol: str) -> List[Dict]:
+            cursor = self.company_cursors.get(symbol)
+            if cursor is None:
+                from_date = today - timedelta(days=lookback_days)
+            else:
+                from_date = datetime.fromtimestamp(cursor, timezone.utc).date()
+            
+            if not self._acquire_token(deadline, timeout=None):
+                return []  # Out of quota this cycle; stays first in line for the next
+            
+            articles = self._request_company_news(symbol, from_date.isoformat(), today.isoformat(), deadline)
+            if articles is None:
+                return []  # Failed; also stays first in line for the next cycle
+            self._company_polled[symbol] = time.monotonic()
+            if cursor is not None:
+                articles = [article for article in articles if article['datetime'] >= cursor]
+            if articles:
+                cursors[symbol] = max(cursor or 0, max(article['datetime'] for article in articles))
+            return articles
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(symbols)), thread_name_prefix='finnhub-company') as pool:
+            results = list(pool.map(fetch, symbols))
+        merged = merge_newest_first(results)
+        skipped = len(symbols) - sum(1 for symbol in symbols if self._company_polled.get(symbol, 0.0) >= started)
+        if skipped:
+            logger.info(f"⏳ FinHub: {skipped} symbols not polled (rate limit or errors), first in line next cycle")
+        logger.info(f"✅ Fetched {len(merged)} company articles for {len(symbols)} symbols from FinHub")
+        return merged, {'company_cursors': cursors} if cursors else {}
+    
+    def get_state(self) -> Dict:
+        """
+        Cursor state for checkpointing.
         
         Returns:
-            Normalized article dictionary
+            JSON-serializable minId per category and company-news cursor per symbol
         """
         return {
-            'id': article.get('id', 0),
-            'headline': article.get('headline', ''),
-            'summary': article.get('summary', ''),
-            'url': article.get('url', ''),
-            'image': article.get('image', ''),
-            'source': article.get('source', 'FinHub'),
-            'datetime': article.get('datetime', int(datetime.now().timestamp())),
-            'category': article.get('category', 'general'),
-            'related': article.get('related', ''),
-            'origin': 'finnhub'
+            'last_ids': dict(self.last_ids),
+            'company_cursors': dict(self.company_cursors)
         }
+    
+    def load_state(self, state: Dict):
+        """
+        Restore cursor state from a checkpoint (the newer cursor wins).
+        
+        Args:
+            state: Output of get_state()
+        """
+        self.commit_cursor(state)
+    
+    def commit_cursor(self, cursor: Dict):
+        """
+        Apply a cursor update returned by one of the ``fetch_*`` methods.
+        
+        Cursors only move forward, so an update older than the current
+        state (e.g. from a slower concurrent fetch) changes nothing.
+        
+        Args:
+            cursor: ``last_ids`` and/or ``company_cursors`` mappings, as in get_state()
+        """
+        for cursors, update in ((self.last_ids, cursor.get('last_ids', {})),
+                                (self.company_cursors, cursor.get('company_cursors', {}))):
+            for key, value in update.items():
+                if value is not None and value > cursors.get(key, 0):
+                    cursors[key] = value
+    
+    def _normalize_article(self, article: Dict) -> LazyArticle:
+        """
+        Normalize FinHub article to common format.
+        
+        Fields are converted on first read, so articles dropped by dedupe
+        never touch their summary or image.
+        
+        Args:
+            article: Raw article from FinHub API
+        
+        Returns:
+            Normalized article (dict-like; ``to_dict()`` for a plain dict)
+        """
+        return LazyArticle(article, FINNHUB_FIELDS)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,162 @@
+"""Shared keep-alive HTTP session for all upstream clients."""
+from contextlib import contextmanager
+import threading
+import time
+from typing import Iterator, Optional
+import logging
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import MaxRetryError, ResponseError
+from urllib3.util.retry import Retry
+from urllib3.util.timeout import Timeout
+
+from config import HTTP_BACKOFF_FACTOR, HTTP_MAX_RETRIES, HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE
+
+logger = logging.getLogger(__name__)
+
+# Responses worth retrying: rate limiting and transient upstream failures
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+# Deadline (time.monotonic()) of the request running on this thread, if any
+_deadline = threading.local()
+
+# Shortest timeout handed to a request that starts just before its deadline
+MIN_TIMEOUT_SECONDS = 0.01
+
+
+@contextmanager
+def deadline_scope(deadline: Optional[float]) -> Iterator[None]:
+    """
+    Bound requests made on this thread by a ``time.monotonic()`` deadline.
+    
+    Session retries (see ``DeadlineRetry``) are abandoned rather than
+    started or slept for past the deadline.
+    
+    Args:
+        deadline: Monotonic time by which requests must finish (None for no limit)
+    """
+    previous = getattr(_deadline, 'value', None)
+    _deadline.value = deadline
+    try:
+        yield
+    finally:
+        _deadline.value = previous
+
+
+class DeadlineTimeout(Timeout):
+    """
+    Timeout that shrinks to the time left before a deadline.
+    
+    urllib3 clones the request timeout for every attempt, so each retry
+    gets ``min(timeout, time left)`` rather than the full timeout again.
+    """
+    
+    def __init__(self, deadline: float, timeout: Optional[float] = None):
+        """
+        Initialize timeout.
+        
+        Args:
+            deadline: Monotonic time by which the request must finish
+            timeout: Per-attempt connect and read timeout (None for only the deadline)
+        """
+        super().__init__(connect=timeout, read=timeout)
+        self.deadline = deadline
+        self.timeout = timeout
+    
+    def clone(self) -> Timeout:
+        remaining = max(MIN_TIMEOUT_SECONDS, self.deadline - time.monotonic())
+        timeout = remaining if self.timeout is None else min(self.timeout, remaining)
+        return Timeout(connect=timeout, read=timeout, total=remaining)
+
+
+class DeadlineRetry(Retry):
+    """
+    Retry policy that gives up instead of waiting past the thread's deadline.
+    
+    A retry whose backoff (or Retry-After) would end after the deadline set
+    by ``deadline_scope`` is not attempted: the last response is returned
+    as usual for retryable statuses, and connection errors are raised.
+    """
+    
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None) -> Retry:
+        new_retry = super().increment(method, url, response, error, _pool, _stacktrace)
+        deadline = getattr(_deadline, 'value', None)
+        if deadline is None:
+            return new_retry
+        
+        wait = new_retry.get_backoff_time()
+        if response is not None and self.respect_retry_after_header:
+            wait = max(wait, new_retry.get_retry_after(response) or 0)
+        if time.monotonic() + wait >= deadline:
+            reason = error or ResponseError(f"deadline reached after {len(new_retry.history)} attempts")
+            raise MaxRetryError(_pool, url, reason) from reason
+        return new_retry
+
+
+def create_session(
+    pool_connections: int = HTTP_POOL_CONNECTIONS,
+    pool_maxsize: int = HTTP_POOL_MAXSIZE,
+    max_retries: int = HTTP_MAX_RETRIES,
+    backoff_factor: float = HTTP_BACKOFF_FACTOR
+) -> requests.Session:
+    """
+    Build a session with pooled keep-alive connections and retries.
+    
+    Only idempotent methods are retried (urllib3's default set), so a POST
+    to Pulse is never sent twice. After the last retry the final response
+    is returned as-is and callers keep handling status codes themselves.
+    Retries never wait past a deadline set with ``deadline_scope``.
+    
+    Args:
+        pool_connections: Number of per-host pools kept
+        pool_maxsize: Connections kept open per host
+        max_retries: Retries for connection errors and RETRY_STATUSES
+        backoff_factor: Exponential backoff base in seconds (honours Retry-After)
+    
+    Returns:
+        Configured requests session
+    """
+    retry = DeadlineRetry(
+        total=max_retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUSES,
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=retry
+    )
+    
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide shared session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session()
+                logger.debug(
+                    f"Created shared HTTP session (pools={HTTP_POOL_CONNECTIONS}, "
+                    f"per-host={HTTP_POOL_MAXSIZE}, retries={HTTP_MAX_RETRIES})"
+                )
+    return _session
+
+
+def close_session():
+    """Close the shared session's pooled connections."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
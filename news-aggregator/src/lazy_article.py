@@ -0,0 +1,94 @@
+"""Lazily normalized article view over a raw upstream payload."""
+from collections.abc import MutableMapping
+from typing import Any, Callable, Dict, Iterator
+
+# Normalized field name -> function extracting it from the raw article
+FieldMap = Dict[str, Callable[[Dict], Any]]
+
+_DELETED = object()
+
+
+class LazyArticle(MutableMapping):
+    """
+    Normalized article that converts fields on first read.
+    
+    Behaves like the normalized article dict, but keeps the raw payload and
+    runs a field's extractor only when a pipeline stage reads that field;
+    the result is cached. Articles rejected by dedupe only ever pay for the
+    fields dedupe reads (url, headline, datetime, source, related), never
+    for summary or image. Writes (e.g. ``iv_score``) are stored alongside.
+    
+    Pickles as a plain dict so articles can cross process boundaries.
+    """
+    
+    __slots__ = ('_raw', '_fields', '_values')
+    
+    def __init__(self, raw: Dict, fields: FieldMap):
+        """
+        Initialize article view.
+        
+        Args:
+            raw: Article as decoded from the upstream API
+            fields: Extractor per normalized field
+        """
+        self._raw = raw
+        self._fields = fields
+        self._values: Dict[str, Any] = {}
+    
+    def __getitem__(self, key: str) -> Any:
+        value = self._values.get(key, _DELETED)
+        if value is not _DELETED:
+            return value
+        if key in self._values or key not in self._fields:
+            raise KeyError(key)
+        value = self._fields[key](self._raw)
+        self._values[key] = value
+        return value
+    
+    def __setitem__(self, key: str, value: Any):
+        self._values[key] = value
+    
+    def __delitem__(self, key: str):
+        if key not in self:
+            raise KeyError(key)
+        if key in self._fields:
+            self._values[key] = _DELETED
+        else:
+            del self._values[key]
+    
+    def __contains__(self, key: object) -> bool:
+        if key in self._values:
+            return self._values[key] is not _DELETED
+        return key in self._fields
+    
+    def __iter__(self) -> Iterator[str]:
+        for key in self._fields:
+            if self._values.get(key) is not _DELETED:
+                yield key
+        for key in self._values:
+            if key not in self._fields:
+                yield key
+    
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+    
+    def __repr__(self) -> str:
+        return f"LazyArticle({self.to_dict()!r})"
+    
+    def __reduce__(self):
+        return dict, (self.to_dict(),)
+    
+    @property
+    def materialized(self) -> int:
+        """Number of fields converted or written so far."""
+        return len(self._values)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert every field and return a plain dict."""
+        return {key: self[key] for key in self}
+    
+    def copy(self) -> 'LazyArticle':
+        """Shallow copy sharing the raw payload and converted fields."""
+        article = LazyArticle(self._raw, self._fields)
+        article._values = dict(self._values)
+        return article
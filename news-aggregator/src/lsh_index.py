@@ -0,0 +1,221 @@
+"""MinHash/LSH candidate index for near-duplicate headline lookup."""
+from array import array
+import random
+import sys
+import zlib
+from typing import Dict, Hashable, List, Set, Union
+
+
+def shingle(text: str, size: int = 3) -> Set[str]:
+    """
+    Split text into overlapping character shingles.
+    
+    Args:
+        text: Normalized text to shingle
+        size: Shingle length in characters
+    
+    Returns:
+        Set of shingles (the whole text if shorter than one shingle)
+    """
+    if len(text) <= size:
+        return {text} if text else set()
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+class MinHashLSH:
+    """
+    Banded MinHash index returning likely near-duplicate headlines.
+    
+    Each headline is reduced to a MinHash signature of
+    ``num_bands * rows_per_band`` values. Two headlines become candidates
+    when any band of their signatures matches, which happens with
+    probability ``1 - (1 - J ** rows_per_band) ** num_bands`` for shingle
+    Jaccard similarity ``J``. The defaults favour recall: pairs that clear
+    the 0.85 same-source ``SequenceMatcher`` threshold in ``NewsDedupe`` are
+    practically always returned, while unrelated headlines are mostly
+    filtered out.
+    
+    Bands are stored as one CRC32-derived integer each in a single bucket dict;
+    buckets holding one key store it directly instead of in a set, so keys
+    must not themselves be sets.
+    """
+    
+    def __init__(self, num_bands: int = 32, rows_per_band: int = 2,
+                 shingle_size: int = 3, seed: int = 1):
+        """
+        Initialize LSH index.
+        
+        Args:
+            num_bands: Number of signature bands (more bands = higher recall)
+            rows_per_band: Signature rows per band (more rows = higher precision)
+            shingle_size: Character shingle length
+            seed: Seed for the hash permutations (keeps signatures stable)
+        """
+        self.num_bands = num_bands
+        self.rows_per_band = rows_per_band
+        self.shingle_size = shingle_size
+        self.seed = seed
+        
+        # XOR masks over CRC32 shingle hashes act as the permutation family;
+        # min(map(mask.__xor__, hashes)) runs entirely in C
+        rng = random.Random(seed)
+        self._masks: List[int] = [rng.getrandbits(32) for _ in range(num_bands * rows_per_band)]
+        self._buckets: Dict[int, Union[Hashable, Set[Hashable]]] = {}
+        self._band_keys: Dict[Hashable, array] = {}
+    
+    @property
+    def config_id(self) -> str:
+        """Identifier of the parameters that determine band keys."""
+        return f"xor-crc32:band-crc32:{self.num_bands}x{self.rows_per_band}:k{self.shingle_size}:s{self.seed}"
+    
+    def signature(self, text: str) -> List[int]:
+        """
+        Compute the MinHash signature of a normalized text.
+        
+        Args:
+            text: Normalized text
+        
+        Returns:
+            Signature values (empty for empty text)
+        """
+        hashes = [zlib.crc32(s.encode('utf-8')) for s in shingle(text, self.shingle_size)]
+        if not hashes:
+            return []
+        
+        return [min(map(mask.__xor__, hashes)) for mask in self._masks]
+    
+    def band_keys(self, text: str) -> array:
+        """
+        Hash a text's signature into one bucket key per band.
+        
+        Args:
+            text: Normalized text
+        
+        Returns:
+            Array of signed 64-bit bucket keys (empty for empty text)
+        """
+        sig = self.signature(text)
+        if not sig:
+            return array('q')
+        
+        # Keys are persisted by DedupeStore, so they must not depend on the
+        # interpreter's hash seed: CRC32 of the band's little-endian rows,
+        # with the band number in the high bits
+        packed = array('I', sig)
+        if sys.byteorder == 'big':
+            packed.byteswap()
+        packed = packed.tobytes()
+        width = self.rows_per_band * 4
+        crc32 = zlib.crc32
+        return array('q', (
+            (band << 32) | crc32(packed[band * width:(band + 1) * width])
+            for band in range(self.num_bands)
+        ))
+    
+    def add(self, key: Hashable, text: str):
+        """
+        Index a text under the given key.
+        
+        Args:
+            key: Caller-defined identifier returned by ``query``
+            text: Normalized text
+        """
+        self.add_band_keys(key, self.band_keys(text))
+    
+    def add_band_keys(self, key: Hashable, band_keys: array):
+        """
+        Index precomputed band keys (see ``band_keys``) under the given key.
+        
+        Args:
+            key: Caller-defined identifier returned by ``query``
+            band_keys: Bucket keys of the text
+        """
+        if not band_keys:
+            return
+        
+        self._band_keys[key] = band_keys
+        buckets = self._buckets
+        setdefault = buckets.setdefault
+        for band_key in band_keys:
+            bucket = setdefault(band_key, key)
+            if bucket is key or bucket == key:
+                continue
+            if isinstance(bucket, set):
+                bucket.add(key)
+            else:
+                buckets[band_key] = {bucket, key}
+    
+    def remove(self, key: Hashable):
+        """Remove a key from the index (no-op if it is not indexed)."""
+        band_keys = self._band_keys.pop(key, None)
+        if not band_keys:
+            return
+        
+        buckets = self._buckets
+        for band_key in band_keys:
+            bucket = buckets.get(band_key)
+            if bucket is None:
+                continue
+            if isinstance(bucket, set):
+                bucket.discard(key)
+                if len(bucket) == 1:
+                    buckets[band_key] = bucket.pop()
+                elif not bucket:
+                    del buckets[band_key]
+            elif bucket == key:
+                del buckets[band_key]
+    
+    def query(self, text: str) -> Set[Hashable]:
+        """
+        Return keys of indexed texts sharing at least one band with ``text``.
+        
+        Args:
+            text: Normalized text
+        
+        Returns:
+            Set of candidate keys
+        """
+        return self.query_band_keys(self.band_keys(text))
+    
+    def query_band_keys(self, band_keys: array) -> Set[Hashable]:
+        """
+        Return keys of indexed texts sharing at least one of ``band_keys``.
+        
+        Args:
+            band_keys: Bucket keys of the query text
+        
+        Returns:
+            Set of candidate keys
+        """
+        candidates: Set[Hashable] = set()
+        buckets = self._buckets
+        for band_key in band_keys:
+            bucket = buckets.get(band_key)
+            if bucket is None:
+                continue
+            if isinstance(bucket, set):
+                candidates.update(bucket)
+            else:
+                candidates.add(bucket)
+        return candidates
+    
+    def memory_bytes(self) -> int:
+        """Approximate resident size of the bucket table and stored band keys."""
+        size = sys.getsizeof(self._buckets) + sys.getsizeof(self._band_keys)
+        if self._band_keys:
+            # Every stored band key is also a bucket dict key (an int object)
+            per_key = sys.getsizeof(next(iter(self._band_keys.values())))
+            per_key += self.num_bands * sys.getsizeof(1 << 62)
+            size += len(self._band_keys) * per_key
+        return size
+    
+    def clear(self):
+        """Drop every indexed key."""
+        self._buckets.clear()
+        self._band_keys.clear()
+    
+    def __len__(self) -> int:
+        return len(self._band_keys)
+    
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._band_keys
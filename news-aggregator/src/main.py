@@ -11,11 +11,22 @@ sys.path.insert(0, str(Path(__file__).parent))
 from config import (
     ALPACA_API_KEY,
     ALPACA_API_SECRET,
+    ALPACA_CURSOR_PATH,
+    ALPACA_STREAM,
     FINNHUB_API_KEY,
+    FINNHUB_CATEGORIES,
+    FINNHUB_COMPANY_NEWS,
     GEMINI_API_KEY,
     SELECTED_INSTRUMENT,
     POLL_INTERVAL_SECONDS,
+    POLL_ADAPTIVE,
+    POLL_MIN_INTERVAL_SECONDS,
+    POLL_MAX_INTERVAL_SECONDS,
     DEDUPE_WINDOW_HOURS,
+    DEDUPE_STORE_PATH,
+    CHECKPOINT_PATH,
+    DEDUPE_URL_WINDOW_HOURS,
+    SOURCE_TIMEOUT_SECONDS,
     PULSE_ENDPOINT,
     TRACKED_SYMBOLS,
     validate_config
@@ -59,6 +70,30 @@ def parse_args():
         default=POLL_INTERVAL_SECONDS,
         help=f'Polling interval in seconds (default: {POLL_INTERVAL_SECONDS})'
     )
+    parser.add_argument(
+        '--adaptive',
+        action='store_true',
+        default=POLL_ADAPTIVE,
+        help='Adapt each source\'s polling interval to its article arrival rate'
+    )
+    parser.add_argument(
+        '--min-interval',
+        type=int,
+        default=POLL_MIN_INTERVAL_SECONDS,
+        help=f'Shortest adaptive interval in seconds (default: {POLL_MIN_INTERVAL_SECONDS})'
+    )
+    parser.add_argument(
+        '--max-interval',
+        type=int,
+        default=POLL_MAX_INTERVAL_SECONDS,
+        help=f'Longest adaptive interval in seconds (default: {POLL_MAX_INTERVAL_SECONDS})'
+    )
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        default=ALPACA_STREAM,
+        help='Also ingest Alpaca\'s real-time news WebSocket (polling fills gaps)'
+    )
     parser.add_argument(
         '--verbose', '-v',
         action='store_true',
@@ -102,7 +137,14 @@ async def main():
             gemini_key=GEMINI_API_KEY,
             pulse_endpoint=PULSE_ENDPOINT,
             dedupe_window_hours=DEDUPE_WINDOW_HOURS,
-            selected_instrument=SELECTED_INSTRUMENT
+            selected_instrument=SELECTED_INSTRUMENT,
+            dedupe_store_path=DEDUPE_STORE_PATH,
+            dedupe_url_window_hours=DEDUPE_URL_WINDOW_HOURS,
+            source_timeout_seconds=SOURCE_TIMEOUT_SECONDS,
+            alpaca_cursor_path=ALPACA_CURSOR_PATH,
+            finnhub_categories=FINNHUB_CATEGORIES,
+            finnhub_company_news=FINNHUB_COMPANY_NEWS,
+            checkpoint_path=CHECKPOINT_PATH
         )
         
         # Run based on mode
@@ -111,12 +153,18 @@ async def main():
             result = await aggregator.fetch_and_process(symbols=symbols)
             logger.info(f"✅ Test complete: {result}")
             aggregator.print_summary()
+            aggregator.deduper.close()
         else:
-            logger.info(f"🚀 Starting continuous mode (interval: {args.interval}s)")
+            modes = (', adaptive' if args.adaptive else '') + (', streaming' if args.stream else '')
+            logger.info(f"🚀 Starting continuous mode (interval: {args.interval}s{modes})")
             await aggregator.run_continuous(
                 interval_seconds=args.interval,
                 symbols=symbols,
-                max_duration=args.duration
+                max_duration=args.duration,
+                adaptive=args.adaptive,
+                min_interval_seconds=args.min_interval,
+                max_interval_seconds=args.max_interval,
+                stream=args.stream
             )
     
     except KeyboardInterrupt:
@@ -1,17 +1,30 @@
 """Main news aggregator orchestrating Alpaca and FinHub integration."""
 import asyncio
-from typing import List, Dict
+from typing import Any, Callable, List, Dict, Optional, Tuple
 import logging
+import time
 from datetime import datetime
 
 from alpaca_client import AlpacaNewsClient
-from finnhub_client import FinnHubNewsClient
+from article_merge import merge_sources, oriented
+from alpaca_stream import AlpacaNewsStream, websockets_available
+from finnhub_client import CATEGORIES, FinnHubNewsClient
 from deduplicator import NewsDedupe
 from delivery import NewsDelivery
 from enhanced_iv_scorer import EnhancedIVScorer
+from checkpoint import Checkpoint
+from config import ALPACA_STREAM_URL, FINNHUB_CALLS_PER_MINUTE
+from http_pool import close_session
+from resilience import upstream_stats
+from scheduler import PollScheduler
+from scoring_pool import ScoringPool
 
 logger = logging.getLogger(__name__)
 
+# Share of source_timeout_seconds a client's own requests and waits may use;
+# the rest covers parsing and handing results back from the worker thread
+CLIENT_DEADLINE_FRACTION = 0.9
+
 
 class NewsAggregator:
     """Main orchestrator for hybrid news aggregation."""
@@ -24,7 +37,15 @@ class NewsAggregator:
         gemini_key: str = None,
         pulse_endpoint: str = None,
         dedupe_window_hours: int = 24,
-        selected_instrument: str = "/MES"
+        selected_instrument: str = "/MES",
+        dedupe_store_path: str = None,
+        dedupe_url_window_hours: int = None,
+        source_timeout_seconds: float = 25.0,
+        alpaca_cursor_path: str = None,
+        finnhub_categories: List[str] = None,
+        finnhub_company_news: bool = True,
+        checkpoint_path: str = None,
+        alpaca_stream_url: str = None
     ):
         """
         Initialize news aggregator.
@@ -37,27 +58,255 @@ class NewsAggregator:
             pulse_endpoint: Pulse API endpoint
             dedupe_window_hours: Deduplication window in hours
             selected_instrument: Trading instrument for IV scoring (/MES, /MNQ, /MGC, /SIL)
+            dedupe_store_path: SQLite file persisting the dedupe cache across restarts
+            dedupe_url_window_hours: How long URLs alone are remembered (Bloom filter)
+            source_timeout_seconds: Per-source fetch deadline; a source that
+                misses it contributes no articles to the cycle
+            alpaca_cursor_path: JSON file persisting Alpaca's high-water mark so
+                restarts resume where the last fetch stopped
+            finnhub_categories: FinHub news categories fetched each cycle
+                (default: general, forex, crypto and merger)
+            finnhub_company_news: Also fetch per-symbol FinHub company news
+                for the tracked symbols each cycle
+            checkpoint_path: JSON file checkpointing source cursors and
+                counters after each delivered cycle; restored on startup
+            alpaca_stream_url: Alpaca news WebSocket used by run_stream
+                (default: ALPACA_STREAM_URL)
         """
-        self.alpaca = AlpacaNewsClient(alpaca_key, alpaca_secret)
+        self.alpaca = AlpacaNewsClient(alpaca_key, alpaca_secret, cursor_path=alpaca_cursor_path)
         self.finnhub = FinnHubNewsClient(finnhub_key) if finnhub_key else None
-        self.deduper = NewsDedupe(window_hours=dedupe_window_hours)
+        self.deduper = NewsDedupe(
+            window_hours=dedupe_window_hours,
+            store_path=dedupe_store_path,
+            url_window_hours=dedupe_url_window_hours
+        )
         self.delivery = NewsDelivery(pulse_endpoint) if pulse_endpoint else NewsDelivery()
         self.iv_scorer = EnhancedIVScorer(gemini_key) if gemini_key else None
+        self.scoring_pool = ScoringPool()
         self.selected_instrument = selected_instrument
+        self.source_timeout_seconds = source_timeout_seconds
+        self.finnhub_categories = list(finnhub_categories or CATEGORIES)
+        self.finnhub_company_news = finnhub_company_news
+        self.scheduler: Optional[PollScheduler] = None
+        self.alpaca_stream_url = alpaca_stream_url or ALPACA_STREAM_URL
+        self.stream: Optional[AlpacaNewsStream] = None
+        # Set to cut a polling sleep short (e.g. after a stream reconnect)
+        self._wake = asyncio.Event()
         
         self.stats = {
             'total_runs': 0,
             'total_articles_fetched': 0,
             'total_unique_articles': 0,
-            'total_delivered': 0
+            'total_delivered': 0,
+            'source_timeouts': 0,
+            'source_errors': 0,
+            'streamed_articles': 0
+        }
+        
+        self.checkpoint = Checkpoint(checkpoint_path) if checkpoint_path else None
+        if self.checkpoint:
+            state = self.checkpoint.load()
+            if state:
+                self.load_state(state)
+                logger.info(f"♻️  Restored checkpoint from {checkpoint_path} (run {self.stats['total_runs']})")
+    
+    def get_state(self) -> Dict:
+        """
+        Restartable state: source cursors and run counters.
+        
+        Returns:
+            JSON-serializable state for Checkpoint.save()
+        """
+        state = {
+            'stats': dict(self.stats),
+            'alpaca': self.alpaca.get_state()
         }
+        if self.finnhub:
+            state['finnhub'] = self.finnhub.get_state()
+        return state
+    
+    def load_state(self, state: Dict):
+        """
+        Restore cursors and counters saved by get_state().
+        
+        Args:
+            state: Saved state
+        """
+        for key, value in state.get('stats', {}).items():
+            if key in self.stats:
+                self.stats[key] = value
+        if state.get('alpaca'):
+            self.alpaca.load_state(state['alpaca'])
+        if self.finnhub and state.get('finnhub'):
+            self.finnhub.load_state(state['finnhub'])
+    
+    def save_checkpoint(self) -> bool:
+        """Checkpoint the current state, if a checkpoint file is configured."""
+        return self.checkpoint.save(self.get_state()) if self.checkpoint else False
+    
+    async def _fetch_source(self, name: str, fetch: Callable[..., Tuple[List[Dict], Any]],
+                            **kwargs) -> Tuple[List[Dict], Any]:
+        """
+        Run a blocking source client in a worker thread with a deadline.
+        
+        The event loop stays free while the request is in flight, and a
+        slow or failing source yields an empty list instead of holding up
+        the cycle. The client gets a ``deadline`` inside the timeout so its
+        HTTP timeouts, retries and rate-limit waits end on their own, and
+        its cursor update comes back only with articles the cycle uses: a
+        fetch abandoned at the timeout leaves the cursor where it was.
+        
+        Args:
+            name: Source name for logging
+            fetch: Client ``fetch_*`` method returning (articles, cursor update)
+            **kwargs: Arguments for the client method
+        
+        Returns:
+            (normalized articles, cursor update), or ([], None) on timeout/error
+        """
+        started = time.perf_counter()
+        deadline = time.monotonic() + self.source_timeout_seconds * CLIENT_DEADLINE_FRACTION
+        try:
+            articles, cursor = await asyncio.wait_for(
+                asyncio.to_thread(fetch, deadline=deadline, **kwargs),
+                timeout=self.source_timeout_seconds
+            )
+        except asyncio.TimeoutError:
+            self.stats['source_timeouts'] += 1
+            logger.warning(f"⏱️  {name} fetch exceeded {self.source_timeout_seconds}s, skipping this cycle")
+            return [], None
+        except Exception as e:
+            self.stats['source_errors'] += 1
+            logger.error(f"❌ Error fetching {name} news: {e}")
+            return [], None
+        
+        logger.debug(f"{name} fetch took {(time.perf_counter() - started) * 1000:.0f}ms")
+        return articles, cursor
+    
+    def source_names(self, symbols: List[str] = None) -> List[str]:
+        """
+        Names of the sources a cycle fetches.
+        
+        Args:
+            symbols: List of symbols to track (None for all)
+        
+        Returns:
+            Source names, as keys of fetch_all_sources' result
+        """
+        names = ['alpaca']
+        if self.finnhub:
+            names.append('finnhub')
+            if self.finnhub_company_news and symbols:
+                names.append('finnhub_company')
+        return names
+    
+    async def fetch_all_sources(self, symbols: List[str] = None,
+                                sources: List[str] = None) -> Tuple[Dict[str, List[Dict]], Dict[str, Any]]:
+        """
+        Fetch every configured source concurrently.
+        
+        Cursors are not moved; pass the returned updates to
+        ``commit_cursors`` once the articles have been used.
+        
+        Args:
+            symbols: List of symbols to track (None for all)
+            sources: Only fetch these sources (None for all configured)
+        
+        Returns:
+            (articles per source name, cursor update per source name)
+        """
+        names = [name for name in self.source_names(symbols) if sources is None or name in sources]
+        fetches = {}
+        if 'alpaca' in names:
+            fetches['alpaca'] = self._fetch_source(
+                'Alpaca', self.alpaca.fetch_news, symbols=symbols, hours_back=1, limit=50
+            )
+        if 'finnhub' in names:
+            fetches['finnhub'] = self._fetch_source(
+                'FinHub', self.finnhub.fetch_all_news, categories=self.finnhub_categories
+            )
+        if 'finnhub_company' in names:
+            # Symbols cut off by the deadline go first next cycle
+            fetches['finnhub_company'] = self._fetch_source(
+                'FinHub company', self.finnhub.fetch_company_news_bulk, symbols=symbols
+            )
+        
+        results = dict(zip(fetches, await asyncio.gather(*fetches.values())))
+        articles = {name: fetched for name, (fetched, _) in results.items()}
+        cursors = {name: cursor for name, (_, cursor) in results.items() if cursor}
+        return articles, cursors
+    
+    def commit_cursors(self, cursors: Dict[str, Any]):
+        """
+        Apply cursor updates returned by fetch_all_sources to their clients.
+        
+        Args:
+            cursors: Cursor update per source name
+        """
+        for name, cursor in cursors.items():
+            client = self.alpaca if name == 'alpaca' else self.finnhub
+            client.commit_cursor(cursor)
+    
+    async def process_articles(self, articles: List[Dict], symbols: List[str] = None) -> Tuple[List[Dict], Dict]:
+        """
+        Deduplicate, IV-score and deliver a batch of articles.
+        
+        Shared by polling cycles and the real-time stream. With IV scoring
+        on, each priority class (macro, tracked symbols, the rest) is sent
+        to Pulse as soon as it is scored, while later classes are still
+        being scored. Unique articles that fail to deliver are forgotten by
+        dedupe, so they are delivered when fetched again.
+        
+        Args:
+            articles: Normalized articles from any source
+            symbols: Tracked symbols, whose articles are scored and delivered first
+        
+        Returns:
+            (unique articles, delivery result summed over every send)
+        """
+        # Deduplicate
+        unique_articles = self.deduper.process(articles)
+        self.stats['total_unique_articles'] += len(unique_articles)
+        
+        if not (self.iv_scorer and unique_articles):
+            return unique_articles, await self._deliver(unique_articles)
+        
+        # Concurrent scoring batches; each class is delivered once scored
+        delivery_result = {'sent': 0, 'success': True}
+        async for scored in self.scoring_pool.score_by_priority(
+            self.iv_scorer, unique_articles, self.selected_instrument, symbols
+        ):
+            result = await self._deliver(scored)
+            delivery_result['sent'] += result.get('sent', 0)
+            if not result.get('success'):
+                delivery_result.update(success=False, error=result.get('error'))
+        return unique_articles, delivery_result
     
-    async def fetch_and_process(self, symbols: List[str] = None) ->Dict:
+    async def _deliver(self, articles: List[Dict]) -> Dict:
+        """
+        Send articles to Pulse newest first, forgetting them in dedupe on failure.
+        
+        Args:
+            articles: Unique articles
+        
+        Returns:
+            Delivery result
+        """
+        delivery_result = await self.delivery.send_to_pulse(oriented(articles, newest_first=True))
+        if delivery_result.get('success'):
+            self.stats['total_delivered'] += delivery_result.get('sent', 0)
+        elif articles:
+            # Not delivered: let the refetch (cursors were not moved) through dedupe
+            self.deduper.forget(articles)
+        return delivery_result
+    
+    async def fetch_and_process(self, symbols: List[str] = None, sources: List[str] = None) ->Dict:
         """
         Fetch news from both sources, deduplicate, and deliver.
         
         Args:
             symbols: List of symbols to track (None for all)
+            sources: Only fetch these sources (None for all configured)
         
         Returns:
             Summary of the operation
@@ -65,98 +314,218 @@ class NewsAggregator:
         logger.info(f"🔄 Starting news aggregation cycle {self.stats['total_runs'] + 1}")
         
         try:
-            # Fetch from both sources
-            alpaca_news = self.alpaca.get_news(symbols=symbols, hours_back=1, limit=50)
-            finnhub_news = self.finnhub.get_news(category='general') if self.finnhub else []
+            # Fetch from both sources concurrently; cycle latency is the slowest source
+            fetched, cursors = await self.fetch_all_sources(symbols=symbols, sources=sources)
+            alpaca_news = fetched.get('alpaca', [])
+            finnhub_news = fetched.get('finnhub', []) + fetched.get('finnhub_company', [])
             
-            # Combine all articles
-            all_articles = alpaca_news + finnhub_news
+            # K-way merge of the per-source streams, each already in time order.
+            # Oldest first, so dedupe appends to its time-ordered cache instead of
+            # inserting each article at the front; _deliver sends newest first.
+            all_articles = merge_sources(
+                [alpaca_news, fetched.get('finnhub', []), fetched.get('finnhub_company', [])],
+                newest_first=False
+            )
             self.stats['total_articles_fetched'] += len(all_articles)
             
             logger.info(f"📥 Fetched {len(alpaca_news)} from Alpaca, {len(finnhub_news)} from FinHub")
             
             if not all_articles:
                 logger.info("📭 No new articles to process")
-                return {'success': True, 'unique': 0, 'delivered': 0}
+                self.commit_cursors(cursors)
+                self.save_checkpoint()
+                return {'success': True, 'unique': 0, 'delivered': 0, 'new_by_source': dict.fromkeys(fetched, 0)}
             
-            # Deduplicate
-            unique_articles = self.deduper.process(all_articles)
-            self.stats['total_unique_articles'] += len(unique_articles)
+            unique_articles, delivery_result = await self.process_articles(all_articles, symbols)
             
-            # Calculate IV scores for each article
-            if self.iv_scorer:
-                for article in unique_articles:
-                    try:
-                        iv_score = self.iv_scorer.calculate_iv_score(
-                            article.get('headline', ''),
-                            instrument=self.selected_instrument
-                        )
-                        article['iv_score'] = iv_score
-                        logger.debug(f"IV Score for '{article['headline'][:50]}...': {iv_score['value']}pts ({iv_score['type']})")
-                    except Exception as e:
-                        logger.warning(f"IV scoring failed for article: {e}")
-                        # Fallback to neutral IV
-                        article['iv_score'] = {
-                            'type': 'neutral',
-                            'value': 2.0,
-                            'confidence': 0.0,
-                            'reasoning': 'Fallback - scoring unavailable'
-                        }
-            
-            # Sort by timestamp (newest first)
-            sorted_articles = sorted(
-                unique_articles,
-                key=lambda x: x['datetime'],
-                reverse=True
-            )
-            
-            # Deliver to Pulse
-            delivery_result = await self.delivery.send_to_pulse(sorted_articles)
+            # Attribute unique articles back to their source (drives adaptive polling)
+            unique_ids = {id(article) for article in unique_articles}
+            new_by_source = {
+                name: sum(1 for article in articles if id(article) in unique_ids)
+                for name, articles in fetched.items()
+            }
+            result = {
+                'success': True,
+                'fetched': len(all_articles),
+                'unique': len(unique_articles),
+                'delivered': delivery_result.get('sent', 0),
+                'alpaca_count': len(alpaca_news),
+                'finnhub_count': len(finnhub_news),
+                'new_by_source': new_by_source
+            }
             
-            if delivery_result.get('success'):
-                self.stats['total_delivered'] += delivery_result.get('sent', 0)
+            if not delivery_result.get('success'):
+                # Not a completed run: cursors stay put so the next cycle refetches
+                logger.warning(f"⚠️  Delivery failed, cursors held back: {delivery_result.get('error')}")
+                result['success'] = False
+                result['error'] = delivery_result.get('error', 'Delivery failed')
+                return result
             
+            # Cursors only move, in memory or on disk, once their articles reached Pulse
             self.stats['total_runs'] += 1
+            self.commit_cursors(cursors)
+            self.save_checkpoint()
             
             # Log summary
             logger.info(f"✅ Cycle complete: {len(unique_articles)} unique articles")
             logger.info(f"📊 Dedup stats: {self.deduper.get_stats()}")
             
-            return {
-                'success': True,
-                'fetched': len(all_articles),
-                'unique': len(unique_articles),
-                'delivered': delivery_result.get('sent', 0),
-                'alpaca_count': len(alpaca_news),
-                'finnhub_count': len(finnhub_news)
-            }
-            
+            return result
+        
         except Exception as e:
             logger.error(f"❌ Error in aggregation cycle: {e}", exc_info=True)
             return {'success': False, 'error': str(e)}
     
+    def create_scheduler(
+        self,
+        symbols: List[str] = None,
+        min_interval_seconds: float = 15,
+        max_interval_seconds: float = 300,
+        initial_interval_seconds: float = 60
+    ) -> PollScheduler:
+        """
+        Build an adaptive scheduler for this aggregator's sources.
+        
+        FinHub's per-minute quota is split between category news and the
+        company-news fan-out, so neither is polled faster than its share
+        of the quota sustains.
+        
+        Args:
+            symbols: Symbols to track (sizes the company-news fan-out)
+            min_interval_seconds: Shortest per-source interval
+            max_interval_seconds: Longest per-source interval
+            initial_interval_seconds: Interval before any rate is known
+        
+        Returns:
+            Scheduler with every configured source due now
+        """
+        scheduler = PollScheduler()
+        names = self.source_names(symbols)
+        finnhub_quota = FINNHUB_CALLS_PER_MINUTE / max(1, sum(name.startswith('finnhub') for name in names))
+        calls = {
+            'alpaca': (1, None),
+            'finnhub': (len(self.finnhub_categories), finnhub_quota),
+            'finnhub_company': (len(symbols or []), finnhub_quota),
+        }
+        for name in names:
+            calls_per_poll, calls_per_minute = calls[name]
+            scheduler.add_source(
+                name, min_interval_seconds, max_interval_seconds, initial=initial_interval_seconds,
+                calls_per_poll=calls_per_poll, calls_per_minute=calls_per_minute
+            )
+        return scheduler
+    
+    def request_poll(self, source: str):
+        """
+        Poll a source as soon as possible instead of at its next interval.
+        
+        Args:
+            source: Source name (see source_names)
+        """
+        if self.scheduler:
+            self.scheduler.mark_due(source)
+        self._wake.set()
+    
+    async def _sleep(self, seconds: float):
+        """Sleep until the next poll, waking early on request_poll()."""
+        self._wake.clear()
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+    
+    async def run_stream(self, symbols: List[str] = None):
+        """
+        Push Alpaca's real-time news through dedupe, scoring and delivery.
+        
+        Runs until cancelled or ``self.stream.stop()``. Articles that arrive
+        while a batch is being processed are coalesced into the next batch.
+        After a reconnect, Alpaca is polled over REST to fill the gap; the
+        stream never moves the REST high-water mark, so that poll covers
+        everything published while the socket was down.
+        
+        Args:
+            symbols: Symbols to subscribe to (None for all news)
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        self.stream = AlpacaNewsStream(
+            self.alpaca.api_key, self.alpaca.api_secret, url=self.alpaca_stream_url, symbols=symbols
+        )
+        consumer = asyncio.create_task(self._consume_stream(queue, symbols))
+        try:
+            await self.stream.run(queue.put, on_reconnect=lambda: self.request_poll('alpaca'))
+        finally:
+            consumer.cancel()
+            await self.stream.stop()
+    
+    async def _consume_stream(self, queue: asyncio.Queue, symbols: List[str] = None):
+        while True:
+            batch = list(await queue.get())
+            while not queue.empty():
+                batch.extend(queue.get_nowait())
+            
+            self.stats['streamed_articles'] += len(batch)
+            self.stats['total_articles_fetched'] += len(batch)
+            try:
+                unique_articles, delivery_result = await self.process_articles(batch, symbols)
+            except Exception as e:
+                logger.error(f"❌ Error processing streamed articles: {e}", exc_info=True)
+                continue
+            if delivery_result.get('success'):
+                self.save_checkpoint()
+            logger.info(f"⚡ Streamed {len(unique_articles)} new of {len(batch)} articles")
+    
     async def run_continuous(
         self,
         interval_seconds: int = 60,
         symbols: List[str] = None,
-        max_duration: int = None
+        max_duration: int = None,
+        adaptive: bool = False,
+        min_interval_seconds: float = 15,
+        max_interval_seconds: float = 300,
+        stream: bool = False
     ):
         """
         Run continuous news aggregation.
         
         Args:
-            interval_seconds: Polling interval in seconds
+            interval_seconds: Polling interval in seconds (starting interval when adaptive)
             symbols: Symbols to track
             max_duration: Maximum duration in seconds (None for infinite)
+            adaptive: Poll each source on its own interval, adapted to its
+                arrival rate, instead of all sources every interval_seconds
+            min_interval_seconds: Shortest per-source interval when adaptive
+            max_interval_seconds: Longest per-source interval when adaptive
+            stream: Also ingest Alpaca's real-time news WebSocket; polling
+                keeps running as a gap-filler
         """
-        logger.info(f"🚀 Starting continuous aggregation (interval: {interval_seconds}s)")
+        if adaptive:
+            self.scheduler = self.create_scheduler(
+                symbols, min_interval_seconds, max_interval_seconds, initial_interval_seconds=interval_seconds
+            )
+            logger.info(
+                f"🚀 Starting adaptive aggregation "
+                f"(interval: {min_interval_seconds}-{max_interval_seconds}s per source)"
+            )
+        else:
+            logger.info(f"🚀 Starting continuous aggregation (interval: {interval_seconds}s)")
+        
+        if stream and not websockets_available():
+            logger.warning("⚠️  Streaming needs the websockets package (pip install websockets); polling only")
+            stream = False
         
         start_time = datetime.now()
+        stream_task = asyncio.create_task(self.run_stream(symbols)) if stream else None
         
         try:
             while True:
-                # Fetch and process
-                result = await self.fetch_and_process(symbols=symbols)
+                # Fetch and process (only the sources that are due when adaptive)
+                due = self.scheduler.due() if self.scheduler else None
+                if due == []:
+                    # Woke marginally before the next due time
+                    await self._sleep(self.scheduler.seconds_until_next())
+                    continue
+                result = await self.fetch_and_process(symbols=symbols, sources=due)
                 
                 # Check if we should stop
                 if max_duration:
@@ -166,15 +535,28 @@ class NewsAggregator:
                         break
                 
                 # Wait for next cycle
-                logger.info(f"⏸️  Sleeping for {interval_seconds}s...")
-                await asyncio.sleep(interval_seconds)
+                sleep_seconds = interval_seconds
+                if self.scheduler:
+                    new_by_source = result.get('new_by_source', {})
+                    for name in due:
+                        self.scheduler.record(name, new_by_source.get(name, 0))
+                    sleep_seconds = self.scheduler.seconds_until_next()
+                    logger.debug(f"Polling intervals: {self.scheduler.get_stats()}")
                 
+                logger.info(f"⏸️  Sleeping for {sleep_seconds:.0f}s...")
+                await self._sleep(sleep_seconds)
+        
         except KeyboardInterrupt:
             logger.info("⏹️  Stopped by user")
         except Exception as e:
             logger.error(f"❌ Fatal error: {e}", exc_info=True)
         finally:
+            if stream_task:
+                stream_task.cancel()
+                await asyncio.gather(stream_task, return_exceptions=True)
             self.print_summary()
+            self.deduper.close()
+            close_session()
     
     def print_summary(self):
         """Print aggregation summary."""
@@ -185,6 +567,15 @@ class NewsAggregator:
         logger.info(f"Total articles fetched: {self.stats['total_articles_fetched']}")
         logger.info(f"Total unique articles: {self.stats['total_unique_articles']}")
         logger.info(f"Total delivered: {self.stats['total_delivered']}")
+        logger.info(f"Source timeouts/errors: {self.stats['source_timeouts']}/{self.stats['source_errors']}")
+        if self.scheduler:
+            logger.info(f"Polling intervals: {self.scheduler.get_stats()}")
+        if self.stream:
+            logger.info(f"Streamed articles: {self.stats['streamed_articles']} ({self.stream.get_stats()})")
+        logger.info(f"Upstream stats: {upstream_stats()}")
+        if self.iv_scorer:
+            logger.info(f"Gemini analyses (cache, batches): {self.iv_scorer.get_cache_stats()}")
+            logger.info(f"IV scoring pool: {self.scoring_pool.get_stats()}")
         logger.info(f"Deduplication stats: {self.deduper.get_stats()}")
         logger.info(f"Delivery stats: {self.delivery.get_stats()}")
         logger.info("=" * 60)
@@ -0,0 +1,94 @@
+"""Thread-safe token bucket for upstream API quotas."""
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter.
+    
+    Tokens refill continuously at ``rate`` per second up to ``capacity``;
+    each call spends one. A full bucket allows a burst of ``capacity``
+    calls, after which callers are paced at the refill rate. Safe to share
+    between worker threads.
+    """
+    
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Initialize token bucket.
+        
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst size (default: one second of tokens, at least 1)
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.waited_seconds = 0.0
+    
+    @classmethod
+    def per_minute(cls, calls: int, burst: Optional[int] = None) -> 'TokenBucket':
+        """
+        Build a bucket from a calls-per-minute quota.
+        
+        Args:
+            calls: Calls allowed per minute
+            burst: Calls allowed back-to-back (default: the whole minute's quota)
+        
+        Returns:
+            Configured token bucket
+        """
+        return cls(calls / 60.0, burst if burst is not None else calls)
+    
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    def try_acquire(self, tokens: float = 1) -> bool:
+        """Take tokens if available right now, without waiting."""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+    
+    def acquire(self, tokens: float = 1, timeout: Optional[float] = None) -> bool:
+        """
+        Take tokens, sleeping until they are available.
+        
+        Args:
+            tokens: Tokens to take
+            timeout: Give up after this many seconds (None waits indefinitely)
+        
+        Returns:
+            True if the tokens were taken, False on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return True
+                wait = (tokens - self._tokens) / self.rate
+            
+            if deadline is not None:
+                remaining = deadline - now
+                if remaining < wait:
+                    return False
+            time.sleep(wait)
+            self.waited_seconds += wait
+    
+    @property
+    def available(self) -> float:
+        """Tokens that could be taken right now."""
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
@@ -0,0 +1,320 @@
+"""Circuit breakers and hedged requests for upstream HTTP calls."""
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from typing import Any, Callable, Dict, Optional
+import logging
+import threading
+import time
+
+import requests
+
+from config import (
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_RESET_SECONDS,
+    HEDGE_MIN_SAMPLES,
+    HEDGE_QUANTILE,
+    HEDGE_REQUESTS,
+)
+from http_pool import DeadlineTimeout, deadline_scope
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Raised instead of calling an upstream whose breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Per-upstream circuit breaker.
+    
+    After ``failure_threshold`` consecutive failures the breaker opens and
+    calls fail instantly with CircuitOpenError. After ``reset_timeout``
+    seconds it half-opens and lets ``half_open_max_calls`` probe requests
+    through: a success closes it, a failure opens it again. Thread-safe.
+    """
+    
+    def __init__(self, name: str, failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+                 reset_timeout: float = BREAKER_RESET_SECONDS, half_open_max_calls: int = 1,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize circuit breaker.
+        
+        Args:
+            name: Upstream name (for logs and stats)
+            failure_threshold: Consecutive failures that open the breaker
+            reset_timeout: Seconds open before probing again
+            half_open_max_calls: Probe requests allowed at once while half-open
+            clock: Monotonic time source
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.clock = clock
+        
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self._probes_in_flight = 0
+        self._lock = threading.Lock()
+        
+        self.stats = {
+            'trips': 0,
+            'rejected': 0,
+            'successes': 0,
+            'failures': 0
+        }
+    
+    def before_call(self):
+        """
+        Admit a call or reject it.
+        
+        Raises:
+            CircuitOpenError: If the breaker is open (or half-open with
+                its probe budget in use)
+        """
+        with self._lock:
+            if self.state == OPEN and self.clock() - self.opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                self._probes_in_flight = 0
+                logger.info(f"🔌 {self.name} circuit half-open, probing")
+            
+            if self.state == CLOSED:
+                return
+            if self.state == HALF_OPEN and self._probes_in_flight < self.half_open_max_calls:
+                self._probes_in_flight += 1
+                return
+            
+            self.stats['rejected'] += 1
+            retry_in = max(0.0, self.reset_timeout - (self.clock() - self.opened_at))
+            raise CircuitOpenError(f"{self.name} circuit open, skipping call (retry in {retry_in:.0f}s)")
+    
+    def record_success(self):
+        """Record a successful call; closes a half-open breaker."""
+        with self._lock:
+            self.stats['successes'] += 1
+            self.consecutive_failures = 0
+            if self.state != CLOSED:
+                logger.info(f"✅ {self.name} circuit closed")
+            self.state = CLOSED
+            self._probes_in_flight = 0
+    
+    def record_failure(self):
+        """Record a failed call; may open the breaker."""
+        with self._lock:
+            self.stats['failures'] += 1
+            self.consecutive_failures += 1
+            if self.state == HALF_OPEN or (
+                self.state == CLOSED and self.consecutive_failures >= self.failure_threshold
+            ):
+                self.state = OPEN
+                self.opened_at = self.clock()
+                self._probes_in_flight = 0
+                self.stats['trips'] += 1
+                logger.warning(
+                    f"⚡ {self.name} circuit opened after {self.consecutive_failures} failures "
+                    f"(skipping for {self.reset_timeout:.0f}s)"
+                )
+    
+    def get_stats(self) -> Dict:
+        """Current state plus counters."""
+        with self._lock:
+            return {'state': self.state, 'consecutive_failures': self.consecutive_failures, **self.stats}
+
+
+class Hedger:
+    """
+    Hedged requests: send a duplicate once the first is slower than usual.
+    
+    The hedge delay is the ``quantile`` of recent successful latencies, so
+    only the slowest few percent of calls are duplicated and the duplicate
+    cuts their tail. Whichever attempt succeeds first wins; the other is
+    left to finish in the background. Only use it for idempotent calls.
+    """
+    
+    def __init__(self, name: str, quantile: float = HEDGE_QUANTILE, min_samples: int = HEDGE_MIN_SAMPLES,
+                 min_delay: float = 0.05, window: int = 200, max_workers: int = 8):
+        """
+        Initialize hedger.
+        
+        Args:
+            name: Upstream name (for stats and thread names)
+            quantile: Latency quantile after which a duplicate is sent
+            min_samples: Latencies needed before hedging starts
+            min_delay: Never hedge sooner than this many seconds
+            window: Recent latencies kept
+            max_workers: Threads running attempts
+        """
+        self.name = name
+        self.quantile = quantile
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self._latencies = deque(maxlen=window)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f'hedge-{name}')
+        self._lock = threading.Lock()
+        
+        self.stats = {
+            'calls': 0,
+            'hedged': 0,
+            'hedge_wins': 0
+        }
+    
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds to wait before hedging (None until enough samples)."""
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            ordered = sorted(self._latencies)
+        return max(self.min_delay, ordered[min(len(ordered) - 1, int(self.quantile * len(ordered)))])
+    
+    def _record(self, started: float):
+        with self._lock:
+            self._latencies.append(time.perf_counter() - started)
+    
+    def call(self, fn: Callable[..., Any], *args, can_hedge: Optional[Callable[[], bool]] = None, **kwargs) -> Any:
+        """
+        Call ``fn``, hedging with a duplicate call if it runs long.
+        
+        Args:
+            fn: Idempotent callable
+            *args: Positional arguments for fn
+            can_hedge: Checked before sending a duplicate (e.g. to spend a
+                rate-limit token); False skips the hedge
+            **kwargs: Keyword arguments for fn
+        
+        Returns:
+            The first successful result
+        
+        Raises:
+            Exception: The first attempt's error if every attempt fails
+        """
+        self.stats['calls'] += 1
+        started = time.perf_counter()
+        delay = self.hedge_delay()
+        if delay is None:
+            result = fn(*args, **kwargs)
+            self._record(started)
+            return result
+        
+        primary = self._executor.submit(fn, *args, **kwargs)
+        done, _ = wait([primary], timeout=delay)
+        if done or (can_hedge is not None and not can_hedge()):
+            result = primary.result()
+            self._record(started)
+            return result
+        
+        self.stats['hedged'] += 1
+        hedge = self._executor.submit(fn, *args, **kwargs)
+        first_error = None
+        for future in as_completed([primary, hedge]):
+            try:
+                result = future.result()
+            except Exception as e:
+                first_error = first_error or e
+                continue
+            if future is hedge:
+                self.stats['hedge_wins'] += 1
+            self._record(started)
+            return result
+        raise first_error
+    
+    def get_stats(self) -> Dict:
+        """Counters plus the current hedge delay."""
+        delay = self.hedge_delay()
+        return {**self.stats, 'hedge_delay_ms': round(delay * 1000, 1) if delay is not None else None}
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_hedgers: Dict[str, Hedger] = {}
+_registry_lock = threading.Lock()
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """Return the process-wide breaker for an upstream, creating it on first use."""
+    with _registry_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name)
+        return _breakers[name]
+
+
+def get_hedger(name: str) -> Optional[Hedger]:
+    """Return the process-wide hedger for an upstream (None if HEDGE_REQUESTS is off)."""
+    if not HEDGE_REQUESTS:
+        return None
+    with _registry_lock:
+        if name not in _hedgers:
+            _hedgers[name] = Hedger(name)
+        return _hedgers[name]
+
+
+def upstream_stats() -> Dict[str, Dict]:
+    """Breaker (and hedging, if enabled) stats per upstream."""
+    with _registry_lock:
+        breakers = dict(_breakers)
+        hedgers = dict(_hedgers)
+    stats = {name: {'circuit': breaker.get_stats()} for name, breaker in breakers.items()}
+    for name, hedger in hedgers.items():
+        stats.setdefault(name, {})['hedging'] = hedger.get_stats()
+    return stats
+
+
+def guarded_get(session: requests.Session, url: str, breaker: CircuitBreaker,
+                hedger: Optional[Hedger] = None, can_hedge: Optional[Callable[[], bool]] = None,
+                deadline: Optional[float] = None, **kwargs) -> requests.Response:
+    """
+    GET through a circuit breaker, optionally hedged.
+    
+    Connection errors, timeouts, 429 and 5xx responses (after the session's
+    own retries) count as failures, as does any other exception raised by the
+    request, so a half-open probe is always settled; any other response is a
+    success. With
+    a deadline, every attempt's timeout and the session's retry waits end
+    by it, and a call made after it fails without touching the breaker.
+    
+    Args:
+        session: HTTP session
+        url: Request URL
+        breaker: Breaker for this upstream
+        hedger: Hedger for this upstream (None sends a single request)
+        can_hedge: Passed to Hedger.call
+        deadline: ``time.monotonic()`` by which the call must finish (None for no limit)
+        **kwargs: Passed to session.get
+    
+    Returns:
+        The response
+    
+    Raises:
+        CircuitOpenError: If the breaker is open
+        requests.exceptions.RequestException: On connection errors/timeouts
+    """
+    get = session.get
+    if deadline is not None:
+        if time.monotonic() >= deadline:
+            raise requests.exceptions.Timeout(f"Deadline passed before requesting {url}")
+        kwargs['timeout'] = DeadlineTimeout(deadline, kwargs.get('timeout'))
+        
+        def get(*args, **get_kwargs) -> requests.Response:
+            # Set on the thread that sends the request (a hedge runs on its own)
+            with deadline_scope(deadline):
+                return session.get(*args, **get_kwargs)
+    
+    breaker.before_call()
+    try:
+        if hedger is not None:
+            response = hedger.call(get, url, can_hedge=can_hedge, **kwargs)
+        else:
+            response = get(url, **kwargs)
+    except Exception:
+        breaker.record_failure()
+        raise
+    
+    if response.status_code == 429 or response.status_code >= 500:
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+    return response
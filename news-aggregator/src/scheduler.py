@@ -0,0 +1,167 @@
+"""Adaptive per-source polling driven by article arrival rates."""
+import time
+from typing import Callable, Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveInterval:
+    """
+    Polling interval for one source, adapted to how fast news arrives.
+    
+    The arrival rate (new articles per second) is smoothed with an EWMA and
+    the interval aims for ``target_per_poll`` new articles per poll, so
+    bursts tighten it immediately. Quiet polls lengthen it by at most
+    ``backoff`` per poll, so one empty poll mid-session doesn't jump
+    straight to the maximum. The interval always stays within
+    [min_interval, max_interval].
+    """
+    
+    def __init__(self, min_interval: float, max_interval: float, initial: Optional[float] = None,
+                 target_per_poll: float = 3.0, smoothing: float = 0.3, backoff: float = 1.5):
+        """
+        Initialize adaptive interval.
+        
+        Args:
+            min_interval: Shortest interval in seconds
+            max_interval: Longest interval in seconds
+            initial: Starting interval (default: min_interval)
+            target_per_poll: New articles a poll should ideally return
+            smoothing: EWMA weight of the latest observed rate (0-1]
+            backoff: Largest factor the interval may grow by per poll
+        """
+        if not 0 < min_interval <= max_interval:
+            raise ValueError("need 0 < min_interval <= max_interval")
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.target_per_poll = target_per_poll
+        self.smoothing = smoothing
+        self.backoff = backoff
+        self.interval = self._clamp(initial if initial is not None else min_interval)
+        self.rate: Optional[float] = None  # Smoothed new articles per second
+    
+    def _clamp(self, value: float) -> float:
+        return min(self.max_interval, max(self.min_interval, value))
+    
+    def record(self, new_articles: int, elapsed_seconds: float) -> float:
+        """
+        Update the rate with one poll's result and return the next interval.
+        
+        Args:
+            new_articles: Articles the poll contributed after dedupe
+            elapsed_seconds: Time covered by the poll (since the previous one)
+        
+        Returns:
+            Seconds until the next poll
+        """
+        observed = new_articles / max(elapsed_seconds, 1e-3)
+        if self.rate is None:
+            self.rate = observed
+        else:
+            self.rate = self.smoothing * observed + (1 - self.smoothing) * self.rate
+        
+        ideal = self.target_per_poll / self.rate if self.rate > 0 else float('inf')
+        self.interval = self._clamp(min(ideal, self.interval * self.backoff))
+        return self.interval
+
+
+class PollScheduler:
+    """
+    Tracks when each source is next due and adapts its interval.
+    
+    Quotas become a floor on the interval: a source making
+    ``calls_per_poll`` requests against ``calls_per_minute`` is never
+    polled faster than the quota can sustain.
+    """
+    
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize scheduler.
+        
+        Args:
+            clock: Monotonic time source in seconds
+        """
+        self.clock = clock
+        self.intervals: Dict[str, AdaptiveInterval] = {}
+        self.next_due: Dict[str, float] = {}
+        self.last_poll: Dict[str, float] = {}
+        self.polls: Dict[str, int] = {}
+    
+    def add_source(self, name: str, min_interval: float, max_interval: float, initial: Optional[float] = None,
+                   calls_per_poll: int = 1, calls_per_minute: Optional[float] = None, **kwargs):
+        """
+        Register a source; it is due immediately.
+        
+        Args:
+            name: Source name
+            min_interval: Shortest interval in seconds
+            max_interval: Longest interval in seconds
+            initial: Starting interval (default: min_interval)
+            calls_per_poll: API requests one poll makes
+            calls_per_minute: Quota available to this source (None for unlimited)
+            **kwargs: Passed to AdaptiveInterval
+        """
+        if calls_per_minute:
+            quota_floor = calls_per_poll * 60.0 / calls_per_minute
+            if quota_floor > min_interval:
+                logger.debug(f"{name}: quota allows one poll per {quota_floor:.0f}s")
+                min_interval = quota_floor
+                max_interval = max(max_interval, quota_floor)
+        self.intervals[name] = AdaptiveInterval(min_interval, max_interval, initial, **kwargs)
+        self.next_due[name] = self.clock()
+        self.polls[name] = 0
+    
+    def due(self, now: Optional[float] = None) -> List[str]:
+        """Sources whose next poll time has passed."""
+        now = self.clock() if now is None else now
+        return [name for name, due_at in self.next_due.items() if due_at <= now]
+    
+    def record(self, name: str, new_articles: int, now: Optional[float] = None) -> float:
+        """
+        Record a poll of one source and schedule its next one.
+        
+        The first poll only sets the baseline: it covers the catch-up
+        window rather than a poll interval, so its count says nothing
+        about the current rate.
+        
+        Args:
+            name: Source name
+            new_articles: Articles the poll contributed after dedupe
+            now: Poll completion time (default: clock())
+        
+        Returns:
+            Seconds until the source is due again
+        """
+        now = self.clock() if now is None else now
+        interval = self.intervals[name]
+        previous = self.last_poll.get(name)
+        if previous is not None:
+            interval.record(new_articles, now - previous)
+        self.last_poll[name] = now
+        self.polls[name] += 1
+        self.next_due[name] = now + interval.interval
+        return interval.interval
+    
+    def mark_due(self, name: str, now: Optional[float] = None):
+        """Make a source due immediately (e.g. to fill a gap after a stream reconnect)."""
+        if name in self.next_due:
+            self.next_due[name] = self.clock() if now is None else now
+    
+    def seconds_until_next(self, now: Optional[float] = None) -> float:
+        """Seconds until the earliest source is due (0 if one already is)."""
+        now = self.clock() if now is None else now
+        if not self.next_due:
+            return 0.0
+        return max(0.0, min(self.next_due.values()) - now)
+    
+    def get_stats(self) -> Dict[str, Dict]:
+        """Current interval, smoothed rate and poll count per source."""
+        return {
+            name: {
+                'interval_seconds': round(interval.interval, 1),
+                'articles_per_minute': round((interval.rate or 0.0) * 60, 2),
+                'polls': self.polls[name]
+            }
+            for name, interval in self.intervals.items()
+        }
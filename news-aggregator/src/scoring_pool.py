@@ -0,0 +1,205 @@
+"""Concurrent, rate-limited IV scoring of article batches."""
+import asyncio
+import logging
+import re
+from collections import deque
+from itertools import groupby
+from typing import AsyncIterator, Deque, Dict, Iterable, List, Optional
+
+from config import GEMINI_MAX_CONCURRENCY, GEMINI_REQUESTS_PER_MINUTE
+from enhanced_iv_scorer import EnhancedIVScorer, headline_fingerprint
+from rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+# Headlines that move the whole market are scored before anything else
+MACRO_PATTERN = re.compile(
+    r'\b(?:fed|fomc|powell|cpi|ppi|pce|nfp|payrolls?|jobs report|gdp|inflation|interest rates?|'
+    r'rate (?:hike|cut)s?|treasur(?:y|ies)|recession|war|invasion|attack|sanctions|tariffs?)\b',
+    re.IGNORECASE
+)
+
+# Priority classes, lowest scored (and delivered) first
+PRIORITY_MACRO = 0
+PRIORITY_TRACKED = 1
+PRIORITY_OTHER = 2
+
+NEUTRAL_IV_SCORE = {
+    'type': 'neutral',
+    'value': 2.0,
+    'confidence': 0.0,
+    'reasoning': 'Fallback - scoring unavailable'
+}
+
+
+class ScoringPool:
+    """
+    Scores articles in batches on worker threads, most important first.
+    
+    Articles are grouped into priority classes (macro, then tracked
+    symbols, then the rest; newest first within each), and each class is
+    cut into ``scorer.batch_size`` batches. Up to ``max_concurrency``
+    workers take the batches in that order, each running one Gemini
+    request in a thread so the event loop stays free, and
+    ``score_by_priority`` hands back each class as soon as it is scored so
+    callers can deliver it while later classes are still in flight.
+    Ordering is per call; requests that need the model take a token from a
+    requests-per-minute bucket shared by every call, and batches the
+    analysis cache fully covers skip it.
+    """
+    
+    def __init__(self, max_concurrency: int = GEMINI_MAX_CONCURRENCY,
+                 requests_per_minute: int = GEMINI_REQUESTS_PER_MINUTE,
+                 rate_limiter: Optional[TokenBucket] = None):
+        """
+        Initialize scoring pool.
+        
+        Args:
+            max_concurrency: Batches scored at once
+            requests_per_minute: Gemini quota (burst of max_concurrency)
+            rate_limiter: Bucket to share with other Gemini callers (overrides
+                requests_per_minute)
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self.rate_limiter = rate_limiter or TokenBucket.per_minute(requests_per_minute, burst=self.max_concurrency)
+        
+        self.stats = {
+            'batches': 0,
+            'cached_batches': 0,
+            'failed_batches': 0,
+            'rate_limited_seconds': 0.0
+        }
+    
+    @staticmethod
+    def priority(article: Dict, tracked_symbols: Iterable[str] = ()) -> int:
+        """
+        Priority class of an article (lower is scored sooner).
+        
+        Args:
+            article: Normalized article
+            tracked_symbols: Symbols whose news outranks general news
+        
+        Returns:
+            PRIORITY_MACRO, PRIORITY_TRACKED or PRIORITY_OTHER
+        """
+        if MACRO_PATTERN.search(article.get('headline') or ''):
+            return PRIORITY_MACRO
+        related = article.get('related') or ''
+        if tracked_symbols and not set(related.split(',')).isdisjoint(tracked_symbols):
+            return PRIORITY_TRACKED
+        return PRIORITY_OTHER
+    
+    async def score(self, scorer: EnhancedIVScorer, articles: List[Dict], instrument: str = "/MES",
+                    tracked_symbols: Optional[Iterable[str]] = None):
+        """
+        Set ``iv_score`` on every article.
+        
+        Wall-clock time is roughly one batch latency per
+        ``max_concurrency`` batches rather than the sum over articles.
+        A batch whose request fails gets ``NEUTRAL_IV_SCORE``.
+        
+        Args:
+            scorer: IV scorer used for VIX and Gemini analyses
+            articles: Articles to score (updated in place)
+            instrument: Trading instrument (/MES, /MNQ, /MGC, /SIL)
+            tracked_symbols: Symbols whose news is scored before general news
+        """
+        async for _ in self.score_by_priority(scorer, articles, instrument, tracked_symbols):
+            pass
+    
+    async def score_by_priority(self, scorer: EnhancedIVScorer, articles: List[Dict], instrument: str = "/MES",
+                                tracked_symbols: Optional[Iterable[str]] = None) -> AsyncIterator[List[Dict]]:
+        """
+        Score articles, yielding each priority class as soon as it is done.
+        
+        Classes are yielded in priority order, each once all of its batches
+        (and those of every more important class) have their ``iv_score``.
+        Workers keep scoring later classes while the caller handles one.
+        
+        Args:
+            scorer: IV scorer used for VIX and Gemini analyses
+            articles: Articles to score (updated in place)
+            instrument: Trading instrument (/MES, /MNQ, /MGC, /SIL)
+            tracked_symbols: Symbols whose news is scored before general news
+        
+        Yields:
+            Scored articles of one priority class, newest first
+        """
+        if not articles:
+            return
+        tracked = frozenset(tracked_symbols or ())
+        ranked = sorted(articles, key=lambda article: (self.priority(article, tracked), -article['datetime']))
+        classes = [list(group) for _, group in groupby(ranked, key=lambda article: self.priority(article, tracked))]
+        
+        # Batches never span classes, so a class is done when its own batches are
+        batches: Deque[tuple] = deque(
+            (index, group[start:start + scorer.batch_size])
+            for index, group in enumerate(classes)
+            for start in range(0, len(group), scorer.batch_size)
+        )
+        pending = [0] * len(classes)
+        for index, _ in batches:
+            pending[index] += 1
+        finished: asyncio.Queue = asyncio.Queue()
+        
+        current_vix = await asyncio.to_thread(scorer.get_current_vix)
+        workers = min(self.max_concurrency, len(batches))
+        scoring = asyncio.gather(*(
+            self._worker(batches, pending, finished, scorer, instrument, current_vix) for _ in range(workers)
+        ))
+        # Wakes the loop below if the workers stop early
+        scoring.add_done_callback(lambda _: finished.put_nowait(None))
+        try:
+            done = set()
+            for index, group in enumerate(classes):
+                while index not in done:
+                    finished_index = await finished.get()
+                    if finished_index is None:
+                        scoring.result()  # Re-raises a worker's error
+                    done.add(finished_index)
+                yield group
+        finally:
+            scoring.cancel()
+    
+    async def _worker(self, batches: Deque[tuple], pending: List[int], finished: asyncio.Queue,
+                      scorer: EnhancedIVScorer, instrument: str, current_vix: float):
+        while batches:
+            index, batch = batches.popleft()
+            headlines = [article.get('headline', '') for article in batch]
+            self.stats['batches'] += 1
+            if self._needs_model(scorer, headlines):
+                await self._acquire()
+            else:
+                self.stats['cached_batches'] += 1
+            
+            try:
+                iv_scores = await asyncio.to_thread(scorer.calculate_iv_scores, headlines, instrument, current_vix)
+            except Exception as e:
+                self.stats['failed_batches'] += 1
+                logger.warning(f"IV scoring failed for {len(batch)} articles: {e}")
+                iv_scores = [dict(NEUTRAL_IV_SCORE) for _ in batch]
+            
+            for article, iv_score in zip(batch, iv_scores):
+                article['iv_score'] = iv_score
+                logger.debug(f"IV Score for '{article['headline'][:50]}...': {iv_score['value']}pts ({iv_score['type']})")
+            
+            pending[index] -= 1
+            if not pending[index]:
+                finished.put_nowait(index)
+    
+    @staticmethod
+    def _needs_model(scorer: EnhancedIVScorer, headlines: List[str]) -> bool:
+        """Whether any headline is missing from the scorer's analysis cache."""
+        cache = scorer.analysis_cache
+        return cache is None or any(headline_fingerprint(headline) not in cache for headline in headlines)
+    
+    async def _acquire(self):
+        """Take a request token, sleeping on the event loop rather than a thread."""
+        while not self.rate_limiter.try_acquire():
+            wait = max(0.01, (1 - self.rate_limiter.available) / self.rate_limiter.rate)
+            self.stats['rate_limited_seconds'] += wait
+            await asyncio.sleep(wait)
+    
+    def get_stats(self) -> Dict:
+        """Batch counters plus time spent waiting on the request quota."""
+        return dict(self.stats)
@@ -0,0 +1,88 @@
+"""Bounded LRU cache with per-entry expiry."""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Least-recently-used cache whose entries also expire after ``ttl_seconds``.
+    
+    Lookups and inserts are O(1). When full, the least recently used entry
+    is evicted; expired entries are dropped when they are next looked up.
+    Safe to share between worker threads.
+    """
+    
+    def __init__(self, maxsize: int = 1024, ttl_seconds: float = 1800.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize cache.
+        
+        Args:
+            maxsize: Entries kept before the least recently used is evicted
+            ttl_seconds: Seconds an entry stays valid after it is stored
+            clock: Monotonic time source (injectable for tests)
+        """
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: 'OrderedDict[Hashable, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+        
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'expirations': 0
+        }
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Cached value for key, or None if absent or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+            expires_at, value = entry
+            if self._clock() >= expires_at:
+                del self._entries[key]
+                self.stats['expirations'] += 1
+                self.stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return value
+    
+    def put(self, key: Hashable, value: Any):
+        """Store value under key, evicting the least recently used entry if full."""
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+    
+    def clear(self):
+        """Drop every entry (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and self._clock() < entry[0]
+    
+    def get_stats(self) -> Dict:
+        """Size plus hit, miss, eviction and expiration counts."""
+        lookups = self.stats['hits'] + self.stats['misses']
+        return {
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            **self.stats,
+            'hit_rate': self.stats['hits'] / lookups if lookups else 0.0
+        }
@@ -0,0 +1,316 @@
+"""URL canonicalization, 64-bit fingerprints and compact fingerprint sets."""
+import math
+from array import array
+from hashlib import blake2b
+from typing import List, Set, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+import sys
+
+# Query parameters that only track the referrer on any site (plus ``utm_*``)
+TRACKING_PARAMS = {'fbclid', 'gclid', 'mc_cid', 'mc_eid'}
+
+# Referrer parameters of individual publishers. Elsewhere names like
+# ``source``, ``id`` or ``mod`` can select the story, so they are only dropped
+# on these hosts and their subdomains.
+HOST_TRACKING_PARAMS = {
+    'finance.yahoo.com': {'guccounter', 'guce_referrer', 'guce_referrer_sig', 'ncid', 'yptr',
+                          'soc_src', 'soc_trk'},
+    'reuters.com': {'taid'},
+    'cnbc.com': {'__source', 'source'},
+    'wsj.com': {'mod', 'tpcc'},
+    'barrons.com': {'mod', 'tpcc'},
+    'marketwatch.com': {'mod', 'siteid'},
+    'seekingalpha.com': {'source', 'feed_item_type'},
+    'bloomberg.com': {'cmpid', 'srnd', 'sref'},
+    'nytimes.com': {'smid', 'partner'},
+    'cnn.com': {'cid'},
+    'msn.com': {'ocid', 'cvid'},
+}
+
+_DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def _host_tracking_params(host: str) -> Set[str]:
+    """Publisher tracking parameters for a host or any of its parent domains."""
+    host = host.rsplit(':', 1)[0]
+    while host:
+        params = HOST_TRACKING_PARAMS.get(host)
+        if params is not None:
+            return params
+        _, _, host = host.partition('.')
+    return set()
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Reduce a URL to the form used for exact-match deduplication.
+    
+    Drops the scheme, a leading ``www.``, default ports, the fragment,
+    tracking query parameters (``utm_*``, the names in TRACKING_PARAMS and
+    the host's names in HOST_TRACKING_PARAMS) and a trailing slash;
+    lowercases the host and sorts the remaining query parameters.
+    
+    Args:
+        url: Article URL
+    
+    Returns:
+        Canonical URL string (the stripped input if it cannot be parsed)
+    """
+    url = (url or '').strip()
+    if not url:
+        return ''
+    
+    try:
+        parts = urlsplit(url if '//' in url else f'//{url}')
+        host = (parts.hostname or '').lower()
+        port = parts.port
+    except ValueError:
+        return url
+    
+    if host.startswith('www.'):
+        host = host[4:]
+    if port is not None and port != _DEFAULT_PORTS.get(parts.scheme.lower()):
+        host = f'{host}:{port}'
+    
+    path = parts.path or '/'
+    if len(path) > 1:
+        path = path.rstrip('/')
+    
+    host_params = _host_tracking_params(host)
+    query = [
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith('utm_') and key.lower() not in TRACKING_PARAMS
+        and key.lower() not in host_params
+    ]
+    canonical = f'{host}{path}'
+    if query:
+        canonical += '?' + urlencode(sorted(query))
+    return canonical
+
+
+def url_fingerprint(url: str) -> int:
+    """
+    Hash a URL's canonical form to a stable 64-bit fingerprint.
+    
+    Args:
+        url: Article URL
+    
+    Returns:
+        Unsigned 64-bit integer fingerprint
+    """
+    canonical = canonicalize_url(url)
+    return int.from_bytes(blake2b(canonical.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class FingerprintSet:
+    """
+    Open-addressing hash set of 64-bit fingerprints stored in an ``array('Q')``.
+    
+    Uses 8 bytes per slot instead of a Python ``set`` entry plus an int
+    object. Slot value 0 marks an empty slot and 1 a deleted one, so those
+    two fingerprints are remapped to 2 and 3 (a harmless extra collision).
+    """
+    
+    _EMPTY = 0
+    _DELETED = 1
+    _MAX_LOAD = 0.6
+    
+    def __init__(self, capacity: int = 1024):
+        """
+        Initialize fingerprint set.
+        
+        Args:
+            capacity: Initial number of slots (rounded up to a power of two)
+        """
+        size = 8
+        while size < capacity:
+            size *= 2
+        self._slots = array('Q', bytes(8 * size))
+        self._mask = size - 1
+        self._used = 0
+        self._deleted = 0
+    
+    @staticmethod
+    def _key(fingerprint: int) -> int:
+        return fingerprint + 2 if fingerprint < 2 else fingerprint
+    
+    def _find(self, key: int) -> Tuple[int, bool]:
+        """Return (slot, found) for a key; slot is where to insert if not found."""
+        slots = self._slots
+        mask = self._mask
+        index = (key ^ (key >> 32)) & mask
+        first_deleted = -1
+        while True:
+            value = slots[index]
+            if value == key:
+                return index, True
+            if value == self._EMPTY:
+                return (first_deleted if first_deleted >= 0 else index), False
+            if value == self._DELETED and first_deleted < 0:
+                first_deleted = index
+            index = (index + 1) & mask
+    
+    def add(self, fingerprint: int):
+        """Add a fingerprint."""
+        key = self._key(fingerprint)
+        index, found = self._find(key)
+        if found:
+            return
+        if self._slots[index] == self._DELETED:
+            self._deleted -= 1
+        self._slots[index] = key
+        self._used += 1
+        if self._used + self._deleted > self._MAX_LOAD * len(self._slots):
+            self._resize()
+    
+    def discard(self, fingerprint: int):
+        """Remove a fingerprint if present."""
+        index, found = self._find(self._key(fingerprint))
+        if found:
+            self._slots[index] = self._DELETED
+            self._used -= 1
+            self._deleted += 1
+    
+    def _resize(self):
+        """Rehash into a table sized for the live entries, dropping tombstones."""
+        live = [value for value in self._slots if value > self._DELETED]
+        # Leave room to grow by half again before the next resize
+        size = 8
+        while len(live) * 1.5 > self._MAX_LOAD * size:
+            size *= 2
+        self._slots = array('Q', bytes(8 * size))
+        self._mask = size - 1
+        self._used = 0
+        self._deleted = 0
+        for key in live:
+            index, _ = self._find(key)
+            self._slots[index] = key
+            self._used += 1
+    
+    def clear(self):
+        """Remove every fingerprint."""
+        self.__init__()
+    
+    def memory_bytes(self) -> int:
+        """Approximate resident size of the set."""
+        return sys.getsizeof(self) + sys.getsizeof(self._slots)
+    
+    def __contains__(self, fingerprint: int) -> bool:
+        return self._find(self._key(fingerprint))[1]
+    
+    def __len__(self) -> int:
+        return self._used
+    
+    def __iter__(self):
+        return (value for value in self._slots if value > self._DELETED)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over 64-bit fingerprints."""
+    
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        """
+        Initialize Bloom filter.
+        
+        Args:
+            capacity: Expected number of fingerprints
+            error_rate: Target false-positive probability at capacity
+        """
+        capacity = max(1, capacity)
+        self.num_bits = max(64, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+    
+    def _positions(self, fingerprint: int):
+        # Kirsch-Mitzenmacher double hashing from the two 32-bit halves
+        h1 = fingerprint & 0xFFFFFFFF
+        h2 = (fingerprint >> 32) | 1
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+    
+    def add(self, fingerprint: int):
+        """Add a fingerprint."""
+        bits = self._bits
+        for position in self._positions(fingerprint):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+    
+    def memory_bytes(self) -> int:
+        """Approximate resident size of the filter."""
+        return sys.getsizeof(self) + sys.getsizeof(self._bits)
+    
+    def __contains__(self, fingerprint: int) -> bool:
+        bits = self._bits
+        return all(bits[p >> 3] & (1 << (p & 7)) for p in self._positions(fingerprint))
+
+
+class RotatingBloomFilter:
+    """
+    Time-sliced Bloom filters covering a long URL window with bounded memory.
+    
+    Fingerprints go into the slice for their timestamp; whole slices are
+    dropped once they fall out of the window. Membership may report false
+    positives at roughly ``error_rate`` per live slice, never false
+    negatives.
+    """
+    
+    def __init__(self, window_hours: int, slice_hours: int = 6,
+                 capacity_per_slice: int = 20000, error_rate: float = 0.001):
+        """
+        Initialize rotating filter.
+        
+        Args:
+            window_hours: How long fingerprints are remembered
+            slice_hours: Time span covered by each underlying filter
+            capacity_per_slice: Expected fingerprints per slice
+            error_rate: Target false-positive rate per slice
+        """
+        self.window_hours = window_hours
+        self.slice_seconds = slice_hours * 3600
+        self.capacity_per_slice = capacity_per_slice
+        self.error_rate = error_rate
+        # (slice start timestamp, filter), oldest first
+        self._slices: List[Tuple[int, BloomFilter]] = []
+    
+    def _slice_for(self, timestamp: int) -> BloomFilter:
+        start = int(timestamp) // self.slice_seconds * self.slice_seconds
+        for slice_start, bloom in self._slices:
+            if slice_start == start:
+                return bloom
+        
+        bloom = BloomFilter(self.capacity_per_slice, self.error_rate)
+        self._slices.append((start, bloom))
+        self._slices.sort(key=lambda item: item[0])
+        return bloom
+    
+    def add(self, fingerprint: int, timestamp: int):
+        """Remember a fingerprint under the article's timestamp."""
+        self._slice_for(timestamp).add(fingerprint)
+    
+    def expire(self, cutoff_timestamp: int) -> int:
+        """
+        Drop slices that end at or before the cutoff.
+        
+        Args:
+            cutoff_timestamp: Oldest timestamp still inside the window
+        
+        Returns:
+            Number of slices dropped
+        """
+        before = len(self._slices)
+        self._slices = [
+            (start, bloom) for start, bloom in self._slices
+            if start + self.slice_seconds > cutoff_timestamp
+        ]
+        return before - len(self._slices)
+    
+    def memory_bytes(self) -> int:
+        """Approximate resident size of all live slices."""
+        return sys.getsizeof(self._slices) + sum(b.memory_bytes() for _, b in self._slices)
+    
+    def __contains__(self, fingerprint: int) -> bool:
+        return any(fingerprint in bloom for _, bloom in self._slices)
+    
+    def __len__(self) -> int:
+        return sum(bloom.count for _, bloom in self._slices)
@@ -0,0 +1,63 @@
+"""Shared test doubles: a manual clock and local HTTP stand-ins for upstreams."""
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, Optional
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+    
+    def __init__(self, now: float = 0.0):
+        self.now = now
+    
+    def __call__(self):
+        return self.now
+
+
+class JSONHandler(BaseHTTPRequestHandler):
+    """Keep-alive handler base that replies with JSON bodies and logs nothing."""
+    
+    protocol_version = 'HTTP/1.1'
+    
+    def reply(self, status: int, body: bytes, headers: Optional[Dict[str, str]] = None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, *args):
+        pass
+
+
+@contextmanager
+def local_server(handler: type, **state) -> Iterator[ThreadingHTTPServer]:
+    """
+    Serve ``handler`` on an ephemeral local port for the duration of the block.
+    
+    Args:
+        handler: Request handler class
+        **state: Attributes set on the server before it starts; handlers
+            read and update them through ``self.server``
+    
+    Yields:
+        The running server
+    """
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    for name, value in state.items():
+        setattr(httpd, name, value)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield httpd
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+def base_url(server: ThreadingHTTPServer) -> str:
+    """Root URL of a local server."""
+    return f"http://127.0.0.1:{server.server_address[1]}"
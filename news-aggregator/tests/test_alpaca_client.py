@@ -0,0 +1,237 @@
+"""Tests for Alpaca pagination and incremental fetch."""
+import json
+import pytest
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from alpaca_client import AlpacaNewsClient
+from http_pool import create_session
+from resilience import CircuitBreaker
+from tests.helpers import JSONHandler, base_url, local_server
+
+
+def alpaca_item(item_id, created_at, symbols=('AAPL',)):
+    """Raw Alpaca news item."""
+    return {
+        'id': item_id,
+        'headline': f'Headline {item_id}',
+        'summary': '',
+        'url': f'https://example.com/{item_id}',
+        'source': 'benzinga',
+        'created_at': created_at.strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'symbols': list(symbols)
+    }
+
+
+class PagedNewsHandler(JSONHandler):
+    """Serves ``server.items`` newer than ``start`` in pages, like /v1beta1/news."""
+    
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        self.server.queries.append(query)
+        start = datetime.fromisoformat(query['start'][0].replace('Z', '+00:00'))
+        limit = int(query['limit'][0])
+        offset = int(query.get('page_token', ['0'])[0])
+        
+        symbols = set(query['symbols'][0].split(',')) if 'symbols' in query else None
+        items = [item for item in self.server.items
+                 if datetime.fromisoformat(item['created_at'].replace('Z', '+00:00')) >= start
+                 and (symbols is None or symbols & set(item['symbols']))]
+        if query['sort'] == ['desc']:
+            items.reverse()
+        page = items[offset:offset + limit]
+        next_token = str(offset + limit) if offset + limit < len(items) else None
+        self.reply(200, json.dumps({'news': page, 'next_page_token': next_token}).encode())
+
+
+@pytest.fixture
+def server():
+    """Local Alpaca stand-in with 12 items spread over the last 30 minutes."""
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    items = [alpaca_item(i, now - timedelta(minutes=30 - 2 * i)) for i in range(12)]
+    with local_server(PagedNewsHandler, items=items, queries=[]) as httpd:
+        yield httpd
+
+
+def make_client(server, **kwargs):
+    kwargs.setdefault('breaker', CircuitBreaker('alpaca-test'))
+    return AlpacaNewsClient(
+        base_url=base_url(server),
+        session=create_session(max_retries=0),
+        **kwargs
+    )
+
+
+class TestAlpacaPagination:
+    """Test cases for paginated, incremental Alpaca fetches."""
+    
+    def test_follows_next_page_token(self, server):
+        """Test that bursts larger than one page are fetched in full."""
+        client = make_client(server)
+        
+        articles = client.get_news(limit=5)
+        
+        assert [a['id'] for a in articles] == list(range(12))
+        assert client.last_fetch_pages == 3
+        assert [q.get('page_token') for q in server.queries] == [None, ['5'], ['10']]
+        assert all(q['sort'] == ['asc'] for q in server.queries)
+    
+    def test_iter_news_pages_streams(self, server):
+        """Test that pages are yielded before later pages are requested."""
+        client = make_client(server)
+        
+        pages = client.iter_news_pages(limit=5)
+        first, mark = next(pages)
+        
+        assert len(first) == 5
+        assert len(server.queries) == 1
+        assert sum(len(page) for page, _ in pages) == 7
+        assert mark.strftime('%Y-%m-%dT%H:%M:%SZ') == server.items[4]['created_at']
+    
+    def test_iter_news_pages_leaves_cursor_to_caller(self, server):
+        """Test that only committed page marks move the cursor."""
+        client = make_client(server)
+        
+        pages = client.iter_news_pages(limit=5)
+        _, first_mark = next(pages)
+        _, second_mark = next(pages)
+        assert client.high_water_mark is None
+        
+        client.commit_cursor(first_mark)
+        assert client.high_water_mark == first_mark < second_mark
+    
+    def test_latest_news_is_one_page_and_leaves_cursor(self, server):
+        """Test that on-demand reads return the newest page every time without moving the mark."""
+        client = make_client(server)
+        
+        first = client.get_latest_news(limit=5)
+        second = client.get_latest_news(limit=5)
+        
+        assert [a['id'] for a in first] == [a['id'] for a in second] == [11, 10, 9, 8, 7]
+        assert len(server.queries) == 2
+        assert all(q['sort'] == ['desc'] and 'page_token' not in q for q in server.queries)
+        assert client.high_water_mark is None
+    
+    def test_incremental_fetch_starts_at_high_water_mark(self, server):
+        """Test that a second cycle only asks for items since the last one seen."""
+        client = make_client(server, cursor_overlap_seconds=0)
+        client.get_news(limit=50)
+        newest = server.items[-1]['created_at']
+        
+        newer = alpaca_item(99, datetime.now(timezone.utc).replace(microsecond=0) + timedelta(seconds=5))
+        server.items.append(newer)
+        articles = client.get_news(limit=50)
+        
+        assert server.queries[-1]['start'] == [newest]
+        assert [a['id'] for a in articles] == [11, 99]  # Boundary item is left to dedupe
+        assert client.high_water_mark.strftime('%Y-%m-%dT%H:%M:%SZ') == newer['created_at']
+    
+    def test_max_pages_resumes_next_cycle(self, server):
+        """Test that a capped fetch loses nothing: the next one picks up the rest."""
+        client = make_client(server, cursor_overlap_seconds=0)
+        
+        first = client.get_news(limit=5, max_pages=1)
+        second = client.get_news(limit=5)
+        
+        assert [a['id'] for a in first] == [0, 1, 2, 3, 4]
+        assert {a['id'] for a in second} == set(range(4, 12))
+    
+    def test_cursor_persists_across_restarts(self, server, tmp_path):
+        """Test that the high-water mark is written atomically and reloaded."""
+        cursor_path = tmp_path / 'alpaca_cursor.json'
+        client = make_client(server, cursor_path=str(cursor_path))
+        client.get_news(limit=50)
+        
+        assert json.loads(cursor_path.read_text()) == {'high_water_mark': server.items[-1]['created_at']}
+        assert not list(tmp_path.glob('*.tmp'))
+        
+        restarted = make_client(server, cursor_path=str(cursor_path))
+        assert restarted.high_water_mark == client.high_water_mark
+    
+    def test_unreadable_cursor_falls_back_to_window(self, server, tmp_path):
+        """Test that a corrupt cursor file is ignored rather than failing startup."""
+        cursor_path = tmp_path / 'alpaca_cursor.json'
+        cursor_path.write_text('{not json')
+        
+        client = make_client(server, cursor_path=str(cursor_path))
+        
+        assert client.high_water_mark is None
+        assert len(client.get_news(limit=50)) == 12
+    
+    def test_fetch_leaves_cursor_until_committed(self, server, tmp_path):
+        """Test that fetch_news returns the new mark without moving or saving it."""
+        cursor_path = tmp_path / 'alpaca_cursor.json'
+        client = make_client(server, cursor_path=str(cursor_path))
+        
+        articles, mark = client.fetch_news(limit=50, deadline=time.monotonic() + 5)
+        assert len(articles) == 12
+        assert client.high_water_mark is None and not cursor_path.exists()
+        
+        client.commit_cursor(mark)
+        assert json.loads(cursor_path.read_text()) == {'high_water_mark': server.items[-1]['created_at']}
+
+
+class TestAlpacaSymbolChunks:
+    """Test cases for concurrent, symbol-chunked Alpaca fetches."""
+    
+    SYMBOLS = ['AAPL', 'MSFT', 'TSLA', 'NVDA', 'AMD']
+    
+    @pytest.fixture
+    def tagged(self, server):
+        """Items 0-11 tagged round-robin across SYMBOLS; item 12 spans two chunks."""
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        server.items = [
+            alpaca_item(i, now - timedelta(minutes=30 - 2 * i), [self.SYMBOLS[i % 5]]) for i in range(12)
+        ]
+        server.items.append(alpaca_item(12, now - timedelta(seconds=30), ['AAPL', 'TSLA']))
+        return server
+    
+    def test_chunks_merged_in_time_order(self, tagged):
+        """Test that chunks are requested separately and k-way merged oldest first, once per id."""
+        client = make_client(tagged, symbol_chunk_size=2)
+        
+        articles = client.get_news(symbols=self.SYMBOLS, limit=50)
+        
+        assert [a['id'] for a in articles] == list(range(13))
+        assert sorted(q['symbols'][0] for q in tagged.queries) == ['AAPL,MSFT', 'AMD', 'TSLA,NVDA']
+        assert client.high_water_mark.strftime('%Y-%m-%dT%H:%M:%SZ') == tagged.items[-1]['created_at']
+    
+    def test_small_watchlist_is_one_request(self, tagged):
+        """Test that watchlists within the chunk size keep the single paged request."""
+        client = make_client(tagged, symbol_chunk_size=5)
+        
+        client.get_news(symbols=self.SYMBOLS, limit=50)
+        
+        assert [q['symbols'][0] for q in tagged.queries] == [','.join(self.SYMBOLS)]
+    
+    def test_capped_chunk_holds_back_cursor(self, tagged):
+        """Test that the mark stops at a page-capped chunk so the next fetch loses nothing."""
+        client = make_client(tagged, symbol_chunk_size=2, cursor_overlap_seconds=0)
+        
+        first = client.get_news(symbols=self.SYMBOLS, limit=2, max_pages=1)
+        second = client.get_news(symbols=self.SYMBOLS, limit=50)
+        
+        # AAPL,MSFT is capped after item 1 and TSLA,NVDA after item 3; AMD (4, 9) completes
+        assert {a['id'] for a in first} == {0, 1, 2, 3, 4, 9}
+        assert client.last_fetch_pages == 3
+        assert {a['id'] for a in first} | {a['id'] for a in second} == set(range(13))
+    
+    def test_failed_chunk_leaves_cursor(self, tagged):
+        """Test that one failing chunk keeps the others' articles but not their cursor advance."""
+        client = make_client(tagged, symbol_chunk_size=2)
+        tagged.items.append({'id': 'bad'})  # Crashes the handler for every query
+        
+        articles = client.get_news(symbols=self.SYMBOLS, limit=50)
+        
+        assert articles == []
+        assert client.high_water_mark is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,138 @@
+"""Tests for Alpaca real-time news streaming."""
+import asyncio
+import pytest
+import sys
+from pathlib import Path
+
+# Add src and benchmarks to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'benchmarks'))
+
+pytest.importorskip('websockets')
+
+from alpaca_stream import AlpacaNewsStream
+from lazy_article import LazyArticle
+from news_aggregator import NewsAggregator
+from scheduler import PollScheduler
+from standin_stream import StandinStream
+
+
+@pytest.fixture
+def standin():
+    """Stream stand-in that only sends published articles."""
+    stream = StandinStream().start()
+    yield stream
+    stream.stop()
+
+
+async def wait_until(condition, timeout=5.0):
+    """Poll ``condition`` until it holds."""
+    for _ in range(int(timeout / 0.02)):
+        if condition():
+            return
+        await asyncio.sleep(0.02)
+    raise AssertionError("condition not met in time")
+
+
+def run_stream(stream, scenario):
+    """Run ``stream`` alongside ``scenario(received)`` and return what was received."""
+    received = []
+    
+    async def collect(articles):
+        received.extend(articles)
+    
+    async def main():
+        task = asyncio.create_task(stream.run(collect, on_reconnect=lambda: received.append('reconnect')))
+        try:
+            await scenario(received)
+        finally:
+            await stream.stop()
+            await asyncio.wait_for(task, 5)
+    
+    asyncio.run(main())
+    return received
+
+
+class TestAlpacaNewsStream:
+    """Test cases for the WebSocket subscriber."""
+    
+    def test_receives_normalized_articles(self, standin):
+        """Test that news messages arrive normalized like REST articles."""
+        stream = AlpacaNewsStream('key', 'secret', url=standin.url, symbols=['AAPL'])
+        item = standin.make_item(symbols=['AAPL'], headline='Apple beats estimates')
+        
+        async def scenario(received):
+            await wait_until(lambda: standin.subscribers == 1)
+            await asyncio.to_thread(standin.publish, [item, standin.make_item(symbols=['XOM'])])
+            await wait_until(lambda: received)
+        
+        received = run_stream(stream, scenario)
+        
+        assert len(received) == 1
+        assert isinstance(received[0], LazyArticle)
+        assert received[0]['headline'] == 'Apple beats estimates'
+        assert received[0]['origin'] == 'alpaca'
+        assert received[0]['related'] == 'AAPL'
+    
+    def test_reconnects_after_drop(self, standin):
+        """Test that a dropped connection is re-established and reported."""
+        stream = AlpacaNewsStream('key', 'secret', url=standin.url, reconnect_min_seconds=0.05)
+        
+        async def scenario(received):
+            await wait_until(lambda: standin.subscribers == 1)
+            await asyncio.to_thread(standin.drop_connections)
+            await wait_until(lambda: 'reconnect' in received and standin.subscribers == 1)
+            await asyncio.to_thread(standin.publish, [standin.make_item()])
+            await wait_until(lambda: len(received) == 2)
+        
+        received = run_stream(stream, scenario)
+        
+        assert received[0] == 'reconnect'
+        assert stream.stats['connects'] == 2 and stream.stats['reconnects'] == 1
+    
+    def test_auth_failure_backs_off_and_retries(self):
+        """Test that rejected credentials are retried rather than crashing the stream."""
+        standin = StandinStream(key='key', secret='secret').start()
+        stream = AlpacaNewsStream('key', 'wrong', url=standin.url,
+                                  reconnect_min_seconds=0.02, reconnect_max_seconds=0.05)
+        
+        async def scenario(received):
+            await wait_until(lambda: stream.stats['errors'] >= 2)
+        
+        try:
+            assert run_stream(stream, scenario) == []
+        finally:
+            standin.stop()
+        assert standin.stats['auth_failures'] >= 2
+        assert stream.stats['connects'] == 0
+
+
+class TestStreamingAggregator:
+    """Test cases for streaming into the aggregator."""
+    
+    def test_streamed_articles_are_deduped_and_delivered(self, standin):
+        """Test that pushed articles go through dedupe and delivery, and reconnects trigger a poll."""
+        aggregator = NewsAggregator(pulse_endpoint='mock', alpaca_stream_url=standin.url)
+        aggregator.scheduler = PollScheduler()
+        aggregator.scheduler.add_source('alpaca', 60, 300)
+        aggregator.scheduler.record('alpaca', 0)
+        item = standin.make_item(symbols=['AAPL'])
+        
+        async def main():
+            task = asyncio.create_task(aggregator.run_stream(['AAPL']))
+            await wait_until(lambda: standin.subscribers == 1)
+            await asyncio.to_thread(standin.publish, [item])
+            await asyncio.to_thread(standin.publish, [item])
+            await wait_until(lambda: aggregator.stats['streamed_articles'] == 2)
+            
+            aggregator.stream.reconnect_min_seconds = 0.05
+            await asyncio.to_thread(standin.drop_connections)
+            await wait_until(lambda: aggregator._wake.is_set())
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        
+        asyncio.run(main())
+        
+        assert aggregator.stats['total_unique_articles'] == 1
+        assert aggregator.stats['total_delivered'] == 1
+        assert aggregator.scheduler.due() == ['alpaca']
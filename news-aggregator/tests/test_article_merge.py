@@ -0,0 +1,72 @@
+"""Tests for k-way merging of time-ordered article streams."""
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from article_merge import merge_by_time, merge_sources, oriented
+
+
+def articles(*pairs):
+    """Articles from (id, datetime) pairs."""
+    return [{'id': article_id, 'datetime': ts} for article_id, ts in pairs]
+
+
+class TestArticleMerge:
+    """Test cases for article stream merging."""
+    
+    def test_oriented_reverses_sorted_input(self):
+        """Test that already-sorted lists are reversed or returned as-is, not re-sorted."""
+        oldest_first = articles((1, 10), (2, 20), (3, 30))
+        
+        assert oriented(oldest_first, newest_first=False) is oldest_first
+        assert [a['id'] for a in oriented(oldest_first, newest_first=True)] == [3, 2, 1]
+    
+    def test_oriented_sorts_unsorted_input(self):
+        """Test that unsorted lists fall back to a sort."""
+        shuffled = articles((2, 20), (1, 10), (3, 30))
+        
+        assert [a['id'] for a in oriented(shuffled, newest_first=True)] == [3, 2, 1]
+    
+    def test_merge_by_time_interleaves_streams(self):
+        """Test that sorted streams are interleaved into one sorted stream."""
+        alpaca = articles((1, 30), (2, 10))
+        finnhub = articles((3, 40), (4, 20), (5, 5))
+        
+        merged = merge_by_time([alpaca, finnhub], newest_first=True)
+        
+        assert [a['id'] for a in merged] == [3, 1, 4, 2, 5]
+    
+    def test_merge_by_time_is_lazy(self):
+        """Test that taking the newest article does not consume whole streams."""
+        def stream(start):
+            for ts in range(start, 0, -1):
+                yield {'id': ts, 'datetime': ts}
+            raise AssertionError("stream fully consumed")
+        
+        merged = merge_by_time([stream(100), stream(50)], newest_first=True)
+        
+        assert next(merged)['datetime'] == 100
+    
+    def test_merge_by_time_unique_ids(self):
+        """Test that an id seen in several streams is yielded once, at its first position."""
+        chunk_a = articles((1, 10), (2, 20))
+        chunk_b = articles((2, 20), (3, 30))
+        
+        merged = merge_by_time([chunk_a, chunk_b], newest_first=False, unique_ids=True)
+        
+        assert [a['id'] for a in merged] == [1, 2, 3]
+    
+    def test_merge_sources_mixed_orders(self):
+        """Test that sources sorted in either direction merge into one order."""
+        alpaca = articles((1, 10), (2, 30))  # Oldest first
+        finnhub = articles((3, 40), (4, 20))  # Newest first
+        
+        assert [a['id'] for a in merge_sources([alpaca, finnhub])] == [3, 2, 4, 1]
+        assert [a['id'] for a in merge_sources([alpaca, finnhub], newest_first=False)] == [1, 4, 2, 3]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
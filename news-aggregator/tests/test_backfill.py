@@ -0,0 +1,77 @@
+"""Tests for sharded backfill deduplication."""
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from backfill import BackfillDedupe
+from deduplicator import NewsDedupe
+from tests.test_deduplicator import create_article, synthetic_batch
+from tests.test_lsh_index import DEDUPE_CASES
+
+
+def sequential(articles, use_lsh):
+    """Run the reference sequential deduper on a fresh cache."""
+    deduper = NewsDedupe(use_lsh=use_lsh, batch_min_size=0)
+    unique = deduper.process([dict(a) for a in articles])
+    return [a['url'] for a in unique], deduper.stats
+
+
+class TestBackfillDedupe:
+    """The sharded backfill must keep exactly what a sequential run keeps."""
+    
+    @pytest.mark.parametrize('case', sorted(DEDUPE_CASES))
+    def test_test_cases(self, case):
+        """Test the deduplicator test cases in-process."""
+        articles = DEDUPE_CASES[case]
+        expected, _ = sequential(articles, use_lsh=True)
+        
+        actual = BackfillDedupe(workers=1).process([dict(a) for a in articles])
+        assert [a['url'] for a in actual] == expected
+    
+    @pytest.mark.parametrize('use_lsh', [True, False])
+    def test_synthetic_backfill_with_workers(self, use_lsh):
+        """Test a multi-hour batch across worker processes and shard boundaries."""
+        articles = synthetic_batch(300, seed=13)
+        expected, expected_stats = sequential(articles, use_lsh)
+        
+        backfill = BackfillDedupe(use_lsh=use_lsh, workers=2, shard_seconds=600, pair_chunk_size=200)
+        actual = backfill.process([dict(a) for a in articles])
+        
+        assert [a['url'] for a in actual] == expected
+        stats = backfill.get_stats()
+        for key in ('total_processed', 'exact_url_dupes', 'similarity_dupes', 'unique_articles'):
+            assert stats[key] == expected_stats[key]
+        assert stats['shards'] > 1
+    
+    @pytest.mark.parametrize('use_lsh', [True, False])
+    def test_whitespace_headlines(self, use_lsh):
+        """Test that blank headlines match the sequential run instead of being paired."""
+        articles = [
+            create_article("  ", "https://example.com/1", "Source1", "TSLA"),
+            create_article(" ", "https://example.com/2", "Source1", "TSLA"),
+        ]
+        expected, _ = sequential(articles, use_lsh)
+        
+        actual = BackfillDedupe(use_lsh=use_lsh, workers=1).process([dict(a) for a in articles])
+        
+        assert [a['url'] for a in actual] == expected == [a['url'] for a in articles]
+    
+    def test_cross_shard_time_symbol_match(self):
+        """Test a Level 3 match between articles in different shards."""
+        articles = [
+            create_article("Tesla stock rises", "https://example.com/1", "Source1", "TSLA", -3590),
+            create_article("Tesla stock rises sharply", "https://example.com/2", "Source2", "TSLA,AAPL", -3500),
+        ]
+        
+        backfill = BackfillDedupe(workers=1, shard_seconds=60)
+        unique = backfill.process(articles)
+        
+        assert backfill.stats['shards'] == 2
+        assert [a['url'] for a in unique] == ["https://example.com/1"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,107 @@
+"""Tests for vectorized batch deduplication."""
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+np = pytest.importorskip('numpy')
+
+from batch_similarity import HashedNgramVectorizer, VectorStore, candidate_pairs
+from deduplicator import NewsDedupe
+from tests.test_deduplicator import synthetic_batch
+from tests.test_lsh_index import DEDUPE_CASES
+
+
+class TestHashedNgramVectorizer:
+    """Test cases for the hashed n-gram vectorizer."""
+    
+    def test_rows_are_normalized(self):
+        """Test that rows are unit length and empty rows stay zero."""
+        matrix = HashedNgramVectorizer().transform(["fed holds rates", None, ""])
+        
+        assert matrix.shape == (3, 1024)
+        assert np.isclose(np.linalg.norm(matrix[0]), 1.0)
+        assert not matrix[1].any() and not matrix[2].any()
+    
+    def test_candidate_pairs_respect_groups(self):
+        """Test that candidates need both a high cosine and the same group."""
+        vectorizer = HashedNgramVectorizer()
+        queries = vectorizer.transform(["apple announces new iphone"])
+        references = vectorizer.transform([
+            "apple unveils new iphone",
+            "apple announces new iphone",
+            "crude inventories draw sharply",
+        ])
+        
+        hits = candidate_pairs(queries, references, np.array([1]), np.array([1, 2, 1]), 0.5, chunk_size=2)
+        assert hits[0].tolist() == [0]
+
+
+class TestVectorStore:
+    """Test cases for the cached-vector matrix."""
+    
+    def test_rows_grow_and_are_reused(self):
+        """Test that freed rows are reused and a full matrix doubles."""
+        store = VectorStore(4, initial_rows=2)
+        for item in 'abc':
+            store.add(item, np.ones(4, dtype=np.float32), 0)
+        assert store.matrix.shape == (4, 4) and store.size == 3
+        
+        store.remove('b')
+        assert store.groups[:store.size].tolist() == [0, -1, 0]
+        store.add('d', np.zeros(4, dtype=np.float32), 5)
+        
+        assert store.size == 3 and len(store) == 3
+        assert store.items[:3] == ['a', 'd', 'c']
+        assert store.groups[:3].tolist() == [0, 5, 0]
+
+
+class TestBatchEquivalence:
+    """Vectorized batches must keep the same articles as per-article matching."""
+    
+    @pytest.mark.parametrize('case', sorted(DEDUPE_CASES))
+    def test_test_cases(self, case):
+        """Test the deduplicator test cases in batch mode."""
+        articles = DEDUPE_CASES[case]
+        per_article = NewsDedupe(batch_min_size=0, use_lsh=False)
+        batch = NewsDedupe(batch_min_size=1, use_lsh=False)
+        
+        expected = per_article.process([dict(a) for a in articles])
+        actual = batch.process([dict(a) for a in articles])
+        
+        assert [a['url'] for a in actual] == [a['url'] for a in expected]
+        assert batch.stats['vectorized_batches'] == 1
+    
+    def test_synthetic_batches_against_warm_cache(self):
+        """Test a large batch against a cache filled by an earlier batch."""
+        articles = synthetic_batch(600)
+        per_article = NewsDedupe(batch_min_size=0, use_lsh=False)
+        batch = NewsDedupe(batch_min_size=100, use_lsh=False)
+        
+        for chunk in (articles[:300], articles[300:]):
+            expected = per_article.process([dict(a) for a in chunk])
+            actual = batch.process([dict(a) for a in chunk])
+            assert [a['url'] for a in actual] == [a['url'] for a in expected]
+        
+        assert batch.stats == {**per_article.stats, 'vectorized_batches': 2}
+    
+    def test_cache_vectors_built_once(self, monkeypatch):
+        """Test that a batch only vectorizes its own headlines, and forgotten records drop their rows."""
+        deduper = NewsDedupe(batch_min_size=10, use_lsh=False)
+        kept = deduper.process([dict(a) for a in synthetic_batch(200)])
+        assert len(deduper._vectors) == len(deduper.seen_articles)
+        
+        transformed = []
+        transform = deduper._vectorizer.transform
+        monkeypatch.setattr(deduper._vectorizer, 'transform',
+                            lambda texts: transformed.append(len(texts)) or transform(texts))
+        deduper.process([dict(a) for a in synthetic_batch(50, seed=8)])
+        assert transformed == [50]
+        
+        deduper.forget(kept[:5])
+        assert len(deduper._vectors) == len(deduper.seen_articles)
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,110 @@
+"""Smoke tests for the dedupe benchmark suite."""
+import pytest
+import sys
+from pathlib import Path
+
+# Add src and benchmarks to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'benchmarks'))
+
+from bench_aggregator import run as run_aggregator
+from bench_backfill import run as run_backfill
+from bench_dedupe import ENGINES, BruteForceDedupe, compare, run_case
+from deduplicator import NewsDedupe
+from headline_generator import HeadlineGenerator
+
+
+class TestHeadlineGenerator:
+    """Test cases for the synthetic headline stream."""
+    
+    def test_deterministic(self):
+        """Test that equal seeds give identical streams."""
+        first = HeadlineGenerator(seed=4, start=1_700_000_000).articles(200)
+        second = HeadlineGenerator(seed=4, start=1_700_000_000).articles(200)
+        
+        assert first == second
+        assert [a['datetime'] for a in first] == sorted(a['datetime'] for a in first)
+    
+    def test_stream_contains_duplicate_families(self):
+        """Test that reposts and rewrites are caught and new stories are kept."""
+        articles = HeadlineGenerator(seed=1, duplicate_rate=0.3).articles(500)
+        deduper = NewsDedupe(batch_min_size=0)
+        unique = deduper.process(articles)
+        
+        assert deduper.stats['exact_url_dupes'] > 0
+        assert deduper.stats['similarity_dupes'] > 0
+        assert 0.5 * len(articles) < len(unique) < len(articles)
+
+
+class TestBenchDedupe:
+    """Test cases for the benchmark runner."""
+    
+    @pytest.mark.parametrize('engine', sorted(ENGINES))
+    def test_run_case(self, engine):
+        """Test that every engine runs and reports its figures."""
+        result = run_case(engine, cache_size=100, batches=2, batch_size=10)
+        
+        assert result['engine'] == engine
+        assert result['articles'] == 20
+        assert result['articles_per_sec'] > 0
+        assert result['peak_memory_mb'] > 0
+    
+    def test_compare(self):
+        """Test that a comparison runs both engines on the same articles."""
+        result = compare('vectorized', 'lsh', cache_size=200, batches=2, batch_size=20)
+        
+        assert result['engine']['engine'] == 'vectorized' and result['baseline']['engine'] == 'lsh'
+        assert result['engine']['unique'] == result['baseline']['unique']
+        assert result['speedup'] > 0
+
+
+class TestBruteForceDedupe:
+    """Test cases for the brute-force baseline engine."""
+    
+    @staticmethod
+    def article(source, headline, related):
+        return {'source': source, 'headline': headline, 'related': related, 'datetime': 1_700_000_000}
+    
+    def test_empty_related_is_not_a_symbol_match(self):
+        """Test that two articles without symbols are not matched on symbol overlap."""
+        first = self.article('alpaca', 'Acme shares rise after strong quarter', '')
+        second = self.article('finnhub', 'Acme shares rise after a strong quarter', '')
+        
+        assert not BruteForceDedupe()._are_similar(first, second)
+    
+    def test_shared_symbol_matches_across_sources(self):
+        """Test that a padded symbol list still matches its counterpart."""
+        first = self.article('alpaca', 'Acme shares rise after strong quarter', 'ACME, GLBX')
+        second = self.article('finnhub', 'Acme shares rise after a strong quarter', 'ACME')
+        
+        assert BruteForceDedupe()._are_similar(first, second)
+
+
+class TestBenchBackfill:
+    """Test cases for the backfill worker scaling benchmark."""
+    
+    @pytest.mark.parametrize('use_lsh', [True, False])
+    def test_run(self, use_lsh):
+        """Test that every worker count keeps the same articles and pairs."""
+        results = run_backfill(articles=300, workers=[1, 2], use_lsh=use_lsh)
+        
+        assert [r['workers'] for r in results] == [1, 2]
+        assert all(r['matches_first_run'] for r in results)
+        assert results[0]['candidate_pairs'] == results[1]['candidate_pairs'] > 0
+        assert results[0]['speedup'] == 1.0
+
+
+class TestBenchAggregator:
+    """Test cases for the aggregator load test."""
+    
+    def test_run(self):
+        """Test that cycles fetch from and deliver to the stand-in."""
+        result = run_aggregator(rate=2, cycles=2)
+        
+        assert result['fetched'] > 0
+        assert result['delivered'] == result['unique'] == result['standin']['pulse_articles']
+        assert result['standin']['requests']['alpaca_news'] >= 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
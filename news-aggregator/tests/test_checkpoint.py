@@ -0,0 +1,168 @@
+"""Tests for checkpointing cursors and aggregator state."""
+import asyncio
+import json
+import pytest
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from alpaca_client import AlpacaNewsClient
+from checkpoint import CHECKPOINT_VERSION, Checkpoint, write_json_atomic
+from finnhub_client import FinnHubNewsClient
+from news_aggregator import NewsAggregator
+from tests.test_deduplicator import create_article
+from tests.test_news_aggregator import SlowSource
+
+
+class CursorSource(SlowSource):
+    """Stand-in source with checkpointable cursor state."""
+    
+    def __init__(self, articles, state=None, cursor=None):
+        super().__init__(0.0, articles, cursor)
+        self.state = state or {}
+        self.loaded = None
+    
+    def get_state(self):
+        return dict(self.state)
+    
+    def commit_cursor(self, cursor):
+        super().commit_cursor(cursor)
+        self.state.update(cursor)
+    
+    def load_state(self, state):
+        self.loaded = state
+
+
+def make_aggregator(tmp_path, alpaca, finnhub, **kwargs):
+    aggregator = NewsAggregator(pulse_endpoint='mock', checkpoint_path=str(tmp_path / 'checkpoint.json'), **kwargs)
+    aggregator.alpaca = alpaca
+    aggregator.finnhub = finnhub
+    return aggregator
+
+
+class TestCheckpoint:
+    """Test cases for the Checkpoint file."""
+    
+    def test_round_trip(self, tmp_path):
+        """Test that saved state loads back with version and timestamp."""
+        checkpoint = Checkpoint(str(tmp_path / 'checkpoint.json'))
+        
+        assert checkpoint.load() is None
+        assert checkpoint.save({'stats': {'total_runs': 3}})
+        
+        state = checkpoint.load()
+        assert state['stats'] == {'total_runs': 3}
+        assert state['version'] == CHECKPOINT_VERSION
+        assert not list(tmp_path.glob('*.tmp'))
+    
+    def test_failed_write_keeps_previous(self, tmp_path):
+        """Test that an unserializable state leaves the old checkpoint intact."""
+        checkpoint = Checkpoint(str(tmp_path / 'checkpoint.json'))
+        checkpoint.save({'stats': {'total_runs': 1}})
+        
+        assert not checkpoint.save({'stats': {'total_runs': object()}})
+        
+        assert checkpoint.load()['stats'] == {'total_runs': 1}
+        assert not list(tmp_path.glob('*.tmp'))
+    
+    def test_unreadable_or_old_version_ignored(self, tmp_path):
+        """Test that corrupt or incompatible files don't block startup."""
+        path = tmp_path / 'checkpoint.json'
+        path.write_text('{truncated')
+        assert Checkpoint(str(path)).load() is None
+        
+        write_json_atomic(str(path), {'version': CHECKPOINT_VERSION + 1})
+        assert Checkpoint(str(path)).load() is None
+
+
+class TestClientState:
+    """Test cases for client get_state/load_state."""
+    
+    def test_alpaca_state_newer_mark_wins(self):
+        """Test that a checkpoint never moves the high-water mark back."""
+        client = AlpacaNewsClient()
+        client.high_water_mark = datetime(2024, 5, 2, 12, 0, tzinfo=timezone.utc)
+        
+        client.load_state({'high_water_mark': '2024-05-02T11:00:00Z'})
+        assert client.get_state()['high_water_mark'] == '2024-05-02T12:00:00Z'
+        
+        client.load_state({'high_water_mark': '2024-05-02T13:00:00Z'})
+        assert client.get_state()['high_water_mark'] == '2024-05-02T13:00:00Z'
+    
+    def test_finnhub_state_round_trip(self):
+        """Test that per-category and per-symbol cursors survive JSON."""
+        client = FinnHubNewsClient('key')
+        client.last_ids = {'general': 7002, 'forex': 11}
+        client.company_cursors = {'AAPL': 1_700_000_000}
+        
+        restored = FinnHubNewsClient('key')
+        restored.last_ids = {'forex': 15}
+        restored.load_state(json.loads(json.dumps(client.get_state())))
+        
+        assert restored.last_ids == {'general': 7002, 'forex': 15}
+        assert restored.company_cursors == {'AAPL': 1_700_000_000}
+
+
+class TestAggregatorCheckpoint:
+    """Test cases for checkpointing in NewsAggregator."""
+    
+    def test_saved_after_delivery_and_restored(self, tmp_path):
+        """Test that cursors and counters survive a restart."""
+        alpaca = CursorSource([create_article("Apple announces iPhone", "https://example.com/1")],
+                              {'high_water_mark': '2024-05-02T12:00:00Z'})
+        finnhub = CursorSource([], {'last_ids': {'general': 7002}})
+        aggregator = make_aggregator(tmp_path, alpaca, finnhub)
+        
+        asyncio.run(aggregator.fetch_and_process())
+        
+        saved = json.loads((tmp_path / 'checkpoint.json').read_text())
+        assert saved['stats']['total_runs'] == 1 and saved['stats']['total_delivered'] == 1
+        assert saved['alpaca'] == alpaca.state and saved['finnhub'] == finnhub.state
+        
+        restarted = NewsAggregator(pulse_endpoint='mock', finnhub_key='key',
+                                   checkpoint_path=str(tmp_path / 'checkpoint.json'))
+        assert restarted.stats['total_runs'] == 1
+        assert restarted.alpaca.get_state()['high_water_mark'] == '2024-05-02T12:00:00Z'
+        assert restarted.finnhub.last_ids == {'general': 7002}
+    
+    def test_not_saved_when_delivery_fails(self, tmp_path):
+        """Test that cursors only move past articles Pulse received, and undelivered ones are retried."""
+        alpaca = CursorSource([create_article("Apple announces iPhone", "https://example.com/1")],
+                              {'high_water_mark': '2024-05-02T11:00:00Z'},
+                              cursor={'high_water_mark': '2024-05-02T12:00:00Z'})
+        aggregator = make_aggregator(tmp_path, alpaca, CursorSource([]))
+        
+        async def failed_delivery(articles):
+            return {'success': False, 'error': 'Pulse down'}
+        aggregator.delivery.send_to_pulse = failed_delivery
+        
+        result = asyncio.run(aggregator.fetch_and_process())
+        
+        assert not result['success'] and result['error'] == 'Pulse down'
+        assert aggregator.stats['total_runs'] == 0
+        assert not (tmp_path / 'checkpoint.json').exists()
+        assert alpaca.committed == []
+        assert alpaca.state == {'high_water_mark': '2024-05-02T11:00:00Z'}
+        
+        delivered = []
+        
+        async def delivery(articles):
+            delivered.extend(articles)
+            return {'success': True, 'sent': len(articles)}
+        aggregator.delivery.send_to_pulse = delivery
+        
+        result = asyncio.run(aggregator.fetch_and_process())
+        
+        # The refetched article is not a duplicate of its undelivered self
+        assert result['success'] and result['delivered'] == 1
+        assert aggregator.stats['total_runs'] == 1
+        assert [article['url'] for article in delivered] == ['https://example.com/1']
+        saved = json.loads((tmp_path / 'checkpoint.json').read_text())
+        assert saved['alpaca'] == {'high_water_mark': '2024-05-02T12:00:00Z'}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,106 @@
+"""Tests for the persistent dedupe store."""
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from deduplicator import NewsDedupe, url_fingerprint
+from dedupe_store import DedupeStore
+from tests.test_deduplicator import create_article
+
+
+class TestDedupeStore:
+    """Test cases for warm-restartable deduplication."""
+    
+    def test_restart_keeps_window(self, tmp_path):
+        """Test that a restarted deduper rejects articles seen before the restart."""
+        path = str(tmp_path / 'dedupe.sqlite3')
+        
+        deduper = NewsDedupe(store_path=path)
+        first = deduper.process([
+            create_article("Apple announces new iPhone", "https://example.com/1", "TechNews"),
+            create_article("Tesla launches new car", "https://example.com/2", "AutoNews", "TSLA"),
+        ])
+        deduper.close()
+        assert len(first) == 2
+        
+        restarted = NewsDedupe(store_path=path)
+        assert len(restarted.seen_articles) == 2
+        
+        unique = restarted.process([
+            create_article("Apple announces new iPhone", "https://example.com/1", "TechNews"),  # URL dupe
+            create_article("Apple unveils new iPhone", "https://example.com/3", "TechNews"),  # Similar
+            create_article("Google updates search", "https://example.com/4", "WebNews", "GOOGL"),
+        ])
+        assert [a['url'] for a in unique] == ["https://example.com/4"]
+        assert restarted.stats['exact_url_dupes'] == 1
+        assert restarted.stats['similarity_dupes'] == 1
+        restarted.close()
+    
+    def test_forgotten_articles_pass_again(self, tmp_path):
+        """Test that undelivered articles are dropped from the cache and the store."""
+        path = str(tmp_path / 'dedupe.sqlite3')
+        deduper = NewsDedupe(store_path=path)
+        apple = create_article("Apple announces new iPhone", "https://example.com/1", "TechNews")
+        tesla = create_article("Tesla launches new car", "https://example.com/2", "AutoNews", "TSLA")
+        deduper.process([apple, tesla])
+        
+        assert deduper.forget([apple]) == 1
+        deduper.close()
+        
+        restarted = NewsDedupe(store_path=path)
+        assert [r.url_hash for r in restarted.seen_articles] == [url_fingerprint("https://example.com/2")]
+        assert restarted.process([apple, tesla]) == [apple]
+        restarted.close()
+    
+    def test_restart_skips_and_deletes_expired(self, tmp_path):
+        """Test that expired records are neither restored nor kept on disk."""
+        path = str(tmp_path / 'dedupe.sqlite3')
+        
+        deduper = NewsDedupe(window_hours=1, store_path=path)
+        deduper.process([
+            create_article("Old news", "https://example.com/old", offset_seconds=-7200),
+            create_article("New news", "https://example.com/new", related="MSFT"),
+        ])
+        deduper.close()
+        
+        restarted = NewsDedupe(window_hours=1, store_path=path)
+        assert [r.url_hash for r in restarted.seen_articles] == [url_fingerprint("https://example.com/new")]
+        assert restarted._store.count() == 1
+        restarted.close()
+    
+    def test_restored_records_match_originals(self, tmp_path):
+        """Test that restored records keep every compared field and their LSH entries."""
+        path = str(tmp_path / 'dedupe.sqlite3')
+        
+        deduper = NewsDedupe(store_path=path)
+        deduper.process([create_article("", "https://example.com/1", "Src", "AAPL,MSFT")])
+        deduper.process([create_article(" Fed Holds Rates ", "https://example.com/2", "Src", "")])
+        original = sorted((r.url_hash, r.timestamp, r.symbols, r.headline) for r in deduper.seen_articles)
+        deduper.close()
+        
+        restarted = NewsDedupe(store_path=path)
+        restored = sorted((r.url_hash, r.timestamp, r.symbols, r.headline) for r in restarted.seen_articles)
+        assert restored == original
+        assert len(restarted._lsh) == 1  # Empty headlines are never indexed
+        restarted.close()
+    
+    def test_band_keys_recomputed_for_new_lsh_config(self, tmp_path):
+        """Test that band keys stored under other LSH parameters are ignored."""
+        path = str(tmp_path / 'dedupe.sqlite3')
+        
+        store = DedupeStore(path, lsh_config='old-config')
+        store.add(url_fingerprint("https://example.com/1"), 2_000_000_000, "Src", "AAPL",
+                  "apple announces new iphone", None)
+        store.close()
+        
+        restarted = NewsDedupe(store_path=path)
+        record = restarted.seen_articles[0]
+        assert record in restarted._lsh.query("apple announces new iphone")
+        restarted.close()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -1,13 +1,15 @@
 """Tests for deduplicator module."""
 import pytest
 from datetime import datetime
+from difflib import SequenceMatcher
+import random
 import sys
 from pathlib import Path
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
-from deduplicator import NewsDedupe
+from deduplicator import NewsDedupe, url_fingerprint
 
 
 def create_article(headline, url, source="TestSource", related="AAPL", offset_seconds=0):
@@ -25,9 +27,47 @@ def create_article(headline, url, source="TestSource", related="AAPL", offset_se
     }
 
 
+def synthetic_batch(count, seed=7):
+    """Build a batch with rewrites, cross-source reposts and symbol overlap."""
+    rng = random.Random(seed)
+    subjects = ['Apple', 'Tesla', 'Nvidia', 'Fed', 'Oil', 'Gold', 'Bitcoin', 'Treasury yields']
+    verbs = ['rises', 'falls', 'surges', 'slumps', 'jumps', 'drops', 'rallies']
+    tails = ['after earnings', 'on rate cut hopes', 'amid inflation fears', 'as CPI cools',
+             'ahead of jobs report', 'after downgrade', 'to record high']
+    symbols = ['AAPL', 'TSLA', 'NVDA', 'SPY', 'GLD', '']
+    
+    articles = []
+    for i in range(count):
+        headline = f"{rng.choice(subjects)} {rng.choice(verbs)} {rng.choice(tails)}"
+        if rng.random() < 0.3:
+            headline += rng.choice(['', ' - report', ' sharply', ' again'])
+        articles.append(create_article(
+            headline,
+            f"https://example.com/{rng.randrange(count * 2)}",
+            rng.choice(['Benzinga', 'Reuters', 'CNBC']),
+            rng.choice(symbols),
+            -rng.randrange(3600)
+        ))
+    return articles
+
+
 class TestNewsDedupe:
     """Test cases for news deduplication."""
     
+    @pytest.mark.parametrize('use_lsh,batch_min_size', [(True, 0), (False, 0), (True, 2)])
+    def test_whitespace_headlines_never_similar(self, use_lsh, batch_min_size):
+        """Test that blank headlines are skipped alike by the LSH, full-scan and batch paths."""
+        deduper = NewsDedupe(use_lsh=use_lsh, batch_min_size=batch_min_size)
+        articles = [
+            create_article("   ", "https://example.com/1", related=""),
+            create_article(" ", "https://example.com/2", related=""),
+            create_article("", "https://example.com/3", related=""),
+        ]
+        
+        unique = deduper.process(articles)
+        
+        assert [a['url'] for a in unique] == [a['url'] for a in articles]
+    
     def test_exact_url_duplicate(self):
         """Test detection of exact URL duplicates."""
         deduper = NewsDedupe()
@@ -101,8 +141,7 @@ class TestNewsDedupe:
         
         # Add old article (simulate)
         old_article = create_article("Old news", "https://example.com/old", offset_seconds=-7200)  # 2 hours ago
-        deduper.seen_articles.append(old_article)
-        deduper.seen_urls.add(old_article['url'])
+        deduper._remember(deduper._make_record(old_article))
         
         # Process new articles
         new_articles = [
@@ -113,7 +152,66 @@ class TestNewsDedupe:
         
         # Old article should be cleaned from cache
         assert len(deduper.seen_articles) == 1  # Only new article
-        assert "https://example.com/old" not in deduper.seen_urls
+        assert url_fingerprint("https://example.com/old") not in deduper.seen_urls
+    
+    def test_time_symbol_match_across_bucket_boundary(self):
+        """Test that Level 3 still matches articles in adjacent time buckets."""
+        deduper = NewsDedupe()
+        
+        base = create_article("Nvidia beats estimates", "https://example.com/1", "Source1", "NVDA")
+        base['datetime'] = 1_700_000_099  # Last second of a 5-minute bucket
+        late = create_article("Nvidia beats estimates again", "https://example.com/2", "Source2", "NVDA")
+        late['datetime'] = base['datetime'] + 299
+        
+        unique = deduper.process([base, late])
+        assert len(unique) == 1
+    
+    def test_candidate_indexes_follow_cache(self):
+        """Test that evicted articles are dropped from the source and symbol indexes."""
+        deduper = NewsDedupe(window_hours=1)
+        
+        old_article = create_article("Old news", "https://example.com/old", offset_seconds=-7200)
+        deduper._remember(deduper._make_record(old_article))
+        assert deduper._by_source and deduper._by_symbol_bucket
+        
+        deduper.process([create_article("New news", "https://example.com/new", "OtherSource", "MSFT")])
+        
+        assert deduper._source_ids["TestSource"] not in deduper._by_source
+        assert all(symbol != "AAPL" for symbol, _ in deduper._by_symbol_bucket)
+    
+    def test_cache_cleaning_out_of_order(self):
+        """Test that late-arriving articles are evicted by timestamp, not arrival order."""
+        deduper = NewsDedupe(window_hours=1)
+        
+        recent = create_article("Recent news", "https://example.com/recent", offset_seconds=-60)
+        late = create_article("Late old news", "https://example.com/late", offset_seconds=-7200)
+        deduper._remember(deduper._make_record(recent))
+        deduper._remember(deduper._make_record(late))  # Arrives after a newer article
+        
+        assert [r.url_hash for r in deduper.seen_articles] == [
+            url_fingerprint("https://example.com/late"), url_fingerprint("https://example.com/recent")
+        ]
+        
+        deduper.process([create_article("New news", "https://example.com/new", related="MSFT")])
+        
+        assert [r.url_hash for r in deduper.seen_articles] == [
+            url_fingerprint("https://example.com/recent"), url_fingerprint("https://example.com/new")
+        ]
+        assert url_fingerprint("https://example.com/late") not in deduper.seen_urls
+        assert url_fingerprint("https://example.com/recent") in deduper.seen_urls
+    
+    def test_compact_records(self):
+        """Test that the cache keeps compact records and reports their memory."""
+        deduper = NewsDedupe()
+        
+        deduper.process([create_article("  Apple Announces iPhone ", "https://example.com/1", related="AAPL, MSFT")])
+        record = deduper.seen_articles[0]
+        
+        assert not hasattr(record, '__dict__')
+        assert record.headline == "apple announces iphone"
+        assert record.symbols == frozenset({"AAPL", "MSFT"})
+        assert record.url_hash == url_fingerprint("https://example.com/1")
+        assert deduper.get_stats()['cache_memory_bytes'] > 0
     
     def test_similarity_calculation(self):
         """Test similarity calculation function."""
@@ -131,6 +229,25 @@ class TestNewsDedupe:
         sim3 = deduper._calculate_similarity("Same text", "Same text")
         assert sim3 == 1.0
     
+    def test_similarity_cascade_matches_full_ratio(self):
+        """Test that the pruning tiers never change a threshold decision."""
+        deduper = NewsDedupe()
+        headlines = [deduper._normalize_headline(a['headline']) for a in synthetic_batch(150, seed=2)]
+        headlines += ["", " ", "a", "fed holds rates", "fed holds rates steady"]
+        
+        for threshold in (0.70, 0.85):
+            for h1 in headlines:
+                for h2 in headlines[::3]:
+                    exact = SequenceMatcher(None, h1, h2).ratio()
+                    assert (deduper._bounded_similarity(h1, h2, threshold) > threshold) == (exact > threshold)
+        
+        stats = deduper.get_stats()
+        assert stats['pairs_checked'] == (
+            stats['pruned_by_length'] + stats['pruned_by_char_counts'] + stats['full_ratio_calls']
+        )
+        assert stats['pruned_by_length'] > 0
+        assert stats['pruned_by_char_counts'] > 0
+    
     def test_stats_tracking(self):
         """Test that statistics are tracked correctly."""
         deduper = NewsDedupe()
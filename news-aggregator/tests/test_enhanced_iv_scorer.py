@@ -0,0 +1,178 @@
+"""Tests for batched Gemini headline scoring."""
+import json
+import re
+import pytest
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+pytest.importorskip('google.genai')
+
+from enhanced_iv_scorer import EnhancedIVScorer, headline_fingerprint
+
+
+def analysis(headline):
+    """Well-formed analysis for a headline."""
+    bearish = 'falls' in headline
+    return {
+        'sentiment': 'negative' if bearish else 'positive',
+        'event_type': 'corporate',
+        'confidence': 0.8,
+        'direction': 'bearish' if bearish else 'bullish'
+    }
+
+
+class FakeModels:
+    """Stands in for ``genai.Client().models``, answering batch prompts."""
+    
+    def __init__(self, mangle=None):
+        self.prompts = []
+        self.mangle = mangle or (lambda items: items)
+    
+    def generate_content(self, model, contents, config=None):
+        self.prompts.append(contents)
+        headlines = [json.loads(h) for h in re.findall(r'^\d+\. (".*")$', contents, re.MULTILINE)]
+        items = [{'index': i, **analysis(h)} for i, h in enumerate(headlines)]
+        
+        class Response:
+            text = json.dumps(self.mangle(items))
+        return Response()
+
+
+@pytest.fixture
+def make_scorer():
+    def make(batch_size=10, mangle=None):
+        scorer = EnhancedIVScorer('test-key', batch_size=batch_size)
+        scorer.gemini_client = SimpleNamespace(models=FakeModels(mangle))
+        scorer.vix_cache = {'value': 15.0, 'timestamp': float('inf')}  # Never fetch VIX
+        return scorer
+    return make
+
+
+class TestBatchScoring:
+    """Test cases for EnhancedIVScorer's batch API."""
+    
+    def test_packs_batch_size_headlines_per_request(self, make_scorer):
+        """Test that N headlines cost ceil(N / batch_size) model calls, in input order."""
+        scorer = make_scorer(batch_size=10)
+        headlines = [f'Company {i} {"falls" if i % 2 else "rises"}' for i in range(25)]
+        
+        analyses = scorer.analyze_sentiment_batch(headlines)
+        
+        assert len(scorer.gemini_client.models.prompts) == 3
+        assert analyses == [analysis(h) for h in headlines]
+    
+    def test_malformed_items_fall_back_individually(self, make_scorer):
+        """Test that only the items that fail validation use the keyword fallback."""
+        def mangle(items):
+            items[1]['sentiment'] = 'apocalyptic'
+            del items[2]
+            return items
+        scorer = make_scorer(mangle=mangle)
+        headlines = ['Acme rises', 'Acme crash deepens', 'Globex falls', 'Initech rises']
+        
+        analyses = scorer.analyze_sentiment_batch(headlines)
+        
+        assert analyses[0] == analysis(headlines[0])
+        assert analyses[3] == analysis(headlines[3])
+        assert analyses[1] == scorer._fallback_sentiment(headlines[1])
+        assert analyses[2] == scorer._fallback_sentiment(headlines[2])
+        assert scorer.get_cache_stats()['batch']['fallbacks'] == 2
+        assert scorer.get_cache_stats()['size'] == 2  # Fallbacks are not cached
+    
+    def test_failed_request_falls_back(self, make_scorer):
+        """Test that an unparseable reply falls back for every headline in it."""
+        scorer = make_scorer(mangle=lambda items: 'not json')
+        
+        analyses = scorer.analyze_sentiment_batch(['Fed raises rates', 'Oil surge continues'])
+        
+        assert analyses == [scorer._fallback_sentiment(h) for h in ['Fed raises rates', 'Oil surge continues']]
+    
+    def test_repeats_and_cached_headlines_skip_model(self, make_scorer):
+        """Test that reworded repeats share one slot and cached headlines are not re-sent."""
+        scorer = make_scorer()
+        scorer.analyze_sentiment_batch(['Acme rises'])
+        
+        analyses = scorer.analyze_sentiment_batch(['BREAKING: Acme rises', 'Globex falls', 'GLOBEX  falls'])
+        
+        prompts = scorer.gemini_client.models.prompts
+        assert len(prompts) == 2
+        assert 'Acme' not in prompts[1] and prompts[1].count('Globex') == 1
+        assert analyses == [analysis('Acme rises'), analysis('Globex falls'), analysis('Globex falls')]
+    
+    def test_calculate_iv_scores_matches_single(self, make_scorer):
+        """Test that batch scores equal one-at-a-time scores for the same analyses."""
+        scorer = make_scorer()
+        headlines = ['Acme rises', 'Globex falls']
+        
+        batch = scorer.calculate_iv_scores(headlines, instrument='/MNQ')
+        scorer.analyze_sentiment_with_gemini = analysis
+        single = [scorer.calculate_iv_score(h, instrument='/MNQ') for h in headlines]
+        
+        assert batch == single
+        assert scorer.calculate_iv_scores([]) == []
+
+
+
+class SingleReplyModels:
+    """Stands in for ``genai.Client().models``, giving one fixed reply per prompt."""
+    
+    def __init__(self, text):
+        self.text = text
+        self.calls = 0
+    
+    def generate_content(self, model, contents, config=None):
+        self.calls += 1
+        return SimpleNamespace(text=self.text)
+
+
+class TestSingleAnalysis:
+    """Test cases for the one-headline analysis path and its cache."""
+    
+    def test_valid_reply_cached(self, make_scorer):
+        """Test that a well-formed reply is cached and reused."""
+        scorer = make_scorer()
+        scorer.gemini_client = SimpleNamespace(models=SingleReplyModels(json.dumps(analysis('Acme rises'))))
+        
+        first = scorer.analyze_sentiment_with_gemini('Acme rises')
+        second = scorer.analyze_sentiment_with_gemini('Acme rises')
+        
+        assert first == second == analysis('Acme rises')
+        assert scorer.gemini_client.models.calls == 1
+    
+    def test_malformed_reply_not_cached(self, make_scorer):
+        """Test that a parseable but invalid reply falls back and is asked again next time."""
+        scorer = make_scorer()
+        reply = json.dumps({'sentiment': 'apocalyptic', 'confidence': 7})
+        scorer.gemini_client = SimpleNamespace(models=SingleReplyModels(reply))
+        
+        first = scorer.analyze_sentiment_with_gemini('Acme crash deepens')
+        scorer.analyze_sentiment_with_gemini('Acme crash deepens')
+        
+        assert first == scorer._fallback_sentiment('Acme crash deepens')
+        assert scorer.gemini_client.models.calls == 2
+        assert scorer.get_cache_stats()['size'] == 0
+
+
+class TestHeadlineFingerprint:
+    """Test cases for headline_fingerprint."""
+    
+    def test_marker_with_separator_folded(self):
+        """Test that a wire-service marker followed by a separator is ignored."""
+        base = headline_fingerprint('Fed rate path')
+        
+        assert headline_fingerprint('UPDATE: Fed rate path') == base
+        assert headline_fingerprint('Breaking - Fed  rate path') == base
+        assert headline_fingerprint('ALERT | fed rate path') == base
+    
+    def test_leading_word_without_separator_kept(self):
+        """Test that "Update on ..." is content, not a marker."""
+        assert headline_fingerprint('Update on Fed rate path') != headline_fingerprint('Fed rate path')
+        assert headline_fingerprint('Alert issued for Gulf storm') != headline_fingerprint('issued for Gulf storm')
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,252 @@
+"""Tests for FinHub multi-category fetching."""
+import json
+import pytest
+import sys
+import time
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from finnhub_client import CATEGORIES, FinnHubNewsClient
+from http_pool import create_session
+from rate_limit import TokenBucket
+from resilience import CircuitBreaker
+from tests.helpers import JSONHandler, base_url, local_server
+
+
+class CategoryNewsHandler(JSONHandler):
+    """Serves ``server.news[category]`` newer than ``minId``, like /api/v1/news."""
+    
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        if url.path.endswith('/company-news'):
+            self._company_news(query)
+            return
+        category = query['category'][0]
+        min_id = int(query.get('minId', ['0'])[0])
+        self.server.queries.append((category, min_id))
+        time.sleep(self.server.delay)
+        
+        if category in self.server.failing:
+            self.reply(500, b'{}')
+            return
+        items = [item for item in self.server.news.get(category, []) if item['id'] > min_id]
+        self.reply(200, json.dumps(items).encode())
+    
+    def _company_news(self, query):
+        symbol = query['symbol'][0]
+        self.server.company_queries.append((symbol, query['from'][0], query['to'][0]))
+        time.sleep(self.server.delay)
+        if symbol in self.server.failing:
+            self.reply(500, b'{}')
+            return
+        items = self.server.company_news.get(symbol, [])
+        self.reply(200, json.dumps(items).encode())
+
+
+def finnhub_item(item_id, category, timestamp):
+    """Raw FinHub news item."""
+    return {
+        'id': item_id,
+        'category': category,
+        'datetime': timestamp,
+        'headline': f'{category} headline {item_id}',
+        'source': 'Reuters',
+        'url': f'https://example.com/{category}/{item_id}',
+        'related': ''
+    }
+
+
+@pytest.fixture
+def server():
+    """Local FinHub stand-in; each category has its own id sequence."""
+    news = {
+        'general': [finnhub_item(7000 + i, 'general', 1_700_000_000 + 10 * i) for i in range(3)],
+        'forex': [finnhub_item(10 + i, 'forex', 1_700_000_005 + 10 * i) for i in range(2)],
+        'crypto': [finnhub_item(500 + i, 'crypto', 1_700_000_001 + 10 * i) for i in range(2)],
+        'merger': [finnhub_item(90 + i, 'merger', 1_700_000_002 + 10 * i) for i in range(1)],
+    }
+    with local_server(CategoryNewsHandler, news=news, queries=[], company_news={}, company_queries=[],
+                      delay=0.0, failing=set()) as httpd:
+        yield httpd
+
+
+def make_client(server, rate_limiter=None):
+    return FinnHubNewsClient(
+        'test-key',
+        base_url=base_url(server),
+        session=create_session(max_retries=0),
+        rate_limiter=rate_limiter or TokenBucket(rate=1000, capacity=100),
+        breaker=CircuitBreaker('finnhub-test')
+    )
+
+
+def company_item(item_id, symbol, timestamp):
+    """Raw FinHub company-news item."""
+    item = finnhub_item(item_id, 'company', timestamp)
+    item['related'] = symbol
+    return item
+
+
+class TestFinnHubCategories:
+    """Test cases for per-category cursors and fan-out."""
+    
+    def test_get_all_news_merges_newest_first(self, server):
+        """Test that all categories are merged into one newest-first stream."""
+        client = make_client(server)
+        
+        articles = client.get_all_news()
+        
+        assert len(articles) == 8
+        assert {a['category'] for a in articles} == set(CATEGORIES)
+        timestamps = [a['datetime'] for a in articles]
+        assert timestamps == sorted(timestamps, reverse=True)
+        assert client.last_ids == {'general': 7002, 'forex': 11, 'crypto': 501, 'merger': 90}
+    
+    def test_equal_ids_in_different_categories_kept(self, server):
+        """Test that an id reused by another category's sequence is a different article."""
+        server.news['crypto'] = [finnhub_item(10, 'crypto', 1_700_000_100)]
+        client = make_client(server)
+        
+        articles = client.get_all_news(categories=['forex', 'crypto'])
+        
+        assert sorted((a['category'], a['id']) for a in articles) == [('crypto', 10), ('forex', 10), ('forex', 11)]
+        assert client.last_ids == {'forex': 11, 'crypto': 10}
+    
+    def test_cursors_are_per_category(self, server):
+        """Test that a category with low ids is not filtered by another's minId."""
+        client = make_client(server)
+        client.get_all_news()
+        
+        server.news['forex'].append(finnhub_item(12, 'forex', 1_700_000_100))
+        server.news['general'].append(finnhub_item(7003, 'general', 1_700_000_101))
+        articles = client.get_all_news()
+        
+        assert sorted(a['id'] for a in articles) == [12, 7003]
+        assert dict(server.queries[-4:]) == {'general': 7002, 'forex': 11, 'crypto': 501, 'merger': 90}
+        assert client.last_id == 7003
+    
+    def test_categories_fetched_concurrently(self, server):
+        """Test that the fan-out takes about one request's latency, not four."""
+        server.delay = 0.3
+        client = make_client(server)
+        
+        started = time.perf_counter()
+        client.get_all_news()
+        elapsed = time.perf_counter() - started
+        
+        assert len(server.queries) == 4
+        assert elapsed < 0.9
+    
+    def test_failing_category_keeps_its_cursor(self, server):
+        """Test that one failing category doesn't drop the others."""
+        client = make_client(server)
+        server.failing.add('crypto')
+        
+        articles = client.get_all_news()
+        
+        assert 'crypto' not in {a['category'] for a in articles}
+        assert len(articles) == 6
+        assert 'crypto' not in client.last_ids
+    
+    def test_fetch_leaves_cursors_to_caller(self, server):
+        """Test that fetch_all_news returns cursor updates without applying them."""
+        client = make_client(server)
+        
+        articles, cursor = client.fetch_all_news()
+        assert len(articles) == 8
+        assert client.last_ids == {}
+        
+        client.commit_cursor(cursor)
+        assert client.last_ids == {'general': 7002, 'forex': 11, 'crypto': 501, 'merger': 90}
+    
+    def test_deadline_bounds_rate_limit_wait(self, server):
+        """Test that a fetch without a token gives up at its deadline rather than after 30s."""
+        client = make_client(server, rate_limiter=TokenBucket(rate=0.01, capacity=1))
+        client.rate_limiter.acquire()
+        
+        started = time.monotonic()
+        assert client.fetch_news('general', deadline=started + 0.2) == ([], {})
+        
+        assert time.monotonic() - started < 0.5
+        assert server.queries == []
+
+
+class TestFinnHubCompanyNews:
+    """Test cases for the rate-limited company-news fan-out."""
+    
+    def test_bulk_fetch_merges_symbols(self, server):
+        """Test that every symbol is fetched and shared articles are kept once."""
+        now = int(time.time())
+        server.company_news = {
+            'AAPL': [company_item(1, 'AAPL', now - 60), company_item(2, 'AAPL', now - 30)],
+            'MSFT': [company_item(3, 'MSFT', now - 10), company_item(2, 'AAPL', now - 30)],
+            'TSLA': [],
+        }
+        client = make_client(server)
+        
+        articles = client.get_company_news_bulk(['AAPL', 'MSFT', 'TSLA'])
+        
+        assert [a['id'] for a in articles] == [3, 2, 1]
+        assert {symbol for symbol, _, _ in server.company_queries} == {'AAPL', 'MSFT', 'TSLA'}
+        assert client.company_cursors == {'AAPL': now - 30, 'MSFT': now - 10}
+    
+    def test_cursor_drops_already_seen(self, server):
+        """Test that a symbol's second fetch starts at its cursor's date and skips older items."""
+        now = int(time.time())
+        server.company_news = {'AAPL': [company_item(0, 'AAPL', now - 120), company_item(1, 'AAPL', now - 60)]}
+        client = make_client(server)
+        client.get_company_news_bulk(['AAPL'], lookback_days=3)
+        
+        server.company_news['AAPL'].append(company_item(2, 'AAPL', now))
+        articles = client.get_company_news_bulk(['AAPL'], lookback_days=3)
+        
+        first_from, second_from = server.company_queries[0][1], server.company_queries[1][1]
+        assert second_from > first_from
+        assert [a['id'] for a in articles] == [2, 1]  # Boundary item is left to dedupe
+    
+    def test_quota_defers_remaining_symbols(self, server):
+        """Test that symbols without a token by the deadline go first next cycle."""
+        symbols = [f'SYM{i}' for i in range(6)]
+        client = make_client(server, rate_limiter=TokenBucket(rate=0.01, capacity=4))
+        
+        client.get_company_news_bulk(symbols, max_workers=2, deadline_seconds=0.1)
+        fetched = {symbol for symbol, _, _ in server.company_queries}
+        assert len(fetched) == 4
+        
+        client.rate_limiter = TokenBucket(rate=1000, capacity=2)
+        client.get_company_news_bulk(symbols, max_workers=1)
+        assert {symbol for symbol, _, _ in server.company_queries[4:6]} == set(symbols) - fetched
+    
+    def test_failed_symbol_goes_first_next_cycle(self, server):
+        """Test that a symbol whose request failed is not marked as polled."""
+        symbols = ['AAPL', 'MSFT', 'TSLA']
+        client = make_client(server)
+        server.failing = {'TSLA'}
+        client.get_company_news_bulk(symbols, max_workers=1)
+        
+        server.failing = set()
+        client.get_company_news_bulk(symbols, max_workers=1)
+        
+        first_cycle = [symbol for symbol, _, _ in server.company_queries[:3]]
+        second_cycle = [symbol for symbol, _, _ in server.company_queries[3:]]
+        assert second_cycle == ['TSLA'] + [symbol for symbol in first_cycle if symbol != 'TSLA']
+    
+    def test_fan_out_is_concurrent(self, server):
+        """Test that many symbols take far less than one round trip each."""
+        server.delay = 0.1
+        client = make_client(server)
+        symbols = [f'SYM{i}' for i in range(16)]
+        
+        started = time.perf_counter()
+        client.get_company_news_bulk(symbols, max_workers=8)
+        
+        assert len(server.company_queries) == 16
+        assert time.perf_counter() - started < 1.0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
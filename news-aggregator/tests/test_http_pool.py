@@ -0,0 +1,113 @@
+"""Tests for the shared HTTP connection pool."""
+import logging
+import pytest
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import http_pool
+from alpaca_client import AlpacaNewsClient
+from config import FINNHUB_PEAK_CONNECTIONS, HTTP_POOL_MAXSIZE
+from delivery import NewsDelivery
+from finnhub_client import FinnHubNewsClient
+from tests.helpers import JSONHandler, base_url, local_server
+
+
+class CountingHandler(JSONHandler):
+    """Keep-alive handler that counts connections and can fail first requests."""
+    
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+    
+    def do_GET(self):
+        self.server.requests += 1
+        time.sleep(self.server.delay)
+        if self.server.failures > 0:
+            self.server.failures -= 1
+            self.reply(503, b'{}')
+        else:
+            self.reply(200, b'{"news": []}')
+    
+    def do_POST(self):
+        self.server.requests += 1
+        self.rfile.read(int(self.headers['Content-Length']))
+        self.reply(503 if self.server.failures else 200, b'{}')
+
+
+@pytest.fixture
+def server():
+    """Local HTTP/1.1 server on an ephemeral port."""
+    with local_server(CountingHandler, connections=0, requests=0, failures=0, delay=0.0) as httpd:
+        yield httpd
+
+
+class TestHttpPool:
+    """Test cases for the pooled session."""
+    
+    def test_shared_session_used_by_clients(self):
+        """Test that clients default to one process-wide session."""
+        http_pool.close_session()
+        session = http_pool.get_session()
+        
+        assert AlpacaNewsClient().session is session
+        assert FinnHubNewsClient('key').session is session
+        assert NewsDelivery().session is session
+        http_pool.close_session()
+    
+    def test_adapter_configuration(self):
+        """Test pool sizes and retry policy on the mounted adapters."""
+        session = http_pool.create_session(pool_connections=3, pool_maxsize=7, max_retries=2)
+        adapter = session.get_adapter('https://finnhub.io')
+        
+        assert adapter._pool_connections == 3
+        assert adapter._pool_maxsize == 7
+        assert adapter.max_retries.total == 2
+        assert 429 in adapter.max_retries.status_forcelist
+        assert 'POST' not in adapter.max_retries.allowed_methods
+    
+    def test_connections_are_reused(self, server):
+        """Test that repeated calls share one keep-alive connection."""
+        client = AlpacaNewsClient(base_url=base_url(server), session=http_pool.create_session())
+        for _ in range(5):
+            assert client.get_news() == []
+        
+        assert server.requests == 5
+        assert server.connections == 1
+    
+    def test_transient_errors_are_retried(self, server):
+        """Test that a 503 on GET is retried and POST is not."""
+        session = http_pool.create_session(max_retries=2, backoff_factor=0)
+        server.failures = 1
+        
+        assert AlpacaNewsClient(base_url=base_url(server), session=session).get_news() == []
+        assert server.requests == 2
+        
+        server.failures = 1
+        result = NewsDelivery(f"{base_url(server)}/api/news", session=session).send_to_pulse_sync(
+            [{'id': 1, 'headline': 'Fed holds rates', 'datetime': 0}]
+        )
+        assert result['success'] is False
+        assert server.requests == 3
+    
+    
+    def test_pool_holds_peak_finnhub_concurrency(self, server, caplog):
+        """Test that the default per-host pool keeps every connection of a full FinHub fan-out."""
+        session = http_pool.create_session()
+        server.delay = 0.1
+        
+        assert HTTP_POOL_MAXSIZE >= FINNHUB_PEAK_CONNECTIONS
+        with caplog.at_level(logging.WARNING, logger='urllib3.connectionpool'):
+            with ThreadPoolExecutor(max_workers=FINNHUB_PEAK_CONNECTIONS) as pool:
+                list(pool.map(lambda _: session.get(base_url(server)), range(FINNHUB_PEAK_CONNECTIONS)))
+        
+        assert not [r for r in caplog.records if 'pool is full' in r.getMessage()]
+        assert server.connections == FINNHUB_PEAK_CONNECTIONS
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,175 @@
+"""Tests for lazy article views and fast JSON decoding."""
+import json
+import pickle
+import pytest
+import sys
+import time
+from pathlib import Path
+
+import requests
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import fast_json
+from alpaca_client import ALPACA_FIELDS, AlpacaNewsClient
+from deduplicator import NewsDedupe
+from finnhub_client import FINNHUB_FIELDS, FinnHubNewsClient
+from lazy_article import LazyArticle
+
+RAW_ALPACA = {
+    'id': 42,
+    'headline': 'Apple beats on services revenue',
+    'summary': 'Apple reported...',
+    'url': 'https://www.benzinga.com/news/42',
+    'images': [{'size': 'large', 'url': 'https://cdn.example.com/42.jpg'}],
+    'source': 'benzinga',
+    'created_at': '2024-05-02T20:31:00Z',
+    'symbols': ['AAPL', 'MSFT']
+}
+
+RAW_FINNHUB = {
+    'id': 7001,
+    'category': 'company',
+    'datetime': 1714681860,
+    'headline': 'Apple beats on services revenue',
+    'image': '',
+    'related': 'AAPL',
+    'source': 'Reuters',
+    'summary': 'Apple reported...',
+    'url': 'https://www.reuters.com/apple-42'
+}
+
+
+class CountingFields(dict):
+    """Field map that records which extractors ran."""
+    
+    def __init__(self, fields):
+        super().__init__({key: self._counted(key, extract) for key, extract in fields.items()})
+        self.calls = []
+    
+    def _counted(self, key, extract):
+        def wrapper(raw):
+            self.calls.append(key)
+            return extract(raw)
+        return wrapper
+
+
+@pytest.fixture
+def alpaca():
+    return AlpacaNewsClient(session=requests.Session())
+
+
+@pytest.fixture
+def finnhub():
+    return FinnHubNewsClient('test-key', session=requests.Session())
+
+
+class TestLazyArticle:
+    """Test cases for LazyArticle."""
+    
+    def test_alpaca_normalization(self, alpaca):
+        """Test that the lazy view yields the normalized Alpaca fields."""
+        article = alpaca._normalize_article(RAW_ALPACA)
+        
+        assert article.to_dict() == {
+            'id': 42,
+            'headline': 'Apple beats on services revenue',
+            'summary': 'Apple reported...',
+            'url': 'https://www.benzinga.com/news/42',
+            'image': 'https://cdn.example.com/42.jpg',
+            'source': 'benzinga',
+            'datetime': 1714681860,
+            'category': 'company',
+            'related': 'AAPL,MSFT',
+            'origin': 'alpaca'
+        }
+    
+    def test_finnhub_normalization(self, finnhub):
+        """Test that the lazy view yields the normalized FinHub fields."""
+        article = finnhub._normalize_article(RAW_FINNHUB)
+        
+        assert article == {**RAW_FINNHUB, 'origin': 'finnhub'}
+    
+    def test_missing_fields_fall_back(self, alpaca):
+        """Test defaults for sparse payloads, including a bad timestamp."""
+        article = alpaca._normalize_article({'created_at': 'not a time'})
+        
+        assert article['image'] == '' and article['related'] == ''
+        assert article['source'] == 'Alpaca'
+        assert isinstance(article['datetime'], int)
+    
+    def test_fields_convert_on_first_read(self):
+        """Test that only read fields are converted, each once."""
+        fields = CountingFields(ALPACA_FIELDS)
+        article = LazyArticle(RAW_ALPACA, fields)
+        
+        article['datetime']
+        article['datetime']
+        article.get('url')
+        
+        assert fields.calls == ['datetime', 'url']
+        assert article.materialized == 2
+    
+    def test_dedupe_rejects_without_materializing(self, finnhub):
+        """Test that URL duplicates never convert summary or image."""
+        fields = CountingFields(FINNHUB_FIELDS)
+        raw = {**RAW_FINNHUB, 'datetime': int(time.time())}
+        deduper = NewsDedupe()
+        deduper.process([finnhub._normalize_article(raw)])
+        
+        repeat = LazyArticle(dict(raw), fields)
+        assert deduper.process([repeat]) == []
+        assert 'summary' not in fields.calls and 'image' not in fields.calls
+    
+    def test_mutable_mapping(self, finnhub):
+        """Test writes, deletes and copies behave like a dict."""
+        article = finnhub._normalize_article(RAW_FINNHUB)
+        article['iv_score'] = {'value': 3.0}
+        copy = article.copy()
+        del article['image']
+        
+        assert 'image' not in article and 'image' in copy
+        assert article['iv_score'] == {'value': 3.0}
+        assert set(article) == set(RAW_FINNHUB) - {'image'} | {'origin', 'iv_score'}
+        with pytest.raises(KeyError):
+            article['image']
+        assert article.get('missing', 'default') == 'default'
+    
+    def test_pickles_as_plain_dict(self, alpaca):
+        """Test that articles cross process boundaries as plain dicts."""
+        article = alpaca._normalize_article(RAW_ALPACA)
+        
+        restored = pickle.loads(pickle.dumps(article))
+        
+        assert type(restored) is dict
+        assert restored == article.to_dict()
+
+
+class TestFastJson:
+    """Test cases for the optional fast decoder."""
+    
+    def test_decoders_agree(self, monkeypatch):
+        """Test that orjson and stdlib decoding produce the same payload."""
+        body = json.dumps({'news': [RAW_ALPACA], 'next_page_token': None}).encode()
+        response = requests.Response()
+        response._content = body
+        response.status_code = 200
+        
+        fast = fast_json.decode_response(response)
+        monkeypatch.setattr(fast_json, 'orjson', None)
+        
+        assert not fast_json.fast_json_available()
+        assert fast_json.decode_response(response) == fast == fast_json.loads(body)
+    
+    def test_invalid_json_raises_value_error(self, monkeypatch):
+        """Test that both paths raise ValueError on bad payloads."""
+        with pytest.raises(ValueError):
+            fast_json.loads(b'{not json')
+        monkeypatch.setattr(fast_json, 'orjson', None)
+        with pytest.raises(ValueError):
+            fast_json.loads(b'{not json')
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
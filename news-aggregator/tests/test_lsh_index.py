@@ -0,0 +1,141 @@
+"""Tests for the MinHash/LSH candidate index and its use in NewsDedupe."""
+import os
+import pytest
+import subprocess
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from deduplicator import NewsDedupe
+from lsh_index import MinHashLSH, shingle
+from tests.test_deduplicator import create_article
+
+
+# Article batches mirroring the cases in test_deduplicator.py
+DEDUPE_CASES = {
+    'exact_url_duplicate': [
+        create_article("News 1", "https://example.com/article1"),
+        create_article("News 1", "https://example.com/article1"),
+    ],
+    'similar_headline_same_source': [
+        create_article("Apple announces new iPhone", "https://example.com/1", "TechNews"),
+        create_article("Apple unveils new iPhone", "https://example.com/2", "TechNews"),
+    ],
+    'different_sources': [
+        create_article("Apple announces new iPhone", "https://source1.com/1", "Source1"),
+        create_article("Apple announces new iPhone", "https://source2.com/1", "Source2"),
+    ],
+    'time_proximity_symbol_match': [
+        create_article("Tesla stock rises", "https://example.com/1", "Source1", "TSLA", 0),
+        create_article("Tesla shares increase", "https://example.com/2", "Source2", "TSLA", 120),
+    ],
+    'completely_unique': [
+        create_article("Apple announces iPhone", "https://example.com/1", related="AAPL"),
+        create_article("Tesla launches new car", "https://example.com/2", related="TSLA"),
+        create_article("Google updates search", "https://example.com/3", related="GOOGL"),
+    ],
+    'stats_tracking': [
+        create_article("News 1", "https://example.com/1"),
+        create_article("News 1", "https://example.com/1"),
+        create_article("News 2", "https://example.com/2"),
+    ],
+    'similarity_calculation': [
+        create_article("Apple announces iPhone", "https://example.com/1", "Source1"),
+        create_article("Apple unveils iPhone", "https://example.com/2", "Source1"),
+        create_article("Tesla launches car", "https://example.com/3", "Source1"),
+        create_article("Same text", "https://example.com/4", "Source2", "MSFT"),
+        create_article("Same text", "https://example.com/5", "Source2", "MSFT"),
+    ],
+}
+
+
+class TestMinHashLSH:
+    """Test cases for the MinHash/LSH index."""
+    
+    def test_shingles(self):
+        """Test character shingling of short and long texts."""
+        assert shingle("") == set()
+        assert shingle("ab") == {"ab"}
+        assert shingle("abcd") == {"abc", "bcd"}
+    
+    def test_identical_text_is_candidate(self):
+        """Test that identical texts always share a band."""
+        index = MinHashLSH()
+        index.add(1, "apple announces new iphone")
+        
+        assert index.query("apple announces new iphone") == {1}
+    
+    def test_unrelated_text_is_filtered(self):
+        """Test that unrelated texts are not returned."""
+        index = MinHashLSH()
+        index.add(1, "apple announces new iphone")
+        
+        assert index.query("crude inventories draw sharply") == set()
+    
+    def test_remove(self):
+        """Test that removed keys are no longer returned."""
+        index = MinHashLSH()
+        index.add(1, "apple announces new iphone")
+        index.add(2, "apple unveils new iphone")
+        index.remove(1)
+        index.remove(42)  # Unknown keys are ignored
+        
+        assert 1 not in index
+        assert len(index) == 1
+        assert index.query("apple announces new iphone") == {2}
+    
+    def test_signatures_are_deterministic(self):
+        """Test that signatures do not depend on process hash seeds."""
+        assert MinHashLSH().signature("fed holds rates") == MinHashLSH().signature("fed holds rates")
+    
+    def test_band_keys_independent_of_hash_seed(self):
+        """Test that band keys (persisted by DedupeStore) match across interpreter runs."""
+        code = ("import sys; sys.path.insert(0, 'src'); from lsh_index import MinHashLSH; "
+                "print(list(MinHashLSH().band_keys('fed holds rates')))")
+        runs = [
+            subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                           cwd=Path(__file__).parent.parent, env={**os.environ, 'PYTHONHASHSEED': seed}).stdout
+            for seed in ('1', '2')
+        ]
+        
+        assert runs[0] == runs[1] == f"{list(MinHashLSH().band_keys('fed holds rates'))}\n"
+        assert len(set(MinHashLSH().band_keys('fed holds rates'))) == MinHashLSH().num_bands
+
+
+class TestLSHEquivalence:
+    """LSH-backed dedupe must make the same decisions as the full scan."""
+    
+    @pytest.mark.parametrize('case', sorted(DEDUPE_CASES))
+    def test_process_matches_full_scan(self, case):
+        """Test that both modes keep the same articles and count the same dupes."""
+        articles = DEDUPE_CASES[case]
+        full_scan = NewsDedupe(use_lsh=False)
+        lsh = NewsDedupe(use_lsh=True)
+        
+        expected = full_scan.process([dict(a) for a in articles])
+        actual = lsh.process([dict(a) for a in articles])
+        
+        assert [a['url'] for a in actual] == [a['url'] for a in expected]
+        assert lsh.stats == full_scan.stats
+    
+    @pytest.mark.parametrize('case', sorted(DEDUPE_CASES))
+    def test_similar_pairs_are_candidates(self, case):
+        """Test that every pair _are_similar accepts is returned as a candidate."""
+        articles = DEDUPE_CASES[case]
+        deduper = NewsDedupe(use_lsh=True)
+        
+        records = [deduper._make_record(article) for article in articles]
+        
+        for i, (article, record) in enumerate(zip(articles, records)):
+            candidates = set(deduper._source_candidates(record))
+            candidates.update(deduper._time_symbol_candidates(record))
+            for seen_article, seen_record in zip(articles[:i], records[:i]):
+                if deduper._are_similar(article, seen_article):
+                    assert seen_record in candidates
+            deduper._remember(record)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,159 @@
+"""Tests for the news aggregator cycle."""
+import asyncio
+import pytest
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from news_aggregator import NewsAggregator
+from tests.test_deduplicator import create_article
+
+
+class SlowSource:
+    """Blocking stand-in for a source client."""
+    
+    def __init__(self, delay, articles, cursor=None):
+        self.delay = delay
+        self.articles = articles
+        self.cursor = cursor
+        self.committed = []
+        self.deadlines = []
+    
+    def fetch_news(self, deadline=None, **kwargs):
+        self.deadlines.append(deadline)
+        time.sleep(self.delay)
+        if isinstance(self.articles, Exception):
+            raise self.articles
+        return list(self.articles), self.cursor
+    
+    fetch_all_news = fetch_news
+    
+    def commit_cursor(self, cursor):
+        self.committed.append(cursor)
+
+
+def make_aggregator(alpaca, finnhub, timeout=5.0):
+    """Build an aggregator with stand-in sources and mock delivery."""
+    aggregator = NewsAggregator(pulse_endpoint='mock', source_timeout_seconds=timeout)
+    aggregator.alpaca = alpaca
+    aggregator.finnhub = finnhub
+    return aggregator
+
+
+class TestConcurrentFetch:
+    """Test cases for concurrent source fetching."""
+    
+    def test_sources_fetched_concurrently(self):
+        """Test that cycle latency is the slowest source, not the sum."""
+        aggregator = make_aggregator(
+            SlowSource(0.5, [create_article("Apple announces iPhone", "https://example.com/1")]),
+            SlowSource(0.5, [create_article("Tesla launches car", "https://example.com/2", related="TSLA")])
+        )
+        
+        started = time.perf_counter()
+        result = asyncio.run(aggregator.fetch_and_process())
+        elapsed = time.perf_counter() - started
+        
+        assert result['alpaca_count'] == 1 and result['finnhub_count'] == 1
+        assert result['unique'] == 2
+        assert elapsed < 0.9
+    
+    def test_slow_source_times_out(self):
+        """Test that a source missing its deadline is skipped without stalling the loop."""
+        alpaca = SlowSource(0.0, [create_article("Apple announces iPhone", "https://example.com/1")], cursor='mark')
+        finnhub = SlowSource(2.0, [create_article("Late story", "https://example.com/2")], cursor={'last_ids': {}})
+        aggregator = make_aggregator(alpaca, finnhub, timeout=0.3)
+        
+        async def cycle_with_heartbeat():
+            ticks = 0
+            
+            async def heartbeat():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.05)
+                    ticks += 1
+            
+            task = asyncio.create_task(heartbeat())
+            result = await aggregator.fetch_and_process()
+            task.cancel()
+            return result, ticks
+        
+        result, ticks = asyncio.run(cycle_with_heartbeat())
+        
+        assert result['alpaca_count'] == 1 and result['finnhub_count'] == 0
+        assert aggregator.stats['source_timeouts'] == 1
+        assert ticks >= 3  # The loop kept running while the slow source blocked
+    
+    def test_abandoned_fetch_keeps_its_cursor(self):
+        """Test that only sources whose articles were used move their cursors."""
+        alpaca = SlowSource(0.0, [create_article("Apple announces iPhone", "https://example.com/1")], cursor='mark')
+        finnhub = SlowSource(0.6, [create_article("Late story", "https://example.com/2")],
+                             cursor={'last_ids': {'general': 9}})
+        aggregator = make_aggregator(alpaca, finnhub, timeout=0.3)
+        
+        started = time.monotonic()
+        asyncio.run(aggregator.fetch_and_process())
+        time.sleep(0.5)  # Let the abandoned fetch finish in its thread
+        
+        assert alpaca.committed == ['mark']
+        assert finnhub.committed == []
+        # Clients are told to finish inside the source timeout
+        assert started < finnhub.deadlines[0] < started + 0.3
+    
+    def test_failing_source_is_isolated(self):
+        """Test that an exception in one source does not drop the other."""
+        aggregator = make_aggregator(
+            SlowSource(0.0, RuntimeError("boom")),
+            SlowSource(0.0, [create_article("Fed holds rates", "https://example.com/3", related="SPY")])
+        )
+        
+        result = asyncio.run(aggregator.fetch_and_process())
+        
+        assert result['success'] and result['unique'] == 1
+        assert aggregator.stats['source_errors'] == 1
+
+
+
+class TestCycleOrder:
+    """Test cases for article order through a cycle."""
+    
+    def test_dedupe_oldest_first_delivery_newest_first(self):
+        """Test that dedupe sees the merged batch oldest first and Pulse gets it newest first."""
+        aggregator = make_aggregator(
+            SlowSource(0.0, [
+                create_article("Apple announces iPhone", "https://example.com/1", offset_seconds=-100),
+                create_article("Tesla recalls vehicles", "https://example.com/2", related="TSLA", offset_seconds=-300),
+            ]),
+            SlowSource(0.0, [
+                create_article("Fed holds rates", "https://example.com/3", related="SPY", offset_seconds=-50),
+                create_article("Oil prices climb", "https://example.com/4", related="USO", offset_seconds=-200),
+            ])
+        )
+        
+        seen = []
+        process = aggregator.deduper.process
+        
+        def recording_process(articles):
+            seen.extend(article['url'] for article in articles)
+            return process(articles)
+        aggregator.deduper.process = recording_process
+        
+        delivered = []
+        
+        async def delivery(articles):
+            delivered.extend(article['url'] for article in articles)
+            return {'success': True, 'sent': len(articles)}
+        aggregator.delivery.send_to_pulse = delivery
+        
+        asyncio.run(aggregator.fetch_and_process())
+        
+        expected = ["https://example.com/2", "https://example.com/4", "https://example.com/1", "https://example.com/3"]
+        assert seen == expected
+        assert delivered == expected[::-1]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
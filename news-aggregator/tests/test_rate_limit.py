@@ -0,0 +1,62 @@
+"""Tests for the token bucket rate limiter."""
+import pytest
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from rate_limit import TokenBucket
+
+
+class TestTokenBucket:
+    """Test cases for TokenBucket."""
+    
+    def test_burst_then_paced(self):
+        """Test that a full bucket allows a burst, then waits for refill."""
+        bucket = TokenBucket(rate=20, capacity=3)
+        
+        assert all(bucket.try_acquire() for _ in range(3))
+        assert not bucket.try_acquire()
+        
+        started = time.perf_counter()
+        assert bucket.acquire()
+        assert 0.03 <= time.perf_counter() - started < 0.5
+    
+    def test_acquire_timeout(self):
+        """Test that acquire gives up instead of sleeping past its timeout."""
+        bucket = TokenBucket(rate=1, capacity=1)
+        bucket.acquire()
+        
+        started = time.perf_counter()
+        assert not bucket.acquire(timeout=0.05)
+        assert time.perf_counter() - started < 0.5
+    
+    def test_per_minute_quota_across_threads(self):
+        """Test that concurrent callers together stay within the rate."""
+        bucket = TokenBucket.per_minute(600, burst=5)  # 10/s
+        taken = []
+        started = time.perf_counter()
+        
+        def worker():
+            while time.perf_counter() - started < 0.5 and bucket.acquire(timeout=0.2):
+                taken.append(time.perf_counter())
+        
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        window = max(taken) - started
+        assert 5 < len(taken) <= 5 + 10 * window + 1
+    
+    def test_rejects_non_positive_rate(self):
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,248 @@
+"""Tests for circuit breakers and hedged requests."""
+import pytest
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import requests
+
+from alpaca_client import AlpacaNewsClient
+from http_pool import create_session
+from resilience import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError, Hedger, guarded_get
+from tests.helpers import FakeClock, JSONHandler, base_url as url, local_server
+
+
+class StatusHandler(JSONHandler):
+    """Replies with the server's queued status codes (200 once they run out)."""
+    
+    def do_GET(self):
+        self.server.requests += 1
+        time.sleep(self.server.delay)
+        status = self.server.statuses.pop(0) if self.server.statuses else 200
+        retry_after = self.server.retry_after
+        self.reply(status, b'{"news": []}', {'Retry-After': str(retry_after)} if retry_after is not None else None)
+
+
+@pytest.fixture
+def server():
+    """Local HTTP/1.1 server on an ephemeral port."""
+    with local_server(StatusHandler, requests=0, statuses=[], delay=0.0, retry_after=None) as httpd:
+        yield httpd
+
+
+class TestCircuitBreaker:
+    """Test cases for breaker state transitions."""
+    
+    def test_opens_after_threshold(self):
+        """Test that consecutive failures open the breaker and calls are rejected."""
+        breaker = CircuitBreaker('test', failure_threshold=3, reset_timeout=30, clock=FakeClock())
+        
+        for _ in range(2):
+            breaker.before_call()
+            breaker.record_failure()
+        assert breaker.state == CLOSED
+        
+        breaker.before_call()
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+        assert breaker.get_stats()['trips'] == 1
+        assert breaker.get_stats()['rejected'] == 1
+    
+    def test_success_resets_failure_count(self):
+        """Test that only consecutive failures count."""
+        breaker = CircuitBreaker('test', failure_threshold=2, clock=FakeClock())
+        
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        
+        assert breaker.state == CLOSED
+    
+    def test_half_open_probe_closes_or_reopens(self):
+        """Test that after the reset timeout one probe decides the state."""
+        clock = FakeClock()
+        breaker = CircuitBreaker('test', failure_threshold=1, reset_timeout=30, clock=clock)
+        breaker.record_failure()
+        
+        clock.now = 29
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+        
+        clock.now = 30
+        breaker.before_call()
+        assert breaker.state == HALF_OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()  # Only one probe at a time
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        
+        clock.now = 60
+        breaker.before_call()
+        breaker.record_success()
+        assert breaker.state == CLOSED
+        breaker.before_call()
+    
+    def test_open_error_is_a_request_exception(self):
+        """Test that existing RequestException handlers also catch open circuits."""
+        assert issubclass(CircuitOpenError, requests.exceptions.RequestException)
+
+
+class TestHedger:
+    """Test cases for hedged calls."""
+    
+    def test_no_hedging_until_enough_samples(self):
+        """Test that calls go straight through while latencies are collected."""
+        hedger = Hedger('test', min_samples=3)
+        
+        assert hedger.call(lambda: 'ok') == 'ok'
+        assert hedger.hedge_delay() is None
+        assert hedger.get_stats()['hedged'] == 0
+    
+    def test_hedge_wins_over_slow_first_attempt(self):
+        """Test that a duplicate is sent after the hedge delay and the faster one wins."""
+        hedger = Hedger('test', quantile=0.9, min_samples=5, min_delay=0.02)
+        for _ in range(5):
+            hedger.call(lambda: None)
+        
+        attempts = []
+        
+        def fetch():
+            attempts.append(1)
+            if len(attempts) == 1:
+                time.sleep(0.5)
+                return 'slow'
+            return 'fast'
+        
+        started = time.perf_counter()
+        assert hedger.call(fetch) == 'fast'
+        assert time.perf_counter() - started < 0.4
+        assert hedger.get_stats()['hedge_wins'] == 1
+    
+    def test_can_hedge_false_waits_for_first_attempt(self):
+        """Test that no duplicate is sent when can_hedge declines (e.g. no spare token)."""
+        hedger = Hedger('test', min_samples=1, min_delay=0.01)
+        hedger.call(lambda: None)
+        calls = []
+        
+        def fetch():
+            calls.append(1)
+            time.sleep(0.1)
+            return 'only'
+        
+        assert hedger.call(fetch, can_hedge=lambda: False) == 'only'
+        assert len(calls) == 1
+        assert hedger.get_stats()['hedged'] == 0
+
+
+class TestGuardedGet:
+    """Test cases for breaker-guarded GETs."""
+    
+    def test_server_errors_and_429_count_as_failures(self, server):
+        """Test that 5xx and 429 responses open the breaker and 4xx do not."""
+        session = create_session(max_retries=0)
+        breaker = CircuitBreaker('test', failure_threshold=2, clock=FakeClock())
+        server.statuses = [404, 503, 429]
+        
+        guarded_get(session, url(server), breaker)
+        assert breaker.consecutive_failures == 0
+        guarded_get(session, url(server), breaker)
+        guarded_get(session, url(server), breaker)
+        assert breaker.state == OPEN
+        
+        with pytest.raises(CircuitOpenError):
+            guarded_get(session, url(server), breaker)
+        assert server.requests == 3
+    
+    def test_connection_errors_count_as_failures(self, server):
+        """Test that unreachable upstreams trip the breaker."""
+        session = create_session(max_retries=0)
+        breaker = CircuitBreaker('test', failure_threshold=1, clock=FakeClock())
+        dead_url = url(server)
+        server.shutdown()
+        server.server_close()
+        
+        with pytest.raises(requests.exceptions.ConnectionError):
+            guarded_get(session, dead_url, breaker, timeout=1)
+        assert breaker.state == OPEN
+    
+    def test_unexpected_errors_settle_half_open_probe(self):
+        """Test that a non-requests exception counts as a failure instead of leaking the probe."""
+        clock = FakeClock()
+        breaker = CircuitBreaker('test', failure_threshold=1, reset_timeout=30, clock=clock)
+        breaker.record_failure()
+        clock.now = 30
+        
+        def broken_get(url, **kwargs):
+            raise ValueError("Invalid header value")
+        
+        with pytest.raises(ValueError):
+            guarded_get(SimpleNamespace(get=broken_get), 'http://upstream/news', breaker)
+        assert breaker.state == OPEN
+        
+        clock.now = 60
+        breaker.before_call()  # The next probe is allowed once the reset timeout passes again
+        assert breaker.state == HALF_OPEN
+    
+    def test_client_skips_upstream_while_open(self, server):
+        """Test that a client returns no articles without calling an open upstream."""
+        breaker = CircuitBreaker('alpaca-test', failure_threshold=1, reset_timeout=30, clock=FakeClock())
+        client = AlpacaNewsClient(base_url=url(server), session=create_session(max_retries=0), breaker=breaker)
+        server.statuses = [500]
+        
+        assert client.get_news(['AAPL']) == []
+        assert client.get_news(['AAPL']) == []
+        
+        assert server.requests == 1
+        assert breaker.get_stats()['rejected'] == 1
+    
+    def test_deadline_caps_request_timeout(self, server):
+        """Test that a slow upstream is cut off at the deadline, not the longer timeout."""
+        breaker = CircuitBreaker('test', clock=FakeClock())
+        server.delay = 1.0
+        
+        started = time.monotonic()
+        with pytest.raises(requests.exceptions.RequestException):
+            guarded_get(create_session(max_retries=3, backoff_factor=0), url(server), breaker,
+                        deadline=started + 0.2, timeout=30)
+        
+        assert time.monotonic() - started < 0.8
+        assert breaker.consecutive_failures == 1
+    
+    def test_deadline_stops_retry_waits(self, server):
+        """Test that a Retry-After past the deadline returns the last response instead of sleeping."""
+        breaker = CircuitBreaker('test', clock=FakeClock())
+        server.statuses = [503, 503]
+        server.retry_after = 5
+        
+        started = time.monotonic()
+        response = guarded_get(create_session(max_retries=3), url(server), breaker, deadline=started + 1.0)
+        
+        assert response.status_code == 503
+        assert server.requests == 1
+        assert time.monotonic() - started < 0.5
+    
+    def test_retries_within_deadline(self, server):
+        """Test that quick retries still happen while the deadline allows them."""
+        server.statuses = [503]
+        
+        response = guarded_get(create_session(max_retries=3, backoff_factor=0), url(server),
+                               CircuitBreaker('test', clock=FakeClock()), deadline=time.monotonic() + 5)
+        
+        assert response.status_code == 200
+        assert server.requests == 2
+    
+    def test_past_deadline_skips_request(self, server):
+        """Test that a call made after its deadline sends nothing and spares the breaker."""
+        breaker = CircuitBreaker('test', failure_threshold=1, clock=FakeClock())
+        
+        with pytest.raises(requests.exceptions.Timeout):
+            guarded_get(create_session(), url(server), breaker, deadline=time.monotonic() - 1)
+        
+        assert server.requests == 0
+        assert breaker.state == CLOSED
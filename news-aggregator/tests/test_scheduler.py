@@ -0,0 +1,139 @@
+"""Tests for adaptive per-source polling."""
+import asyncio
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from scheduler import AdaptiveInterval, PollScheduler
+from tests.helpers import FakeClock
+from tests.test_deduplicator import create_article
+from tests.test_news_aggregator import SlowSource, make_aggregator
+
+
+class BurstySource:
+    """Stand-in source returning ``per_poll`` fresh articles on every call."""
+    
+    def __init__(self, per_poll):
+        self.per_poll = per_poll
+        self.calls = 0
+    
+    def fetch_news(self, **kwargs):
+        self.calls += 1
+        return [
+            create_article(f"Story {self.calls}-{i} moves markets", f"https://example.com/{self.calls}/{i}",
+                           related=f"S{self.calls}{i}")
+            for i in range(self.per_poll)
+        ], None
+    
+    fetch_all_news = fetch_news
+
+
+class TestAdaptiveInterval:
+    """Test cases for AdaptiveInterval."""
+    
+    def test_burst_tightens_to_min(self):
+        """Test that a burst shortens the interval at once, but not below min."""
+        interval = AdaptiveInterval(10, 300, initial=60)
+        
+        assert interval.record(30, 60) == 10
+    
+    def test_quiet_backs_off_gradually_to_max(self):
+        """Test that empty polls grow the interval by the backoff factor up to max."""
+        interval = AdaptiveInterval(10, 300, initial=60)
+        
+        intervals = [interval.record(0, 60) for _ in range(6)]
+        
+        assert intervals[:3] == [90, 135, 202.5]
+        assert intervals[-1] == 300
+    
+    def test_steady_rate_targets_articles_per_poll(self):
+        """Test that a steady rate converges on target_per_poll articles per poll."""
+        interval = AdaptiveInterval(1, 600, initial=60, target_per_poll=3)
+        
+        for _ in range(20):
+            interval.record(round(interval.interval * 0.1), interval.interval)  # 6 per minute
+        
+        assert interval.interval == pytest.approx(30, rel=0.1)
+    
+    def test_rejects_bad_bounds(self):
+        with pytest.raises(ValueError):
+            AdaptiveInterval(60, 30)
+
+
+class TestPollScheduler:
+    """Test cases for PollScheduler."""
+    
+    def test_sources_scheduled_independently(self):
+        """Test that a busy source is polled more often than a quiet one."""
+        clock = FakeClock(1000.0)
+        scheduler = PollScheduler(clock)
+        scheduler.add_source('busy', 10, 300, initial=60)
+        scheduler.add_source('quiet', 10, 300, initial=60)
+        
+        assert scheduler.due() == ['busy', 'quiet']
+        polls = {'busy': 0, 'quiet': 0}
+        for _ in range(100):
+            for name in scheduler.due():
+                polls[name] += 1
+                scheduler.record(name, 10 if name == 'busy' else 0)
+            clock.now += scheduler.seconds_until_next()
+        
+        assert polls['busy'] > 3 * polls['quiet']
+        stats = scheduler.get_stats()
+        assert stats['busy']['interval_seconds'] == 10
+        assert stats['quiet']['interval_seconds'] == 300
+    
+    def test_first_poll_only_sets_baseline(self):
+        """Test that the catch-up poll doesn't count as a burst."""
+        clock = FakeClock(1000.0)
+        scheduler = PollScheduler(clock)
+        scheduler.add_source('alpaca', 10, 300, initial=60)
+        
+        assert scheduler.record('alpaca', 50) == 60
+        assert scheduler.intervals['alpaca'].rate is None
+    
+    def test_quota_floor(self):
+        """Test that the interval never drops below what the quota sustains."""
+        scheduler = PollScheduler(FakeClock(1000.0))
+        scheduler.add_source('company', 10, 300, calls_per_poll=120, calls_per_minute=30)
+        
+        interval = scheduler.intervals['company']
+        assert interval.min_interval == 240
+        scheduler.record('company', 0)
+        scheduler.record('company', 500, now=scheduler.clock() + 240)
+        assert interval.interval == 240
+
+
+class TestAdaptiveAggregator:
+    """Test cases for adaptive polling in NewsAggregator."""
+    
+    def test_create_scheduler_splits_finnhub_quota(self):
+        """Test that category and company fan-out share FinHub's quota."""
+        aggregator = make_aggregator(SlowSource(0, []), SlowSource(0, []))
+        
+        scheduler = aggregator.create_scheduler(symbols=[f'S{i}' for i in range(60)], min_interval_seconds=5)
+        
+        assert set(scheduler.intervals) == {'alpaca', 'finnhub', 'finnhub_company'}
+        assert scheduler.intervals['alpaca'].min_interval == 5
+        assert scheduler.intervals['finnhub_company'].min_interval == pytest.approx(120)  # 60 calls at 30/min
+    
+    def test_run_continuous_polls_busy_source_more(self):
+        """Test that the adaptive loop polls the source with news more often."""
+        busy, quiet = BurstySource(5), BurstySource(0)
+        aggregator = make_aggregator(busy, quiet)
+        
+        asyncio.run(aggregator.run_continuous(
+            interval_seconds=0.2, max_duration=1.5, adaptive=True,
+            min_interval_seconds=0.05, max_interval_seconds=0.6
+        ))
+        
+        stats = aggregator.scheduler.get_stats()
+        assert busy.calls > 2 * quiet.calls
+        assert stats['alpaca']['interval_seconds'] < stats['finnhub']['interval_seconds']
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
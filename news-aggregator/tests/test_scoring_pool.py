@@ -0,0 +1,224 @@
+"""Tests for the concurrent IV scoring pool."""
+import asyncio
+import pytest
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+pytest.importorskip('google.genai')
+
+from enhanced_iv_scorer import headline_fingerprint
+from news_aggregator import NewsAggregator
+from rate_limit import TokenBucket
+from scoring_pool import NEUTRAL_IV_SCORE, PRIORITY_MACRO, PRIORITY_OTHER, PRIORITY_TRACKED, ScoringPool
+from tests.test_deduplicator import create_article
+from ttl_cache import TTLCache
+
+
+class FakeScorer:
+    """EnhancedIVScorer stand-in whose batch calls block for ``latency`` seconds."""
+    
+    def __init__(self, batch_size=2, latency=0.0, fail=False):
+        self.batch_size = batch_size
+        self.latency = latency
+        self.fail = fail
+        self.analysis_cache = TTLCache(64)
+        self.batches = []
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+    
+    def get_current_vix(self):
+        return 15.0
+    
+    def calculate_iv_scores(self, headlines, instrument="/MES", current_vix=None):
+        with self._lock:
+            self.batches.append(headlines)
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(self.latency)  # Synchronous, like the Gemini SDK
+        with self._lock:
+            self.in_flight -= 1
+        if self.fail:
+            raise RuntimeError('model unavailable')
+        return [{'type': 'cyclical', 'value': 1.0, 'headline': h, 'vix_level': current_vix} for h in headlines]
+
+
+def article(headline, ts, related=''):
+    return {'headline': headline, 'datetime': ts, 'related': related}
+
+
+class TestScoringPool:
+    """Test cases for ScoringPool."""
+    
+    def test_priority_classes(self):
+        """Test that macro beats tracked symbols, which beat general news."""
+        assert ScoringPool.priority(article('Powell signals rate cut', 0)) == PRIORITY_MACRO
+        assert ScoringPool.priority(article('CPI hotter than expected', 0, 'AAPL'), {'AAPL'}) == PRIORITY_MACRO
+        assert ScoringPool.priority(article('Apple unveils headset', 0, 'AAPL,MSFT'), {'AAPL'}) == PRIORITY_TRACKED
+        assert ScoringPool.priority(article('FedEx beats estimates', 0, 'FDX'), {'AAPL'}) == PRIORITY_OTHER
+    
+    def test_scores_most_important_first(self):
+        """Test that batches are taken macro first, then tracked symbols, newest first within a class."""
+        scorer = FakeScorer(batch_size=2)
+        pool = ScoringPool(max_concurrency=1, requests_per_minute=6000)
+        articles = [
+            article('Acme opens store', 5),
+            article('Apple unveils headset', 4, 'AAPL'),
+            article('Globex hires CFO', 9),
+            article('Fed holds rates', 1),
+            article('Tesla recalls cars', 7, 'TSLA'),
+            article('Sanctions widen', 2),
+        ]
+        
+        asyncio.run(pool.score(scorer, articles, tracked_symbols=['AAPL', 'TSLA']))
+        
+        assert scorer.batches == [
+            ['Sanctions widen', 'Fed holds rates'],
+            ['Tesla recalls cars', 'Apple unveils headset'],
+            ['Globex hires CFO', 'Acme opens store'],
+        ]
+        assert all(a['iv_score']['headline'] == a['headline'] for a in articles)
+        assert all(a['iv_score']['vix_level'] == 15.0 for a in articles)
+    
+    def test_batches_run_concurrently_off_the_loop(self):
+        """Test that wall time is about one batch latency per max_concurrency batches."""
+        scorer = FakeScorer(batch_size=1, latency=0.2)
+        pool = ScoringPool(max_concurrency=4, requests_per_minute=6000)
+        articles = [article(f'Headline {i}', i) for i in range(8)]
+        
+        async def run():
+            ticks = 0
+            
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.02)
+                    ticks += 1
+            
+            task = asyncio.create_task(ticker())
+            started = time.perf_counter()
+            await pool.score(scorer, articles)
+            elapsed = time.perf_counter() - started
+            task.cancel()
+            return elapsed, ticks
+        
+        elapsed, ticks = asyncio.run(run())
+        
+        assert scorer.peak == 4
+        assert elapsed < 0.7  # Serial scoring would take 1.6s
+        assert ticks >= 10  # The event loop kept running while batches were scored
+    
+    def test_requests_per_minute_limit(self):
+        """Test that model requests wait for quota tokens."""
+        scorer = FakeScorer(batch_size=1)
+        pool = ScoringPool(max_concurrency=4, rate_limiter=TokenBucket(rate=20, capacity=1))
+        
+        started = time.perf_counter()
+        asyncio.run(pool.score(scorer, [article(f'Headline {i}', i) for i in range(4)]))
+        
+        assert time.perf_counter() - started >= 0.14  # Three refills at 20/s
+        assert pool.get_stats()['rate_limited_seconds'] > 0
+    
+    def test_cached_batches_skip_limiter(self):
+        """Test that batches answered from the analysis cache spend no quota."""
+        scorer = FakeScorer(batch_size=2)
+        for headline in ['Acme rises', 'Globex falls']:
+            scorer.analysis_cache.put(headline_fingerprint(headline), {})
+        limiter = TokenBucket(rate=0.001, capacity=1)
+        pool = ScoringPool(rate_limiter=limiter)
+        
+        asyncio.run(pool.score(scorer, [article('Acme rises', 1), article('Globex falls', 2)]))
+        
+        assert limiter.available == pytest.approx(1, abs=0.01)
+        assert pool.get_stats()['cached_batches'] == 1
+    
+    def test_failed_batch_gets_neutral_score(self):
+        """Test that a batch whose request fails is scored neutral instead of raising."""
+        scorer = FakeScorer(fail=True)
+        pool = ScoringPool(requests_per_minute=6000)
+        articles = [article('Acme rises', 1)]
+        
+        asyncio.run(pool.score(scorer, articles))
+        
+        assert articles[0]['iv_score'] == NEUTRAL_IV_SCORE
+        assert pool.get_stats()['failed_batches'] == 1
+    
+    def test_classes_yielded_as_scored(self):
+        """Test that a class is handed back before later classes finish scoring."""
+        scorer = FakeScorer(batch_size=1, latency=0.1)
+        pool = ScoringPool(max_concurrency=1, requests_per_minute=6000)
+        articles = [article(f'Acme story {i}', i) for i in range(3)] + [article('Fed holds rates', 0)]
+        
+        async def run():
+            yielded = []
+            async for scored in pool.score_by_priority(scorer, articles):
+                yielded.append(([a['headline'] for a in scored], sum('iv_score' in a for a in articles)))
+            return yielded
+        
+        yielded = asyncio.run(run())
+        
+        assert yielded == [
+            (['Fed holds rates'], 1),
+            (['Acme story 2', 'Acme story 1', 'Acme story 0'], 4),
+        ]
+
+
+class TestPriorityDelivery:
+    """Test cases for delivering each priority class as soon as it is scored."""
+    
+    def make_aggregator(self, scorer, sends, fail_on=None):
+        aggregator = NewsAggregator(pulse_endpoint='mock')
+        aggregator.iv_scorer = scorer
+        aggregator.scoring_pool = ScoringPool(max_concurrency=1, requests_per_minute=6000)
+        
+        async def send_to_pulse(articles):
+            sends.append(([a['headline'] for a in articles], sum(len(batch) for batch in scorer.batches)))
+            if fail_on and fail_on in articles[0]['headline']:
+                return {'sent': 0, 'success': False, 'error': 'Pulse down'}
+            return {'sent': len(articles), 'success': True}
+        aggregator.delivery.send_to_pulse = send_to_pulse
+        return aggregator
+    
+    def articles(self):
+        return [
+            create_article("Acme opens new store downtown", "https://example.com/1", related="ACME"),
+            create_article("Apple unveils new headset", "https://example.com/2", related="AAPL"),
+            create_article("Fed holds interest rates steady", "https://example.com/3"),
+        ]
+    
+    def test_macro_delivered_before_the_rest_is_scored(self):
+        """Test that each class reaches Pulse while later classes are still unscored."""
+        sends = []
+        scorer = FakeScorer(batch_size=1, latency=0.05)
+        aggregator = self.make_aggregator(scorer, sends)
+        
+        unique, result = asyncio.run(aggregator.process_articles(self.articles(), symbols=['AAPL']))
+        
+        assert [headlines for headlines, _ in sends] == [
+            ['Fed holds interest rates steady'],
+            ['Apple unveils new headset'],
+            ['Acme opens new store downtown'],
+        ]
+        assert sends[0][1] < 3  # Sent before every batch was scored
+        assert result == {'sent': 3, 'success': True}
+        assert aggregator.stats['total_delivered'] == 3
+    
+    def test_failed_class_is_retried(self):
+        """Test that only the class Pulse rejected passes dedupe again."""
+        sends = []
+        aggregator = self.make_aggregator(FakeScorer(batch_size=1), sends, fail_on='Apple')
+        
+        _, result = asyncio.run(aggregator.process_articles(self.articles(), symbols=['AAPL']))
+        assert result['success'] is False and result['sent'] == 2
+        
+        unique, _ = asyncio.run(aggregator.process_articles(self.articles(), symbols=['AAPL']))
+        assert [a['headline'] for a in unique] == ['Apple unveils new headset']
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,130 @@
+"""Tests for the stand-in upstream server."""
+import pytest
+import sys
+from pathlib import Path
+
+# Add src and benchmarks to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'benchmarks'))
+
+from alpaca_client import AlpacaNewsClient
+from delivery import NewsDelivery
+from enhanced_iv_scorer import EnhancedIVScorer
+from finnhub_client import FinnHubNewsClient
+from http_pool import create_session
+from rate_limit import TokenBucket
+from resilience import CircuitBreaker
+from standin_server import StandinServer
+
+
+@pytest.fixture
+def standin():
+    """Synthetic stand-in with ten minutes of backlog."""
+    server = StandinServer(rate=2, backlog_seconds=600).start()
+    yield server
+    server.stop()
+
+
+def alpaca_client(server):
+    return AlpacaNewsClient(base_url=server.base_urls()['ALPACA_BASE_URL'],
+                            session=create_session(max_retries=0), breaker=CircuitBreaker('alpaca-test'))
+
+
+def finnhub_client(server):
+    return FinnHubNewsClient('test-key', base_url=server.base_urls()['FINNHUB_BASE_URL'],
+                             session=create_session(max_retries=0),
+                             rate_limiter=TokenBucket(rate=1000, capacity=100),
+                             breaker=CircuitBreaker('finnhub-test'))
+
+
+class TestSynthMode:
+    """Test cases for synthetic upstreams."""
+    
+    def test_alpaca_pages_and_cursor(self, standin):
+        """Test that Alpaca pagination and the high-water mark are honoured."""
+        client = alpaca_client(standin)
+        
+        first = client.get_news(None, limit=50)
+        
+        assert len(first) > 50
+        assert client.last_fetch_pages > 1
+        assert len(client.get_news(None, limit=50)) < len(first)
+        assert all(article['origin'] == 'alpaca' for article in first)
+    
+    def test_finnhub_min_id_and_company_news(self, standin):
+        """Test that FinHub minId cursors and company-news symbols are honoured."""
+        client = finnhub_client(standin)
+        
+        first = client.get_news('general')
+        second = client.get_news('general')
+        company = client.get_company_news_bulk(['AAPL'])
+        
+        assert first
+        assert all(article['id'] > max(a['id'] for a in first) for article in second)
+        assert company and all('AAPL' in article['related'].split(',') for article in company)
+    
+    def test_gemini_vix_and_pulse(self, standin):
+        """Test that IV scoring and delivery work against the stand-in."""
+        urls = standin.base_urls()
+        scorer = EnhancedIVScorer('test-key', session=create_session(max_retries=0),
+                                  vix_url=urls['YAHOO_CHART_URL'], gemini_base_url=urls['GEMINI_BASE_URL'])
+        delivery = NewsDelivery(urls['PULSE_ENDPOINT'], session=create_session(max_retries=0))
+        
+        analysis = scorer.analyze_sentiment_with_gemini('Fed cuts rates by 50bp')
+        result = delivery.send_to_pulse_sync([{'headline': 'h', 'datetime': 0, 'url': 'u', 'source': 's'}])
+        
+        assert analysis == scorer.analyze_sentiment_with_gemini('Fed cuts rates by 50bp')
+        assert {'sentiment', 'event_type', 'confidence', 'direction'} <= set(analysis)
+        assert scorer.get_current_vix() > 0
+        assert result['success']
+        assert standin.get_stats()['pulse_articles'] == 1
+    
+    def test_gemini_batch(self, standin):
+        """Test that batched scoring gets one indexed analysis per headline."""
+        urls = standin.base_urls()
+        scorer = EnhancedIVScorer('test-key', session=create_session(max_retries=0), cache_size=0,
+                                  vix_url=urls['YAHOO_CHART_URL'], gemini_base_url=urls['GEMINI_BASE_URL'])
+        headlines = ['Fed cuts rates by 50bp', 'Acme "beats" estimates', 'Oil slides']
+        
+        analyses = scorer.analyze_sentiment_batch(headlines)
+        
+        assert len(analyses) == 3
+        assert scorer.get_cache_stats()['batch'] == {'requests': 1, 'headlines': 3, 'fallbacks': 0}
+        assert analyses == scorer.analyze_sentiment_batch(headlines)
+    
+    def test_error_ratio(self):
+        """Test that injected failures surface as 503s."""
+        server = StandinServer(error_ratio=1.0).start()
+        try:
+            assert alpaca_client(server).get_news(['AAPL']) == []
+            assert server.get_stats()['errors_injected'] == 1
+        finally:
+            server.stop()
+
+
+class TestRecordReplay:
+    """Test cases for recording and replaying upstream responses."""
+    
+    def test_replays_recorded_responses(self, standin, tmp_path):
+        """Test that responses proxied in record mode are served back in replay mode."""
+        recording = str(tmp_path / 'upstream.jsonl')
+        recorder = StandinServer(mode='record', recording_path=recording,
+                                 upstreams={'alpaca': standin.root_url + '/alpaca'}).start()
+        try:
+            recorded = alpaca_client(recorder).get_news(['AAPL'])
+        finally:
+            recorder.stop()
+        
+        replayer = StandinServer(mode='replay', recording_path=recording).start()
+        try:
+            replayed = alpaca_client(replayer).get_news(['AAPL'], use_incremental=False)
+        finally:
+            replayer.stop()
+        
+        assert recorded
+        assert [a['id'] for a in replayed] == [a['id'] for a in recorded]
+    
+    def test_replay_needs_recording(self):
+        """Test that replay mode requires a recording path."""
+        with pytest.raises(ValueError):
+            StandinServer(mode='replay')
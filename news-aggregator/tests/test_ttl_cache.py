@@ -0,0 +1,136 @@
+"""Tests for the LRU+TTL cache and Gemini analysis caching."""
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from tests.helpers import FakeClock
+from ttl_cache import TTLCache
+
+
+class TestTTLCache:
+    """Test cases for TTLCache."""
+    
+    def test_hit_and_miss(self):
+        """Test that stored values are returned and lookups are counted."""
+        cache = TTLCache(maxsize=4)
+        cache.put('a', 1)
+        
+        assert cache.get('a') == 1
+        assert cache.get('b') is None
+        assert cache.get_stats()['hits'] == 1
+        assert cache.get_stats()['misses'] == 1
+        assert cache.get_stats()['hit_rate'] == 0.5
+    
+    def test_evicts_least_recently_used(self):
+        """Test that a full cache evicts the entry read least recently."""
+        cache = TTLCache(maxsize=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+        
+        assert 'a' in cache and 'c' in cache
+        assert 'b' not in cache
+        assert cache.get_stats()['evictions'] == 1
+    
+    def test_entries_expire(self):
+        """Test that entries are dropped once their TTL has passed."""
+        clock = FakeClock()
+        cache = TTLCache(maxsize=4, ttl_seconds=10, clock=clock)
+        cache.put('a', 1)
+        
+        clock.now = 9.9
+        assert cache.get('a') == 1
+        clock.now = 10.0
+        assert cache.get('a') is None
+        assert len(cache) == 0
+        assert cache.get_stats()['expirations'] == 1
+    
+    def test_put_refreshes_ttl(self):
+        """Test that storing a key again restarts its TTL."""
+        clock = FakeClock()
+        cache = TTLCache(maxsize=4, ttl_seconds=10, clock=clock)
+        cache.put('a', 1)
+        clock.now = 8
+        cache.put('a', 2)
+        clock.now = 15
+        
+        assert cache.get('a') == 2
+    
+    def test_rejects_non_positive_size(self):
+        """Test that a zero-size cache is a configuration error."""
+        with pytest.raises(ValueError):
+            TTLCache(maxsize=0)
+
+
+class TestGeminiAnalysisCache:
+    """Test cases for caching Gemini headline analyses."""
+    
+    @pytest.fixture
+    def scorer(self):
+        pytest.importorskip('google.genai')
+        from enhanced_iv_scorer import EnhancedIVScorer
+        scorer = EnhancedIVScorer('test-key')
+        scorer.calls = []
+        
+        class Response:
+            text = '{"sentiment": "negative", "event_type": "macro_critical", "confidence": 0.9, "direction": "bearish"}'
+        
+        def generate_content(model, contents):
+            scorer.calls.append(contents)
+            return Response()
+        
+        scorer.gemini_client.models.generate_content = generate_content
+        return scorer
+    
+    def test_fingerprint_ignores_trivial_rewording(self):
+        """Test that case, whitespace and wire markers do not change the fingerprint."""
+        pytest.importorskip('google.genai')
+        from enhanced_iv_scorer import headline_fingerprint
+        
+        base = headline_fingerprint('Fed raises rates by 25bp')
+        
+        assert headline_fingerprint('BREAKING: Fed raises rates by 25bp') == base
+        assert headline_fingerprint('  fed  raises rates by 25BP ') == base
+        assert headline_fingerprint('Fed cuts rates by 25bp') != base
+    
+    def test_fingerprint_keeps_signs_and_numbers(self):
+        """Test that moves in opposite directions never share a cached analysis."""
+        pytest.importorskip('google.genai')
+        from enhanced_iv_scorer import headline_fingerprint
+        
+        up = headline_fingerprint('S&P 500 futures +2.1% after CPI')
+        
+        assert headline_fingerprint('S&P 500 futures -2.1% after CPI') != up
+        assert headline_fingerprint('S&P 500 futures +21% after CPI') != up
+        assert headline_fingerprint('Gold tops $2,100') != headline_fingerprint('Gold tops 2,100')
+    
+    def test_repeat_headline_skips_model_call(self, scorer):
+        """Test that a reposted headline is answered from the cache."""
+        first = scorer.analyze_sentiment_with_gemini('Fed raises rates by 25bp')
+        first['sentiment'] = 'mutated'
+        second = scorer.analyze_sentiment_with_gemini('UPDATE - Fed raises rates by 25bp')
+        
+        assert len(scorer.calls) == 1
+        assert second['sentiment'] == 'negative'
+        assert scorer.get_cache_stats()['hits'] == 1
+    
+    def test_fallback_is_not_cached(self, scorer):
+        """Test that keyword fallbacks are retried against the model next time."""
+        def failing(model, contents):
+            scorer.calls.append(contents)
+            raise RuntimeError('quota exceeded')
+        scorer.gemini_client.models.generate_content = failing
+        
+        scorer.analyze_sentiment_with_gemini('Oil prices surge')
+        scorer.analyze_sentiment_with_gemini('Oil prices surge')
+        
+        assert len(scorer.calls) == 2
+        assert scorer.get_cache_stats()['size'] == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,179 @@
+"""Tests for URL canonicalization and fingerprint sets."""
+import pytest
+import random
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from deduplicator import NewsDedupe
+from url_fingerprint import (
+    BloomFilter,
+    FingerprintSet,
+    RotatingBloomFilter,
+    canonicalize_url,
+    url_fingerprint,
+)
+from tests.test_deduplicator import create_article
+
+
+class TestCanonicalizeUrl:
+    """Test cases for URL canonicalization."""
+    
+    @pytest.mark.parametrize('variant', [
+        "https://www.example.com/news/story-1",
+        "http://example.com/news/story-1/",
+        "https://EXAMPLE.com:443/news/story-1#comments",
+        "https://example.com/news/story-1?utm_source=finnhub&utm_medium=api",
+        "https://example.com/news/story-1?fbclid=abc123",
+    ])
+    def test_variants_share_fingerprint(self, variant):
+        """Test that scheme, host case, tracking params and trailing slash are ignored."""
+        assert canonicalize_url(variant) == "example.com/news/story-1"
+        assert url_fingerprint(variant) == url_fingerprint("https://example.com/news/story-1")
+    
+    @pytest.mark.parametrize('url', [
+        "https://example.com/a?source=rss",
+        "https://example.com/a?ref=home",
+        "https://example.com/a?mod=2",
+        "https://notreuters.com/a?taid=1",
+    ])
+    def test_publisher_params_kept_elsewhere(self, url):
+        """Test that names some publishers use for tracking are content on other hosts."""
+        assert canonicalize_url(url) == url.split('//', 1)[1]
+    
+    @pytest.mark.parametrize('url, canonical', [
+        ("https://www.reuters.com/markets/story?taid=abc", "reuters.com/markets/story"),
+        ("https://www.cnbc.com/2024/05/01/story.html?__source=sharebar&source=x", "cnbc.com/2024/05/01/story.html"),
+        ("https://markets.wsj.com/story?mod=hp_lead_pos1&page=2", "markets.wsj.com/story?page=2"),
+        ("https://finance.yahoo.com/news/story.html?guccounter=1&ncid=rss", "finance.yahoo.com/news/story.html"),
+    ])
+    def test_publisher_params_dropped_on_their_hosts(self, url, canonical):
+        """Test that per-host tracking parameters are dropped on that host and its subdomains."""
+        assert canonicalize_url(url) == canonical
+    
+    def test_meaningful_parts_kept(self):
+        """Test that path case, ports and content query params still distinguish URLs."""
+        assert canonicalize_url("https://example.com/a?id=2&page=1") == "example.com/a?id=2&page=1"
+        assert canonicalize_url("https://example.com/a?page=1&id=2") == "example.com/a?id=2&page=1"
+        assert url_fingerprint("https://example.com/A") != url_fingerprint("https://example.com/a")
+        assert url_fingerprint("https://example.com:8080/a") != url_fingerprint("https://example.com/a")
+        assert url_fingerprint("https://example.com/a?id=1") != url_fingerprint("https://example.com/a?id=2")
+    
+    def test_empty_and_unparseable(self):
+        """Test that empty or malformed URLs do not raise."""
+        assert canonicalize_url("") == ""
+        assert canonicalize_url(None) == ""
+        assert canonicalize_url("http://[bad") == "http://[bad"
+
+
+class TestFingerprintSet:
+    """Test cases for the open-addressing fingerprint set."""
+    
+    def test_matches_builtin_set(self):
+        """Test adds and discards against a built-in set through several resizes."""
+        rng = random.Random(3)
+        fingerprints = FingerprintSet(capacity=8)
+        expected = set()
+        values = [rng.getrandbits(64) for _ in range(5000)] + [0, 1]
+        
+        for value in values:
+            fingerprints.add(value)
+            expected.add(value)
+        for value in values[::3]:
+            fingerprints.discard(value)
+            expected.discard(value)
+        
+        assert len(fingerprints) == len(expected)
+        assert all(v in fingerprints for v in expected)
+        assert not any(v in fingerprints for v in values[::3])
+    
+    def test_smaller_than_builtin_set(self):
+        """Test that the array-backed set uses less memory than set of ints."""
+        rng = random.Random(5)
+        values = [rng.getrandbits(64) | (1 << 63) for _ in range(10000)]
+        fingerprints = FingerprintSet()
+        for value in values:
+            fingerprints.add(value)
+        
+        builtin = set(values)
+        builtin_bytes = sys.getsizeof(builtin) + sum(sys.getsizeof(v) for v in builtin)
+        assert fingerprints.memory_bytes() < builtin_bytes / 2
+
+
+class TestBloomFilter:
+    """Test cases for the Bloom filter tiers."""
+    
+    def test_no_false_negatives_and_low_false_positives(self):
+        """Test membership at capacity."""
+        rng = random.Random(11)
+        bloom = BloomFilter(10000, error_rate=0.01)
+        added = [rng.getrandbits(64) for _ in range(10000)]
+        for value in added:
+            bloom.add(value)
+        
+        assert all(v in bloom for v in added)
+        false_positives = sum(rng.getrandbits(64) in bloom for _ in range(10000))
+        assert false_positives < 300
+    
+    def test_rotating_slices_expire(self):
+        """Test that whole slices drop out of the window."""
+        bloom = RotatingBloomFilter(window_hours=12, slice_hours=6)
+        bloom.add(1234, timestamp=0)
+        bloom.add(5678, timestamp=7 * 3600)
+        
+        assert 1234 in bloom and 5678 in bloom
+        assert bloom.expire(cutoff_timestamp=6 * 3600) == 1
+        assert 1234 not in bloom and 5678 in bloom
+
+
+class TestDedupeUrlLevel:
+    """Test cases for canonical URLs and the long URL window in NewsDedupe."""
+    
+    def test_tracking_variants_are_url_dupes(self):
+        """Test that Level 1 catches the same story linked with different decorations."""
+        deduper = NewsDedupe()
+        unique = deduper.process([
+            create_article("Fed holds rates steady", "https://www.example.com/fed/", "Alpaca", "SPY"),
+            create_article("FOMC leaves policy unchanged", "http://example.com/fed?utm_source=finnhub", "Finnhub", "QQQ"),
+        ])
+        
+        assert len(unique) == 1
+        assert deduper.stats['exact_url_dupes'] == 1
+    
+    def test_url_window_outlives_cache(self):
+        """Test that evicted URLs are still rejected inside url_window_hours."""
+        deduper = NewsDedupe(window_hours=1, url_window_hours=48)
+        deduper._remember(deduper._make_record(
+            create_article("Old story", "https://example.com/old", offset_seconds=-7200)
+        ))
+        
+        unique = deduper.process([
+            create_article("Old story", "https://example.com/old"),
+            create_article("Brand new story", "https://example.com/new", related="MSFT"),
+        ])
+        
+        assert [a['url'] for a in unique] == ["https://example.com/new"]
+        assert len(deduper.seen_articles) == 1
+        assert deduper.get_stats()['url_bloom_size'] == 1
+    
+    def test_url_window_survives_restart(self, tmp_path):
+        """Test that stored rows past the similarity window warm the Bloom tier."""
+        path = str(tmp_path / 'dedupe.sqlite3')
+        deduper = NewsDedupe(window_hours=1, url_window_hours=48, store_path=path)
+        deduper.process([
+            create_article("Old story", "https://example.com/old", offset_seconds=-7200),
+            create_article("Recent story", "https://example.com/recent", related="MSFT"),
+        ])
+        deduper.close()
+        
+        restarted = NewsDedupe(window_hours=1, url_window_hours=48, store_path=path)
+        assert len(restarted.seen_articles) == 1
+        assert restarted._store.count() == 2
+        assert restarted.process([create_article("Old story", "https://example.com/old")]) == []
+        restarted.close()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])